@@ -0,0 +1 @@
+"""Benchmarks and load tests for the EPS Smart Pool Control integration, run against a local fake API."""
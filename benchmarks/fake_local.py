@@ -0,0 +1,62 @@
+"""
+A local stand-in for a Smart Pool Control unit answering on the LAN.
+
+Serves one pool over the same routes as the fake cloud API. Built from a FakeEpsApi it shares that pool's state with
+the cloud, so both report the same pool. The controller can drop off the network and come back on the same address,
+the way a unit does when it reboots.
+
+Run it on its own to enter it as the local controller address of a development instance:
+
+    python -m benchmarks.fake_local --port 8081
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from aiohttp import web
+
+from .fake_server import FakeApiConfig, FakeEpsApi
+
+
+class FakeController(FakeEpsApi):
+    """The fake controller of one pool, taken from a fake cloud API or generated when there is none."""
+
+    def __init__(self, cloud: FakeEpsApi | None = None, pid: str | None = None, config: FakeApiConfig | None = None) -> None:
+        """Initialize the controller with the pool it serves."""
+        super().__init__(config or FakeApiConfig())
+        if cloud is not None:
+            pid = pid or next(iter(cloud.pools))
+            self.pools = {pid: cloud.pools[pid]}
+        self._address: tuple[str, int] | None = None
+
+    @property
+    def host(self) -> str:
+        """Return the address to enter as the local controller address."""
+        if self._address is None:
+            msg = "The fake controller has not been started"
+            raise RuntimeError(msg)
+        return f"{self._address[0]}:{self._address[1]}"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving; once started, a restart without a port comes back on the same address."""
+        if not port and self._address is not None:
+            host, port = self._address
+        base_url = await super().start(host, port)
+        if self._runner is not None:
+            self._address = self._runner.addresses[0][:2]
+        return base_url
+
+
+def main() -> None:
+    """Serve the fake controller until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    args = parser.parse_args()
+    web.run_app(FakeController(config=FakeApiConfig(latency=args.latency)).app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+A local stand-in for api.smartpoolconnect.eu.
+
+Serves GET /pool, GET /pool/{pid} and PATCH /pool/{pid}/{module} for any number of generated pools, with
+configurable latency and injected 5xx and 429 answers. GET /pool/{pid} hands out ETags and answers 304 to a matching
+If-None-Match; the filter endpoint rejects partial bodies with 422 like the real one. Avatar images put in `avatars`
+are served from GET /avatar/{name} the same way.
+
+Run it on its own to point a development instance at it:
+
+    python -m benchmarks.fake_server --pools 10 --latency 0.05 --port 8080
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import hashlib
+import json
+import random
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Self
+
+from aiohttp import hdrs, web
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from types import TracebackType
+
+# Modules whose PATCH endpoint only accepts the full config.
+FULL_BODY_MODULES = frozenset({"filter"})
+
+
+@dataclass(frozen=True, slots=True)
+class FakeApiConfig:
+    """Behaviour of the fake API; rates are fractions of requests between 0 and 1."""
+
+    pools: int = 1
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: float = 0.0
+    change_rate: float = 1.0
+    etags: bool = True
+    full_body_modules: frozenset[str] = FULL_BODY_MODULES
+    api_key: str | None = None
+    seed: int = 0
+
+
+def make_pool(index: int) -> dict[str, object]:
+    """Return the GET /pool/{pid} payload of a generated pool, shaped like the README example."""
+    return {
+        "pid": f"pool-{index:04d}",
+        "mac": f"02:00:00:00:{index >> 8:02X}:{index & 0xFF:02X}",
+        "name": f"Pool {index}",
+        "status": "online",
+        "activity_at": 1748684434000,
+        "avatar": None,
+        "ph": {"metrics": {"actual": 7.3}, "config": {"target": 7.4}, "status": {"status": 0}},
+        "cl": {"metrics": {"actual": 720.0}, "config": {"rx": {"target": 700.0}}, "status": {"status": 0}},
+        "filter": {
+            "metrics": {"pump_current": 1.2, "pump_speed": 2},
+            "config": {"always_active": False, "schedule_1": {"enabled": False}, "schedule_2": {"enabled": False}, "schedule_3": {"enabled": True}},
+            "status": {"status": 0, "pump_status": 2, "pump_speed": 2},
+        },
+        "temperature": {"metrics": {"water_temp": 26.0, "ambient_temp": 22.5, "imx_temp": 51.7}, "config": {"target": 28.0}, "status": {"status": 0}},
+        "cover": {"status": {"status": -1, "covco": 0}},
+        "lighting": {"status": {"status": 0}},
+        "backwash": {"status": {"status": 0}},
+        "zero_e": {"status": {"status": -1}},
+        "spec": {"pool_volume": 27},
+    }
+
+
+def advance_pool(pool: dict, rng: random.Random) -> None:
+    """Move the measured values of a pool a little, the way a running pool reports them between polls."""
+    pool["activity_at"] += 60_000
+    temperature = pool["temperature"]["metrics"]
+    temperature["water_temp"] = round(temperature["water_temp"] + rng.uniform(-0.1, 0.1), 1)
+    pool["ph"]["metrics"]["actual"] = round(min(max(pool["ph"]["metrics"]["actual"] + rng.uniform(-0.02, 0.02), 6.5), 8.0), 2)
+    pool["cl"]["metrics"]["actual"] = round(min(max(pool["cl"]["metrics"]["actual"] + rng.uniform(-5, 5), 500), 900), 0)
+    pool["filter"]["metrics"]["pump_current"] = round(max(pool["filter"]["metrics"]["pump_current"] + rng.uniform(-0.05, 0.05), 0), 2)
+
+
+def _merge(target: dict, updates: Mapping[str, object]) -> None:
+    for key, value in updates.items():
+        if isinstance(value, Mapping) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
+def _missing_fields(current: Mapping[str, object], body: Mapping[str, object]) -> list[str]:
+    """Return the config fields a full body leaves out."""
+    missing: list[str] = []
+    for key, value in current.items():
+        if key not in body:
+            missing.append(key)
+        elif isinstance(value, Mapping) and isinstance(body[key], Mapping):
+            missing.extend(f"{key}.{field}" for field in _missing_fields(value, body[key]))
+    return missing
+
+
+def _unknown_fields(current: Mapping[str, object], body: Mapping[str, object]) -> list[str]:
+    """Return the fields of a body the module's config does not have."""
+    unknown: list[str] = []
+    for key, value in body.items():
+        if key not in current:
+            unknown.append(key)
+        elif isinstance(value, Mapping) and isinstance(current[key], Mapping):
+            unknown.extend(f"{key}.{field}" for field in _unknown_fields(current[key], value))
+    return unknown
+
+
+class FakeEpsApi:
+    """
+    The fake API server and the pools it serves.
+
+    Every request is counted in `requests` by method and route, and every 304 in `not_modified`. Injected failures are drawn from a seeded random
+    generator, so a run with the same config sees the same sequence of answers.
+    """
+
+    def __init__(self, config: FakeApiConfig | None = None) -> None:
+        """Initialize the server with its generated pools."""
+        self.config = config or FakeApiConfig()
+        self.pools: dict[str, dict] = {}
+        for index in range(self.config.pools):
+            pool = make_pool(index)
+            self.pools[pool["pid"]] = pool
+        self.avatars: dict[str, bytes] = {}
+        self.requests: Counter[str] = Counter()
+        self.not_modified: Counter[str] = Counter()
+        self.patches: list[tuple[str, str, dict]] = []
+        self._rng = random.Random(self.config.seed)  # noqa: S311
+        self._runner: web.AppRunner | None = None
+
+    async def __aenter__(self) -> Self:
+        """Start the server on a free local port."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None) -> None:
+        """Stop the server."""
+        await self.stop()
+
+    @property
+    def base_url(self) -> str:
+        """Return the URL to pass to EpsApiClient as base_url."""
+        if self._runner is None:
+            msg = "The fake API is not running"
+            raise RuntimeError(msg)
+        host, port = self._runner.addresses[0][:2]
+        return f"http://{host}:{port}"
+
+    def app(self) -> web.Application:
+        """Return the aiohttp application serving the API."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/pool", self._list_pools)
+        app.router.add_get("/pool/{pid}", self._get_pool)
+        app.router.add_patch("/pool/{pid}/{module}", self._patch_module)
+        app.router.add_get("/avatar/{name}", self._get_avatar)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the base URL; port 0 picks a free port."""
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Callable[[web.Request], Awaitable[web.StreamResponse]]) -> web.StreamResponse:
+        """Count the request, wait out the configured latency and inject failures before the handler runs."""
+        route = request.match_info.route.resource.canonical if request.match_info.route.resource else request.path
+        self.requests[f"{request.method} {route}"] += 1
+        config = self.config
+        if config.latency or config.jitter:
+            await asyncio.sleep(config.latency + self._rng.uniform(0, config.jitter))
+        if config.api_key is not None and request.headers.get("X-API-Key") != config.api_key:
+            return web.json_response({"error": "invalid API key"}, status=HTTPStatus.UNAUTHORIZED)
+        draw = self._rng.random()
+        if draw < config.rate_limit_rate:
+            return web.json_response({"error": "rate limited"}, status=HTTPStatus.TOO_MANY_REQUESTS, headers={hdrs.RETRY_AFTER: str(config.retry_after)})
+        if draw < config.rate_limit_rate + config.error_rate:
+            return web.json_response({"error": "service unavailable"}, status=HTTPStatus.SERVICE_UNAVAILABLE)
+        return await handler(request)
+
+    async def _list_pools(self, request: web.Request) -> web.Response:
+        mac = request.query.get("mac")
+        items = [{"pid": pool["pid"], "mac": pool["mac"], "name": pool["name"]} for pool in self.pools.values() if mac is None or pool["mac"] == mac]
+        return web.json_response({"items": items})
+
+    async def _get_pool(self, request: web.Request) -> web.Response:
+        pool = self.pools.get(request.match_info["pid"])
+        if pool is None:
+            return web.json_response({"error": "pool not found"}, status=HTTPStatus.NOT_FOUND)
+        if self._rng.random() < self.config.change_rate:
+            advance_pool(pool, self._rng)
+        return self._conditional_response(request, json.dumps(pool).encode(), "application/json")
+
+    async def _get_avatar(self, request: web.Request) -> web.Response:
+        body = self.avatars.get(request.match_info["name"])
+        if body is None:
+            return web.json_response({"error": "not found"}, status=HTTPStatus.NOT_FOUND)
+        return self._conditional_response(request, body, "image/png")
+
+    def _conditional_response(self, request: web.Request, body: bytes, content_type: str) -> web.Response:
+        """Answer with the body and its ETag, or with a 304 when the request already holds that ETag."""
+        if not self.config.etags:
+            return web.Response(body=body, content_type=content_type)
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        if request.headers.get(hdrs.IF_NONE_MATCH) == etag:
+            self.not_modified[f"{request.method} {request.match_info.route.resource.canonical}"] += 1
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers={hdrs.ETAG: etag})
+        return web.Response(body=body, content_type=content_type, headers={hdrs.ETAG: etag})
+
+    async def _patch_module(self, request: web.Request) -> web.Response:
+        pool = self.pools.get(request.match_info["pid"])
+        module = request.match_info["module"]
+        if pool is None or not isinstance(pool.get(module), dict):
+            return web.json_response({"error": "not found"}, status=HTTPStatus.NOT_FOUND)
+        try:
+            body = await request.json()
+        except ValueError:
+            return web.json_response({"error": "invalid JSON"}, status=HTTPStatus.BAD_REQUEST)
+        current = pool[module].get("config", {})
+        if not isinstance(body, dict) or (errors := _unknown_fields(current, body)):
+            return web.json_response({"error": "unknown fields", "fields": errors}, status=HTTPStatus.UNPROCESSABLE_ENTITY)
+        if module in self.config.full_body_modules and (errors := _missing_fields(current, body)):
+            return web.json_response({"error": "missing fields", "fields": errors}, status=HTTPStatus.UNPROCESSABLE_ENTITY)
+        _merge(current, body)
+        self.patches.append((pool["pid"], module, copy.deepcopy(body)))
+        return web.json_response(pool[module])
+
+
+def main() -> None:
+    """Serve the fake API until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--pools", type=int, default=1, help="number of generated pools")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many seconds added on top, at random")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After of the 429 answers, in seconds")
+    parser.add_argument("--change-rate", type=float, default=1.0, help="fraction of pool reads that see new measurements")
+    parser.add_argument("--no-etags", dest="etags", action="store_false", help="answer without ETags, so no read is ever a 304")
+    parser.add_argument("--api-key", help="require this X-API-Key")
+    args = parser.parse_args()
+    config = FakeApiConfig(
+        pools=args.pools,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        change_rate=args.change_rate,
+        etags=args.etags,
+        api_key=args.api_key,
+    )
+    web.run_app(FakeEpsApi(config).app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
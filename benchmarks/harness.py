@@ -0,0 +1,88 @@
+"""
+A bare Home Assistant instance running the integration's coordinators, with every pool's entities subscribed to them.
+
+The entities are the ones the integration's platforms create for a pool, subscribed with their listener context the
+way CoordinatorEntity subscribes them once added. A notified entity recomputes its state like it does before writing
+it, but the state is not written, so a fan-out measures the integration's own work and not Home Assistant's.
+"""
+
+from __future__ import annotations
+
+import functools
+import tempfile
+from contextlib import asynccontextmanager
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+
+from custom_components.eps_smart_pool_control import binary_sensor, number, sensor, switch
+from custom_components.eps_smart_pool_control.const import DOMAIN
+from custom_components.eps_smart_pool_control.coordinator import EpsAccountCoordinator, EpsDataUpdateCoordinator
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable
+
+    from homeassistant.helpers.entity import Entity
+
+    from custom_components.eps_smart_pool_control.eps_entity import EpsEntity
+
+# The platforms whose entities follow the pool's data; the image only follows the avatar URL.
+_PLATFORMS = (binary_sensor, number, sensor, switch)
+
+
+@asynccontextmanager
+async def async_bench_hass() -> AsyncIterator[HomeAssistant]:
+    """Run a Home Assistant instance in a throwaway configuration directory."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        await hass.async_start()
+        try:
+            yield hass
+        finally:
+            await hass.async_stop(force=True)
+
+
+class BenchPool:
+    """The coordinator of one pool and the entities subscribed to it."""
+
+    def __init__(self, coordinator: EpsDataUpdateCoordinator) -> None:
+        """Initialize without entities; the platforms add them."""
+        self.coordinator = coordinator
+        self.entities: list[EpsEntity] = []
+        self.notified = 0
+
+    @callback
+    def async_add_entities(self, entities: Iterable[Entity], update_before_add: bool = False) -> None:  # noqa: ARG002, FBT001, FBT002
+        """Subscribe new entities to the coordinator, standing in for the platform's AddEntitiesCallback."""
+        for entity in entities:
+            eps_entity: EpsEntity = entity  # type: ignore[assignment]
+            self.entities.append(eps_entity)
+            self.coordinator.async_add_listener(functools.partial(self._async_notify, eps_entity), eps_entity.coordinator_context)
+
+    @callback
+    def _async_notify(self, entity: EpsEntity) -> None:
+        self.notified += 1
+        entity._update_from_data()  # noqa: SLF001
+
+
+async def async_setup_pool(hass: HomeAssistant, account: EpsAccountCoordinator, pid: str, mac: str) -> BenchPool:
+    """Create a pool's coordinator under an account and set up its entities like a loaded config entry does."""
+    entry = ConfigEntry(
+        data={"api_key": account.api_key, "mac_address": mac, "pid": pid},
+        discovery_keys=MappingProxyType({}),
+        domain=DOMAIN,
+        minor_version=1,
+        options={},
+        source="user",
+        title=mac,
+        unique_id=mac,
+        version=1,
+    )
+    coordinator = EpsDataUpdateCoordinator(hass, entry, account)
+    entry.runtime_data = coordinator
+    pool = BenchPool(coordinator)
+    for platform in _PLATFORMS:
+        await platform.async_setup_entry(hass, entry, pool.async_add_entities)
+    return pool
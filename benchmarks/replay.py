@@ -0,0 +1,193 @@
+"""
+Replay a capture of API traffic through the client, the pool coordinators and their entities, under cProfile.
+
+A capture is what the integration writes with "Record API traffic" enabled: eps_smart_pool_control.traffic.*.jsonl
+in the Home Assistant configuration directory, rotated into .1, .2, ... files. The recorded responses are served by a
+local replay server in the order they were recorded, and the calls are made again in their recorded order, compressed
+in time by --speed (0 replays without any pauses). Pool reads are made by each pool's EpsDataUpdateCoordinator, which
+parses the response and notifies its entities as it does in Home Assistant.
+
+    python -m benchmarks.replay eps_smart_pool_control.traffic.0123456789ab.jsonl --speed 60 --profile replay.pstats
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import cProfile
+import json
+import pstats
+import sys
+import time
+from collections import Counter, defaultdict, deque
+from http import HTTPStatus
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from aiohttp import web
+
+from custom_components.eps_smart_pool_control.api import EpsApiClient, EpsApiError
+from custom_components.eps_smart_pool_control.coordinator import EpsAccountCoordinator
+
+from .harness import BenchPool, async_bench_hass, async_setup_pool
+from .run import summarize
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+def load_capture(path: Path) -> list[dict]:
+    """Return the exchanges of a capture and its rotated predecessors, oldest first."""
+    files = sorted(path.parent.glob(f"{path.name}.*"), key=lambda file: int(file.suffix[1:]) if file.suffix[1:].isdigit() else 0, reverse=True)
+    exchanges: list[dict] = []
+    for file in [*files, path]:
+        if file.exists():
+            exchanges.extend(json.loads(line) for line in file.read_text(encoding="utf-8").splitlines() if line.strip())
+    exchanges.sort(key=lambda exchange: exchange["time"])
+    return exchanges
+
+
+class ReplayServer:
+    """Answer every request with the next response recorded for its method and path; the last one repeats once they run out."""
+
+    def __init__(self, exchanges: list[dict]) -> None:
+        """Queue the recorded responses."""
+        self._responses: dict[tuple[str, str], deque[dict]] = defaultdict(deque)
+        for exchange in exchanges:
+            if exchange["status"] is not None:
+                self._responses[exchange["endpoint"].split(" ", 1)[0], exchange["path"]].append(exchange)
+        self._runner: web.AppRunner | None = None
+
+    async def start(self) -> str:
+        """Start serving on a free local port and return the base URL."""
+        app = web.Application()
+        app.router.add_route("*", "/{path:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", 0).start()
+        host, port = self._runner.addresses[0][:2]
+        return f"http://{host}:{port}"
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        queued = self._responses.get((request.method, request.path))
+        if not queued:
+            return web.json_response({"error": "not in capture"}, status=HTTPStatus.NOT_FOUND)
+        exchange = queued.popleft() if len(queued) > 1 else queued[0]
+        body = exchange["response"]
+        if body is None:
+            return web.Response(status=exchange["status"])
+        if isinstance(body, str):
+            return web.Response(status=exchange["status"], text=body)
+        return web.json_response(body, status=exchange["status"])
+
+
+def _failure_key(err: BaseException) -> str:
+    """Return the HTTP status or exception type a failure is counted under."""
+    if isinstance(err.__cause__, EpsApiError):
+        err = err.__cause__
+    return str(err.status) if isinstance(err, EpsApiError) and err.status else type(err).__name__
+
+
+async def _async_refresh_pool(pool: BenchPool, fanout: list[float], failures: Counter[str]) -> None:
+    """Let a pool's coordinator fetch the pool and notify its entities, recording the fan-out time it measured."""
+    coordinator = pool.coordinator
+    count, total = coordinator.fanout.count, coordinator.fanout.sum
+    await coordinator.async_refresh()
+    if not coordinator.last_update_success and coordinator.last_exception is not None:
+        failures[_failure_key(coordinator.last_exception)] += 1
+    if coordinator.fanout.count > count:
+        fanout.append(coordinator.fanout.sum - total)
+
+
+async def replay(exchanges: list[dict], speed: float) -> dict[str, object]:
+    """Make the recorded calls again against the replay server and return what happened."""
+    async with async_bench_hass() as hass:
+        return await _async_replay(hass, exchanges, speed)
+
+
+async def _async_replay(hass: HomeAssistant, exchanges: list[dict], speed: float) -> dict[str, object]:
+    server = ReplayServer(exchanges)
+    base_url = await server.start()
+    calls: Counter[str] = Counter()
+    failures: Counter[str] = Counter()
+    fanout: list[float] = []
+    account = EpsAccountCoordinator(hass, "replay")
+    pools: dict[str, BenchPool] = {}
+    started = time.perf_counter()
+    try:
+        async with EpsApiClient("replay", base_url=base_url, max_retries=0) as client:
+            # The pool coordinators fetch through their account's client, which is pointed at the replay server.
+            account.client = client
+            previous_time = exchanges[0]["time"] if exchanges else 0.0
+            for exchange in exchanges:
+                if exchange["status"] is None:
+                    # The call never got an answer; there is nothing to serve for it.
+                    failures[exchange["error"] or "error"] += 1
+                    continue
+                if speed > 0:
+                    await asyncio.sleep(max(exchange["time"] - previous_time, 0) / speed)
+                previous_time = exchange["time"]
+                endpoint = exchange["endpoint"]
+                parts = exchange["path"].strip("/").split("/")
+                calls[endpoint] += 1
+                try:
+                    if endpoint == "GET /pool":
+                        await client.list_pools()
+                    elif endpoint == "GET /pool/{pid}":
+                        if (pool := pools.get(parts[1])) is None:
+                            response = exchange["response"]
+                            mac = response.get("mac") if isinstance(response, dict) else None
+                            pool = pools[parts[1]] = await async_setup_pool(hass, account, parts[1], str(mac or parts[1]))
+                        await _async_refresh_pool(pool, fanout, failures)
+                    elif endpoint.startswith("PATCH ") and isinstance(exchange["request"], dict):
+                        await client.patch_module(parts[1], parts[2], exchange["request"])
+                except EpsApiError as err:
+                    failures[_failure_key(err)] += 1
+            metrics = client.metrics.as_dict()
+    finally:
+        await server.stop()
+    return {
+        "exchanges": len(exchanges),
+        "pools": len(pools),
+        "calls": dict(calls),
+        "failures": dict(failures),
+        "wall_seconds": round(time.perf_counter() - started, 6),
+        "recorded_seconds": round(exchanges[-1]["time"] - exchanges[0]["time"], 3) if exchanges else 0.0,
+        "speed": speed,
+        "fanout": summarize(fanout) if fanout else None,
+        "api": metrics,
+    }
+
+
+def main() -> None:
+    """Replay a capture from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("capture", type=Path, help="the current capture file; its rotated .1, .2, ... files are read as well")
+    parser.add_argument("--speed", type=float, default=0.0, help="replay this many times faster than recorded; 0 replays without pauses")
+    parser.add_argument("--profile", type=Path, help="write the cProfile stats here, for snakeviz or pstats")
+    parser.add_argument("--top", type=int, default=25, help="functions to list by cumulative time")
+    parser.add_argument("--output", type=Path, help="write the replay summary here instead of to stdout")
+    args = parser.parse_args()
+
+    exchanges = load_capture(args.capture)
+    profiler = cProfile.Profile()
+    summary = profiler.runcall(asyncio.run, replay(exchanges, args.speed))
+    if args.profile:
+        profiler.dump_stats(args.profile)
+    if args.top:
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(args.top)
+
+    text = json.dumps(summary, indent=2) + "\n"
+    if args.output:
+        args.output.write_text(text)
+    else:
+        sys.stdout.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+Benchmarks for the EPS Smart Pool Control API client and models, run against the local fake API.
+
+Measures, for every pool count given:
+
+- setup: a cold client listing the pools and fetching every one, and each pool's coordinator creating its entities
+- refresh: a warm poll cycle fetching every pool, conditional GETs included
+- writes: write_module round trips to a dosing module (partial body) and the filter (full body)
+
+and, without the network:
+
+- parse / fanout: parsing a changed payload against the previous model, and the pool's EpsDataUpdateCoordinator
+  taking it and notifying the entities of the modules that changed
+
+The coordinators and entities are the integration's own, run in a bare Home Assistant instance (see harness.py).
+Results are written as JSON; --compare exits non-zero when a p50 regressed against an earlier result file.
+
+    python -m benchmarks.run --pools 1 10 100 --output bench.json
+    python -m benchmarks.run --compare bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import json
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from custom_components.eps_smart_pool_control.api import EpsApiClient, EpsApiError, Pool
+from custom_components.eps_smart_pool_control.coordinator import EpsAccountCoordinator
+
+from .fake_server import FakeApiConfig, FakeEpsApi, advance_pool, make_pool
+from .harness import BenchPool, async_bench_hass, async_setup_pool
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+DEFAULT_POOL_COUNTS = (1, 10, 100)
+
+
+def summarize(samples: list[float]) -> dict[str, float | int]:
+    """Return count, mean, min, p50, p95 and max of timings in seconds."""
+    ordered = sorted(samples)
+
+    def percentile(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 6)
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 6),
+        "min": round(ordered[0], 6),
+        "p50": percentile(0.5),
+        "p95": percentile(0.95),
+        "max": round(ordered[-1], 6),
+    }
+
+
+def _client_counts(client: EpsApiClient) -> dict[str, int]:
+    return {"errors": client.metrics.error_count, "retries": client.metrics.retry_count}
+
+
+async def _async_setup_pools(hass: HomeAssistant, server: FakeEpsApi, api_key: str) -> dict[str, BenchPool]:
+    """Create the coordinator and entities of every pool of the fake API under a new account."""
+    account = EpsAccountCoordinator(hass, api_key)
+    return {pid: await async_setup_pool(hass, account, pid, str(pool["mac"])) for pid, pool in server.pools.items()}
+
+
+async def bench_setup(hass: HomeAssistant, server: FakeEpsApi, pools: int, repeat: int) -> dict[str, object]:
+    """Time a cold start: list the pools, fetch every one and hand it to its coordinator, which creates its entities."""
+    samples: list[float] = []
+    counts = {"errors": 0, "retries": 0}
+    for index in range(repeat):
+        bench_pools = await _async_setup_pools(hass, server, f"setup-{pools}-{index}")
+        async with EpsApiClient("bench", base_url=server.base_url) as client:
+            started = time.perf_counter()
+            pids = [item["pid"] for item in await client.list_pools()]
+            states = await client.get_pool_states(pids)
+            for pid, state in states.items():
+                if not isinstance(state, EpsApiError):
+                    bench_pools[pid].coordinator.async_set_updated_data(state)
+            samples.append(time.perf_counter() - started)
+            for key, value in _client_counts(client).items():
+                counts[key] += value
+    return {"name": "setup", "pools": pools, **summarize(samples), **counts}
+
+
+async def bench_refresh(hass: HomeAssistant, server: FakeEpsApi, pools: int, iterations: int) -> dict[str, object]:
+    """Time warm poll cycles over every pool, each pool's coordinator taking the states that changed."""
+    samples: list[float] = []
+    bench_pools = await _async_setup_pools(hass, server, f"refresh-{pools}")
+    async with EpsApiClient("bench", base_url=server.base_url) as client:
+        pids = list(server.pools)
+        for pid, state in (await client.get_pool_states(pids)).items():
+            if not isinstance(state, EpsApiError):
+                bench_pools[pid].coordinator.async_set_updated_data(state)
+        for _ in range(iterations):
+            started = time.perf_counter()
+            states = await client.get_pool_states(pids)
+            for pid, state in states.items():
+                coordinator = bench_pools[pid].coordinator
+                # Like EpsDataUpdateCoordinator.async_handle_account_update, an unchanged pool is not handed over.
+                if not isinstance(state, EpsApiError) and state is not coordinator.data:
+                    coordinator.async_set_updated_data(state)
+            samples.append(time.perf_counter() - started)
+        not_modified = sum(count for (_, _, status), count in client.metrics.responses.items() if status == "304")
+        return {"name": "refresh", "pools": pools, **summarize(samples), "not_modified": not_modified, **_client_counts(client)}
+
+
+async def bench_writes(server: FakeEpsApi, iterations: int) -> list[dict[str, object]]:
+    """Time write_module round trips to the chlorine target (partial body) and a filter schedule (full body)."""
+    results: list[dict[str, object]] = []
+    async with EpsApiClient("bench", base_url=server.base_url) as client:
+        pid = next(iter(server.pools))
+        state = await client.get_pool_state(pid)
+        for module, change in (
+            ("cl", lambda index: {"rx": {"target": 700.0 + (index + 1) % 2 * 10}}),
+            ("filter", lambda index: {"schedule_1": {"enabled": index % 2 == 0}}),
+        ):
+            samples: list[float] = []
+            for index in range(iterations):
+                current = state.module(module).raw_config
+                started = time.perf_counter()
+                written = await client.write_module(pid, module, current, change(index))
+                samples.append(time.perf_counter() - started)
+                state = state.with_changes({module: {"config": written}})
+            results.append({"name": f"write_{module}", "pools": 1, **summarize(samples), **_client_counts(client)})
+    return results
+
+
+async def bench_models(hass: HomeAssistant, iterations: int, seed: int) -> list[dict[str, object]]:
+    """Time parsing changed payloads against the previous model, and the coordinator fanning each out to the entities."""
+    rng = random.Random(seed)  # noqa: S311
+    payload = make_pool(0)
+    bench_pool = await async_setup_pool(hass, EpsAccountCoordinator(hass, "models"), str(payload["pid"]), str(payload["mac"]))
+    previous = Pool.from_dict(payload)
+    bench_pool.coordinator.async_set_updated_data(previous)
+    notified = bench_pool.notified
+    parse: list[float] = []
+    fanout: list[float] = []
+    for _ in range(iterations):
+        payload = copy.deepcopy(payload)
+        advance_pool(payload, rng)
+        started = time.perf_counter()
+        data = Pool.from_dict(payload, previous)
+        parsed = time.perf_counter()
+        bench_pool.coordinator.async_set_updated_data(data)
+        fanout.append(time.perf_counter() - parsed)
+        parse.append(parsed - started)
+        previous = data
+    notified = bench_pool.notified - notified
+    return [
+        {"name": "parse", "pools": 1, **summarize(parse)},
+        {"name": "fanout", "pools": 1, **summarize(fanout), "listeners": len(bench_pool.entities), "notified_per_update": round(notified / iterations, 2)},
+    ]
+
+
+async def run(args: argparse.Namespace) -> dict[str, object]:
+    """Run every benchmark and return the results document."""
+    async with async_bench_hass() as hass:
+        return await _async_run(hass, args)
+
+
+async def _async_run(hass: HomeAssistant, args: argparse.Namespace) -> dict[str, object]:
+    results: list[dict[str, object]] = await bench_models(hass, args.model_iterations, args.seed)
+    for pools in args.pools:
+        config = FakeApiConfig(
+            pools=pools,
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            rate_limit_rate=args.rate_limit_rate,
+            retry_after=args.retry_after,
+            change_rate=args.change_rate,
+            seed=args.seed,
+        )
+        async with FakeEpsApi(config) as server:
+            results.append(await bench_setup(hass, server, pools, args.repeat))
+            results.append(await bench_refresh(hass, server, pools, args.iterations))
+            if pools == args.pools[0]:
+                results.extend(await bench_writes(server, args.iterations))
+    return {
+        "meta": {
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "options": {key: value for key, value in vars(args).items() if key not in ("output", "compare", "threshold")},
+        },
+        "results": results,
+    }
+
+
+def compare(document: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return a line for every result whose p50 is more than threshold (a fraction) slower than in the baseline."""
+    before = {(result["name"], result["pools"]): result for result in baseline["results"]}
+    regressions: list[str] = []
+    for result in document["results"]:
+        old = before.get((result["name"], result["pools"]))
+        if old is not None and old["p50"] > 0 and result["p50"] > old["p50"] * (1 + threshold):
+            regressions.append(f"{result['name']} ({result['pools']} pools): p50 {old['p50']:.6f}s -> {result['p50']:.6f}s")
+    return regressions
+
+
+def main() -> None:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pools", type=int, nargs="+", default=list(DEFAULT_POOL_COUNTS), help="pool counts to scale over")
+    parser.add_argument("--iterations", type=int, default=20, help="refresh cycles and writes per module")
+    parser.add_argument("--repeat", type=int, default=5, help="cold starts per pool count")
+    parser.add_argument("--model-iterations", type=int, default=2000, help="payloads parsed and dispatched without the network")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the fake API adds to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many seconds added on top, at random")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=0.0, help="Retry-After of the 429 answers, in seconds")
+    parser.add_argument("--change-rate", type=float, default=1.0, help="fraction of pool reads that see new measurements")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write the results here instead of to stdout")
+    parser.add_argument("--compare", type=Path, help="earlier results to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed p50 slowdown against --compare, as a fraction")
+    args = parser.parse_args()
+
+    document = asyncio.run(run(args))
+    text = json.dumps(document, indent=2) + "\n"
+    if args.output:
+        args.output.write_text(text)
+    else:
+        sys.stdout.write(text)
+    if args.compare:
+        regressions = compare(document, json.loads(args.compare.read_text()), args.threshold)
+        for line in regressions:
+            sys.stderr.write(f"regression: {line}\n")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
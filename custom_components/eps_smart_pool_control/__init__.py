@@ -7,12 +7,16 @@ from typing import TYPE_CHECKING
 from homeassistant.const import Platform
 from homeassistant.helpers import config_validation as cv
 
-from .const import DOMAIN
-from .coordinator import EpsDataUpdateCoordinator
+from .const import CONF_PUSH_UPDATES, DOMAIN
+from .coordinator import EpsDataUpdateCoordinator, async_get_account_coordinator, async_release_account_coordinator, async_remove_snapshot
+from .image import async_remove_avatar_cache
+from .push import async_setup_push
+from .services import async_setup_services
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
 PLATFORMS: list[Platform] = [
     Platform.BINARY_SENSOR,
@@ -25,17 +29,55 @@ PLATFORMS: list[Platform] = [
 CONFIG_SCHEMA = cv.removed(DOMAIN, raise_if_present=False)
 
 
+async def async_setup(hass: HomeAssistant, _config: ConfigType) -> bool:
+    """Set up the EPS Smart Pool Control services."""
+    async_setup_services(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up EPS Smart Pool Control from a config entry."""
-    coordinator = EpsDataUpdateCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
+    account = async_get_account_coordinator(hass, entry.data.get("api_key", ""))
+    coordinator = EpsDataUpdateCoordinator(hass, entry, account)
+    try:
+        # With the state of the previous run at hand the platforms come up right away and the refresh runs behind them.
+        if await coordinator.async_restore_snapshot():
+            entry.async_create_background_task(hass, coordinator.async_refresh_restored(), f"{DOMAIN} first refresh {entry.entry_id}")
+        else:
+            await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        account.async_unregister_pool(coordinator.mac_address)
+        async_release_account_coordinator(hass, account)
+        raise
 
     entry.runtime_data = coordinator
+    entry.async_on_unload(account.async_add_listener(coordinator.async_handle_account_update))
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    if entry.options.get(CONF_PUSH_UPDATES):
+        async_setup_push(hass, entry, coordinator)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change; data-only updates such as a newly resolved pool ID are ignored."""
+    coordinator: EpsDataUpdateCoordinator = entry.runtime_data
+    if dict(entry.options) != coordinator.options:
+        await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unloaded = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unloaded:
+        coordinator: EpsDataUpdateCoordinator = entry.runtime_data
+        coordinator.account.async_unregister_pool(coordinator.mac_address)
+        async_release_account_coordinator(hass, coordinator.account)
+    return unloaded
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the files cached for a deleted config entry."""
+    await async_remove_avatar_cache(hass, entry.entry_id)
+    await async_remove_snapshot(hass, entry.entry_id)
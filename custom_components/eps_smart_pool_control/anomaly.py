@@ -0,0 +1,180 @@
+"""Streaming anomaly detection on the chemistry and pump metrics of a pool."""
+
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from .api import resolve_path
+from .history import TRACKED_METRICS
+
+if TYPE_CHECKING:
+    from .api import Pool
+
+# Samples in the rolling baseline, and the weight of the newest sample in the moving average.
+DEFAULT_WINDOW = 120
+DEFAULT_ALPHA = 0.1
+
+# Samples needed before spikes and drift are judged against the baseline; limits apply from the first sample.
+_MIN_SAMPLES = 20
+
+
+class AnomalyKind(StrEnum):
+    """What is wrong with a metric."""
+
+    LOW = "low"
+    HIGH = "high"
+    SPIKE = "spike"
+    DRIFT = "drift"
+
+
+@dataclass(frozen=True, slots=True)
+class DetectorConfig:
+    """
+    Limits and sensitivity for one metric.
+
+    A spike is a sample more than spike_z standard deviations from the rolling mean. Drift is the moving average
+    moving more than drift_z of its own standard deviations away from it, as in an EWMA control chart; that catches a
+    slow, steady change long before single samples look unusual. The standard deviation is floored at min_std, the
+    metric's measurement resolution, so a flat signal does not turn noise into anomalies.
+    """
+
+    path: tuple[str, ...]
+    low: float | None = None
+    high: float | None = None
+    spike_z: float = 4.0
+    drift_z: float = 3.5
+    min_std: float = 0.01
+
+
+DETECTORS: dict[str, DetectorConfig] = {
+    "ph": DetectorConfig(TRACKED_METRICS["ph"], low=6.8, high=7.8, min_std=0.02),
+    "rx": DetectorConfig(TRACKED_METRICS["rx"], low=550.0, high=900.0, min_std=5.0),
+    "pump_current": DetectorConfig(TRACKED_METRICS["pump_current"], spike_z=5.0, min_std=0.05),
+}
+
+
+class RollingStats:
+    """Mean and variance of the last `window` samples, updated in O(1) per sample with Welford's method."""
+
+    __slots__ = ("_m2", "_next", "_values", "count", "mean", "window")
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        """Initialize empty statistics."""
+        self.window = window
+        self._values = array("d", bytes(8 * window))
+        self._next = 0
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def std(self) -> float:
+        """Return the sample standard deviation, 0 with fewer than two samples."""
+        return math.sqrt(max(self._m2, 0.0) / (self.count - 1)) if self.count > 1 else 0.0
+
+    def push(self, value: float) -> None:
+        """Add a sample; once the window is full it replaces the oldest one."""
+        if self.count < self.window:
+            self.count += 1
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self._m2 += delta * (value - self.mean)
+        else:
+            old = self._values[self._next]
+            old_mean = self.mean
+            self.mean += (value - old) / self.count
+            self._m2 += (value - old) * (value - self.mean + old - old_mean)
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.window
+
+
+class MetricDetector:
+    """Judges every new sample of a metric against its limits, its rolling baseline and its moving average."""
+
+    def __init__(self, config: DetectorConfig, window: int = DEFAULT_WINDOW, alpha: float = DEFAULT_ALPHA) -> None:
+        """Initialize the detector."""
+        self.config = config
+        self.alpha = alpha
+        # Standard deviation of the moving average of independent samples, relative to that of the samples.
+        self._ewma_scale = math.sqrt(alpha / (2 - alpha))
+        self.stats = RollingStats(window)
+        self.ewma: float | None = None
+        self.value: float | None = None
+        self.z_score: float | None = None
+        self.drift_score: float | None = None
+        self.active: frozenset[AnomalyKind] = frozenset()
+
+    def update(self, value: float) -> frozenset[AnomalyKind]:
+        """Add a sample and return the anomalies it starts; active holds every anomaly that is still going on."""
+        config = self.config
+        kinds: set[AnomalyKind] = set()
+        if config.low is not None and value < config.low:
+            kinds.add(AnomalyKind.LOW)
+        if config.high is not None and value > config.high:
+            kinds.add(AnomalyKind.HIGH)
+
+        self.ewma = value if self.ewma is None else self.alpha * value + (1 - self.alpha) * self.ewma
+        # Scores are taken against the baseline before this sample joins it, so a spike cannot hide itself.
+        if self.stats.count >= _MIN_SAMPLES:
+            std = max(self.stats.std, config.min_std)
+            self.z_score = (value - self.stats.mean) / std
+            self.drift_score = (self.ewma - self.stats.mean) / (std * self._ewma_scale)
+            if abs(self.z_score) > config.spike_z:
+                kinds.add(AnomalyKind.SPIKE)
+            if abs(self.drift_score) > config.drift_z:
+                kinds.add(AnomalyKind.DRIFT)
+        self.stats.push(value)
+        self.value = value
+
+        started = frozenset(kinds) - self.active
+        self.active = frozenset(kinds)
+        return started
+
+    def as_dict(self) -> dict[str, object]:
+        """Return the detector's state for attributes, events and diagnostics."""
+
+        def rounded(value: float | None) -> float | None:
+            return round(value, 3) if value is not None else None
+
+        return {
+            "anomalies": sorted(self.active),
+            "value": rounded(self.value),
+            "mean": rounded(self.stats.mean) if self.stats.count else None,
+            "std": rounded(self.stats.std) if self.stats.count else None,
+            "ewma": rounded(self.ewma),
+            "z_score": rounded(self.z_score),
+            "drift_score": rounded(self.drift_score),
+            "samples": self.stats.count,
+        }
+
+
+class PoolAnomalies:
+    """Detectors for one pool, fed with every new pool payload."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW, alpha: float = DEFAULT_ALPHA) -> None:
+        """Initialize the detectors."""
+        self.metrics = {name: MetricDetector(config, window, alpha) for name, config in DETECTORS.items()}
+        self._last_timestamp: float | None = None
+
+    def record(self, data: Pool) -> list[tuple[str, AnomalyKind]]:
+        """
+        Feed the metrics of a pool state to their detectors and return the (metric, kind) anomalies it starts.
+
+        Like the history, a state the device has not refreshed since the previous one (same activity_at) is skipped,
+        so every device reading counts once.
+        """
+        timestamp = data.activity_at / 1000 if data.activity_at is not None else time.time()
+        if self._last_timestamp is not None and timestamp <= self._last_timestamp:
+            return []
+        self._last_timestamp = timestamp
+        started: list[tuple[str, AnomalyKind]] = []
+        for name, detector in self.metrics.items():
+            value = resolve_path(data, detector.config.path)
+            if isinstance(value, int | float) and not isinstance(value, bool):
+                started.extend((name, kind) for kind in sorted(detector.update(float(value))))
+        return started
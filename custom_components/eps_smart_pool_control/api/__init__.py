@@ -0,0 +1,79 @@
+"""
+Standalone client for the EPS Smart Pool Control V2 API.
+
+The package only depends on aiohttp, so it can drive pools outside Home Assistant as well.
+"""
+
+from .budget import Priority, RequestBudget
+from .client import API_BASE, CircuitBreaker, EpsApiClient
+from .exceptions import EpsApiCircuitOpenError, EpsApiConnectionError, EpsApiError, EpsApiNotFoundError, EpsApiRateLimitError, EpsApiValidationError
+from .instrumentation import FANOUT_BUCKETS, ApiMetrics, Histogram
+from .models import (
+    ActualMetrics,
+    ClConfig,
+    ClModule,
+    CoverModule,
+    CoverStatus,
+    FilterConfig,
+    FilterMetrics,
+    FilterModule,
+    FilterSchedule,
+    FilterStatus,
+    ModuleStatus,
+    PhModule,
+    Pool,
+    PoolModule,
+    PoolSummary,
+    Spec,
+    TargetConfig,
+    TemperatureMetrics,
+    TemperatureModule,
+    merge_copy,
+    resolve_path,
+)
+from .recording import TrafficRecorder
+from .sync import EpsSyncClient
+from .writes import PatchShape, PatchShapes, config_change
+
+__all__ = [
+    "API_BASE",
+    "FANOUT_BUCKETS",
+    "ActualMetrics",
+    "ApiMetrics",
+    "CircuitBreaker",
+    "ClConfig",
+    "ClModule",
+    "CoverModule",
+    "CoverStatus",
+    "EpsApiCircuitOpenError",
+    "EpsApiClient",
+    "EpsApiConnectionError",
+    "EpsApiError",
+    "EpsApiNotFoundError",
+    "EpsApiRateLimitError",
+    "EpsApiValidationError",
+    "EpsSyncClient",
+    "FilterConfig",
+    "FilterMetrics",
+    "FilterModule",
+    "FilterSchedule",
+    "FilterStatus",
+    "Histogram",
+    "ModuleStatus",
+    "PatchShape",
+    "PatchShapes",
+    "PhModule",
+    "Pool",
+    "PoolModule",
+    "PoolSummary",
+    "Priority",
+    "RequestBudget",
+    "Spec",
+    "TargetConfig",
+    "TemperatureMetrics",
+    "TemperatureModule",
+    "TrafficRecorder",
+    "config_change",
+    "merge_copy",
+    "resolve_path",
+]
@@ -0,0 +1,114 @@
+"""Request budget shared by every call made with one API key."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+from .exceptions import EpsApiRateLimitError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+DEFAULT_CAPACITY = 60
+DEFAULT_REFILL_RATE = 0.5
+DEFAULT_WRITE_RESERVE = 0.2
+
+# A call that would have to wait longer than this for a token fails with EpsApiRateLimitError instead.
+_MAX_WAIT = 60.0
+
+
+class Priority(IntEnum):
+    """How urgent a call is: writes may use the whole budget, polls leave the write reserve alone."""
+
+    WRITE = 0
+    POLL = 1
+
+
+class RequestBudget:
+    """
+    Token bucket for the requests made with one API key.
+
+    Every request takes a token and tokens come back at refill_rate per second, up to capacity. Polls stop short of
+    the write reserve (a fraction of the capacity), so a user's writes still go out right away while background polling
+    is held back. A 429 empties the bucket and stops refilling it until its Retry-After has passed.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        refill_rate: float = DEFAULT_REFILL_RATE,
+        write_reserve: float = DEFAULT_WRITE_RESERVE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a full bucket."""
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.reserve = capacity * write_reserve
+        self.granted: Counter[Priority] = Counter()
+        self.rate_limited = 0
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+
+    def _refill(self) -> float:
+        now = self._clock()
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_rate)
+            self._updated = now
+        return now
+
+    @property
+    def tokens(self) -> float:
+        """Return the tokens in the bucket now."""
+        self._refill()
+        return self._tokens
+
+    def available(self, priority: Priority = Priority.POLL) -> int:
+        """Return the number of calls of a priority that could go out right now."""
+        floor = 0.0 if priority is Priority.WRITE else self.reserve
+        return int(max(self.tokens - floor, 0))
+
+    def burst(self, priority: Priority = Priority.POLL) -> int:
+        """Return the most calls of a priority a full bucket lets out at once."""
+        floor = 0.0 if priority is Priority.WRITE else self.reserve
+        return int(self.capacity - floor)
+
+    def delay(self, priority: Priority = Priority.POLL, count: int = 1) -> float:
+        """Return the seconds until `count` calls of a priority could go out, 0 when they can go out now."""
+        now = self._refill()
+        floor = 0.0 if priority is Priority.WRITE else self.reserve
+        missing = floor + count - self._tokens
+        blocked = max(self._updated - now, 0.0)
+        return blocked + missing / self.refill_rate if missing > 0 else blocked
+
+    async def acquire(self, priority: Priority) -> None:
+        """Take a token, waiting for one when the budget is used up; raises EpsApiRateLimitError when that takes too long."""
+        while (delay := self.delay(priority)) > 0:
+            if delay > _MAX_WAIT:
+                msg = f"API request budget exhausted, next {priority.name.lower()} call possible in {delay:.0f}s"
+                raise EpsApiRateLimitError(msg, delay)
+            await asyncio.sleep(delay)
+        self._tokens -= 1
+        self.granted[priority] += 1
+
+    def note_rate_limited(self, retry_after: float | None) -> None:
+        """Empty the bucket after a 429; refilling resumes once its Retry-After has passed."""
+        now = self._refill()
+        self.rate_limited += 1
+        self._tokens = 0.0
+        self._updated = max(self._updated, now + (retry_after or 0.0))
+
+    def as_dict(self) -> dict[str, object]:
+        """Return a JSON-serializable snapshot."""
+        return {
+            "tokens": round(self.tokens, 2),
+            "capacity": self.capacity,
+            "refill_per_minute": self.refill_rate * 60,
+            "write_reserve": self.reserve,
+            "granted": {priority.name.lower(): count for priority, count in self.granted.items()},
+            "rate_limited": self.rate_limited,
+        }
@@ -0,0 +1,448 @@
+"""Client for the EPS Smart Pool Control V2 API."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import time
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Self
+
+import aiohttp
+
+from .budget import Priority
+from .exceptions import EpsApiCircuitOpenError, EpsApiConnectionError, EpsApiError, EpsApiNotFoundError, EpsApiRateLimitError
+from .instrumentation import ApiMetrics
+from .models import Pool
+from .writes import PatchShape, PatchShapes, build_body, diff_changes, validate_changes
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable, Mapping
+    from types import TracebackType
+
+    from .budget import RequestBudget
+    from .recording import TrafficRecorder
+
+_LOGGER = logging.getLogger(__name__)
+
+API_BASE = "https://api.smartpoolconnect.eu"
+
+DEFAULT_TIMEOUT = 15.0
+DEFAULT_MAX_RETRIES = 3
+_BACKOFF_BASE = 1.0
+_BACKOFF_MAX = 30.0
+
+# A Retry-After longer than this is not waited out inside a call; the caller gets EpsApiRateLimitError instead.
+_MAX_RETRY_AFTER = 60.0
+
+_CIRCUIT_FAILURE_THRESHOLD = 5
+_CIRCUIT_RESET_TIMEOUT = 60.0
+
+# Connection pool of a session the client creates itself; keep-alive lets a poll cycle reuse its connections.
+_CONNECTION_LIMIT = 16
+_KEEPALIVE_TIMEOUT = 60.0
+
+DEFAULT_CONCURRENCY = 4
+
+
+class CircuitBreaker:
+    """
+    Stop calling the API after repeated failures.
+
+    After a run of failed calls the circuit opens and calls fail immediately. Once the reset timeout has passed a
+    single trial call is let through; its outcome closes the circuit again or restarts the timeout.
+    """
+
+    def __init__(self, failure_threshold: int = _CIRCUIT_FAILURE_THRESHOLD, reset_timeout: float = _CIRCUIT_RESET_TIMEOUT) -> None:
+        """Initialize the breaker."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._trial_running = False
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while calls are being rejected."""
+        return self._opened_at is not None
+
+    def check(self) -> None:
+        """Raise EpsApiCircuitOpenError when a call would be rejected now, without taking the trial."""
+        if self._opened_at is None:
+            return
+        remaining = self._opened_at + self.reset_timeout - time.monotonic()
+        if remaining > 0 or self._trial_running:
+            msg = f"API calls suspended after {self.failures} consecutive failures, retrying in {max(remaining, 0):.0f}s"
+            raise EpsApiCircuitOpenError(msg)
+
+    def before_call(self) -> bool:
+        """Raise EpsApiCircuitOpenError unless a call may go out now; return True when that call is the trial."""
+        self.check()
+        if self._opened_at is None:
+            return False
+        self._trial_running = True
+        return True
+
+    def abort_trial(self) -> None:
+        """Let another call be the trial after the trial call ended without an outcome, e.g. because it was cancelled."""
+        self._trial_running = False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        self.failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit once the threshold is reached."""
+        self.failures += 1
+        self._trial_running = False
+        if self.failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+
+
+class _CachedPool:
+    """The last payload received for a pool, with the validators needed to detect that it is unchanged."""
+
+    def __init__(self, data: dict, digest: bytes) -> None:
+        self.data = data
+        self.digest = digest
+        self.model: Pool | None = None
+        self.etag: str | None = None
+        self.last_modified: str | None = None
+
+
+class _Response:
+    """Status, headers and body of a completed request."""
+
+    def __init__(self, status: int, reason: str | None, headers: Mapping[str, str], body: bytes) -> None:
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+
+def _retry_after(headers: Mapping[str, str]) -> float | None:
+    """Return the Retry-After delay in seconds, if the header holds one."""
+    value = headers.get(aiohttp.hdrs.RETRY_AFTER)
+    try:
+        return max(float(value), 0.0) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _endpoint(method: str, parts: tuple[str, ...]) -> str:
+    """Return the endpoint template of a request, e.g. GET /pool/{pid}, with the pool ID replaced by a placeholder."""
+    return f"{method} /" + "/".join(part if index != 1 else "{pid}" for index, part in enumerate(parts))
+
+
+def _backoff(attempt: int) -> float:
+    """Return a jittered exponential delay for a retry attempt."""
+    return min(_BACKOFF_MAX, _BACKOFF_BASE * 2**attempt) * random.uniform(0.5, 1.0)  # noqa: S311
+
+
+class EpsApiClient:
+    """
+    Async client for the EPS Smart Pool Control V2 API.
+
+    Every call has a timeout. Idempotent GETs are retried with jittered exponential backoff on connection errors,
+    timeouts and 5xx answers; every call honours a short Retry-After on 429. A circuit breaker shared by all calls
+    fails fast while the API is down.
+
+    With a budget every attempt first takes a token from it, writes ahead of polls, and a 429 pauses the budget.
+    With a recorder every exchange is also written to its capture file, for replaying it offline.
+
+    The client has no Home Assistant dependencies. Pass a session to share its connection pool; without one the
+    client opens a pooled keep-alive session on first use and closes it in close() or when used as a context manager.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        session: aiohttp.ClientSession | None = None,
+        base_url: str = API_BASE,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        shapes: PatchShapes | None = None,
+        metrics: ApiMetrics | None = None,
+        source: str = "cloud",
+        recorder: TrafficRecorder | None = None,
+        budget: RequestBudget | None = None,
+    ) -> None:
+        """Initialize the client; clients talking to the same pools can share what they learned about PATCH shapes."""
+        self._session = session
+        self._owns_session = session is None
+        self._base_url = base_url.rstrip("/")
+        self._headers = {"X-API-Key": api_key}
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._max_retries = max_retries
+        self._pool_cache: dict[str, _CachedPool] = {}
+        self.circuit = CircuitBreaker()
+        self.shapes = shapes if shapes is not None else PatchShapes()
+        self.metrics = metrics if metrics is not None else ApiMetrics()
+        self.source = source
+        self.recorder = recorder
+        self.budget = budget
+
+    async def __aenter__(self) -> Self:
+        """Return the client; its own session is closed on exit."""
+        return self
+
+    async def __aexit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None) -> None:
+        """Close the session the client opened itself."""
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the session the client opened itself; a session passed in is left to its owner."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=_CONNECTION_LIMIT, keepalive_timeout=_KEEPALIVE_TIMEOUT)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    def _url(self, *parts: str) -> str:
+        return "/".join((self._base_url, *parts))
+
+    async def _request(
+        self,
+        method: str,
+        *parts: str,
+        params: dict[str, str] | None = None,
+        json_body: dict | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> _Response:
+        """Send a request, retrying where that is safe, and return the final response."""
+        url = self._url(*parts)
+        endpoint = _endpoint(method, parts)
+        idempotent = method == aiohttp.hdrs.METH_GET
+        # Serialized once, so retries resend the same bytes and the payload size can be recorded.
+        body = json.dumps(json_body).encode() if json_body is not None else None
+        request_headers = {**self._headers, **(headers or {})}
+        if body is not None:
+            request_headers[aiohttp.hdrs.CONTENT_TYPE] = "application/json"
+        attempt = 0
+        while True:
+            if self.budget is not None:
+                # A call the circuit would reject must not use up a token of the budget.
+                self.circuit.check()
+                await self.budget.acquire(Priority.POLL if idempotent else Priority.WRITE)
+            started = time.monotonic()
+            try:
+                result = await self._send(method, url, params, body, request_headers)
+            except (aiohttp.ClientError, TimeoutError) as err:
+                self._observe(endpoint, parts, params, body, time.monotonic() - started, error=type(err).__name__)
+                self.circuit.record_failure()
+                if not idempotent or attempt >= self._max_retries or self.circuit.is_open:
+                    msg = f"API {method} {url} failed: {err or type(err).__name__}"
+                    raise EpsApiConnectionError(msg) from err
+                delay = _backoff(attempt)
+            else:
+                self._observe(endpoint, parts, params, body, time.monotonic() - started, result=result)
+                if result.status == HTTPStatus.TOO_MANY_REQUESTS:
+                    # Throttled, but reachable: this does not count against the circuit.
+                    self.circuit.record_success()
+                    retry_after = _retry_after(result.headers)
+                    if self.budget is not None:
+                        self.budget.note_rate_limited(retry_after)
+                    if attempt >= self._max_retries or (retry_after is not None and retry_after > _MAX_RETRY_AFTER):
+                        msg = f"API {method} {url} rate limited, retry after {retry_after}s"
+                        raise EpsApiRateLimitError(msg, retry_after)
+                    delay = retry_after if retry_after is not None else _backoff(attempt)
+                elif result.status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+                    self.circuit.record_failure()
+                    if not idempotent or attempt >= self._max_retries or self.circuit.is_open:
+                        return result
+                    delay = _backoff(attempt)
+                else:
+                    self.circuit.record_success()
+                    return result
+
+            attempt += 1
+            self.metrics.observe_retry(self.source, endpoint)
+            _LOGGER.debug("Retrying API %s %s in %.1fs (attempt %d)", method, url, delay, attempt)
+            await asyncio.sleep(delay)
+
+    async def _send(self, method: str, url: str, params: dict[str, str] | None, body: bytes | None, headers: dict[str, str]) -> _Response:
+        """Make one HTTP exchange once the circuit breaker lets it through."""
+        trial = self.circuit.before_call()
+        try:
+            async with self._get_session().request(method, url, params=params, data=body, headers=headers, timeout=self._timeout) as response:
+                return _Response(response.status, response.reason, response.headers, await response.read())
+        except BaseException as err:
+            # Connection errors and timeouts are recorded as failures by the caller. Anything else (a cancellation
+            # above all) says nothing about the API; without this the circuit would keep waiting for the outcome of a
+            # trial that never comes.
+            if trial and not isinstance(err, aiohttp.ClientError | TimeoutError):
+                self.circuit.abort_trial()
+            raise
+
+    def _observe(
+        self,
+        endpoint: str,
+        parts: tuple[str, ...],
+        params: dict[str, str] | None,
+        body: bytes | None,
+        duration: float,
+        *,
+        result: _Response | None = None,
+        error: str | None = None,
+    ) -> None:
+        """Record an attempt in the metrics and, when recording, in the capture."""
+        if result is not None:
+            self.metrics.observe_response(self.source, endpoint, result.status, duration, len(body or b""), len(result.body), time.time())
+        else:
+            self.metrics.observe_error(self.source, endpoint, error or "error", duration)
+        if self.recorder is not None:
+            self.recorder.record(
+                source=self.source,
+                endpoint=endpoint,
+                parts=parts,
+                params=params,
+                request=body,
+                status=result.status if result is not None else None,
+                response=result.body if result is not None else None,
+                duration=duration,
+                error=error,
+            )
+
+    def _raise_for_status(self, method: str, path: str, response: _Response) -> None:
+        if response.status < HTTPStatus.BAD_REQUEST:
+            return
+        body = response.body.decode(errors="replace")
+        msg = f"API {method} {self._url(path)} failed: {response.status} {response.reason} — {body}"
+        if response.status == HTTPStatus.NOT_FOUND:
+            raise EpsApiNotFoundError(msg, response.status)
+        raise EpsApiError(msg, response.status)
+
+    def _decode(self, path: str, response: _Response) -> dict:
+        try:
+            body = json.loads(response.body)
+        except ValueError as err:
+            msg = f"API GET {self._url(path)} returned invalid JSON: {err}"
+            raise EpsApiError(msg, response.status) from err
+        if not isinstance(body, dict):
+            msg = f"API GET {self._url(path)} returned {type(body).__name__} instead of an object"
+            raise EpsApiError(msg, response.status)
+        return body
+
+    async def list_pools(self, mac: str | None = None) -> list[dict]:
+        """Return the items of GET /pool, optionally filtered by MAC address."""
+        response = await self._request(aiohttp.hdrs.METH_GET, "pool", params={"mac": mac} if mac else None)
+        self._raise_for_status(aiohttp.hdrs.METH_GET, "pool", response)
+        return self._decode("pool", response).get("items", [])
+
+    async def get_pool(self, pid: str) -> dict:
+        """
+        Fetch the full pool state from GET /pool/{pid}.
+
+        The request is conditional when the API handed out an ETag or Last-Modified earlier. A 304, or a body that
+        hashes the same as the previous one, returns the previous dict object itself, so callers can detect an
+        unchanged pool with an identity check.
+        """
+        headers: dict[str, str] = {}
+        cached = self._pool_cache.get(pid)
+        if cached is not None:
+            if cached.etag:
+                headers[aiohttp.hdrs.IF_NONE_MATCH] = cached.etag
+            if cached.last_modified:
+                headers[aiohttp.hdrs.IF_MODIFIED_SINCE] = cached.last_modified
+
+        response = await self._request(aiohttp.hdrs.METH_GET, "pool", pid, headers=headers)
+        if response.status == HTTPStatus.NOT_MODIFIED and cached is not None:
+            return cached.data
+        self._raise_for_status(aiohttp.hdrs.METH_GET, f"pool/{pid}", response)
+
+        digest = hashlib.blake2b(response.body, digest_size=16).digest()
+        if cached is None or cached.digest != digest:
+            cached = _CachedPool(self._decode(f"pool/{pid}", response), digest)
+        cached.etag = response.headers.get(aiohttp.hdrs.ETAG)
+        cached.last_modified = response.headers.get(aiohttp.hdrs.LAST_MODIFIED)
+        self._pool_cache[pid] = cached
+        return cached.data
+
+    async def get_pool_state(self, pid: str) -> Pool:
+        """
+        Fetch a pool like get_pool and return it as a model.
+
+        An unchanged pool returns the previous model itself; a changed one is parsed against the previous model, so
+        its unchanged modules are shared rather than parsed again.
+        """
+        previous = self._pool_cache.get(pid)
+        previous_model = previous.model if previous is not None else None
+        data = await self.get_pool(pid)
+        cached = self._pool_cache[pid]
+        if cached.model is None:
+            cached.model = Pool.from_dict(data, previous_model)
+        return cached.model
+
+    async def get_pools(self, pids: Iterable[str], *, concurrency: int = DEFAULT_CONCURRENCY, stagger: float = 0.0) -> dict[str, dict | EpsApiError]:
+        """
+        Fetch several pools with at most `concurrency` requests in flight, starting them `stagger` seconds apart.
+
+        Every pid maps to its payload, or to the EpsApiError its fetch ended with, so one failing pool does not hide
+        the others.
+        """
+        return await self._gather(self.get_pool, pids, concurrency, stagger)
+
+    async def get_pool_states(self, pids: Iterable[str], *, concurrency: int = DEFAULT_CONCURRENCY, stagger: float = 0.0) -> dict[str, Pool | EpsApiError]:
+        """Fetch several pools like get_pools, returning models."""
+        return await self._gather(self.get_pool_state, pids, concurrency, stagger)
+
+    async def _gather[T](self, fetch: Callable[[str], Awaitable[T]], pids: Iterable[str], concurrency: int, stagger: float) -> dict[str, T | EpsApiError]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_one(index: int, pid: str) -> T:
+            await asyncio.sleep(index * stagger)
+            async with semaphore:
+                return await fetch(pid)
+
+        pids = list(pids)
+        results = await asyncio.gather(*(fetch_one(index, pid) for index, pid in enumerate(pids)), return_exceptions=True)
+        pools: dict[str, T | EpsApiError] = {}
+        for pid, result in zip(pids, results, strict=True):
+            if isinstance(result, BaseException) and not isinstance(result, EpsApiError):
+                raise result
+            pools[pid] = result
+        return pools
+
+    def forget_pool(self, pid: str) -> None:
+        """Drop the cached payload of a pool."""
+        self._pool_cache.pop(pid, None)
+
+    async def patch_module(self, pid: str, module: str, body: dict) -> None:
+        """PATCH a body to a pool module endpoint as is."""
+        response = await self._request(aiohttp.hdrs.METH_PATCH, "pool", pid, module, json_body=body)
+        self._raise_for_status(aiohttp.hdrs.METH_PATCH, f"pool/{pid}/{module}", response)
+
+    async def write_module(self, pid: str, module: str, current: Mapping[str, object], changes: Mapping[str, object]) -> dict[str, object]:
+        """
+        Write config changes to a module with the smallest body its endpoint accepts.
+
+        `current` is the module's config as last read. Changes equal to it are dropped, the rest is validated against
+        it, and the body is sent in the shape learned for the module. A partial body answered with 422 is retried once
+        in the full shape, which is remembered for the module. Returns the changes that were written, empty when there
+        was nothing to send.
+        """
+        diff = diff_changes(current, changes)
+        if not diff:
+            return diff
+        validate_changes(module, current, diff)
+
+        shape = self.shapes.get(module)
+        try:
+            await self.patch_module(pid, module, build_body(shape, current, diff))
+        except EpsApiError as err:
+            if shape is not PatchShape.PARTIAL or err.status != HTTPStatus.UNPROCESSABLE_ENTITY or not current:
+                raise
+            _LOGGER.debug("PATCH %s rejected a partial body, retrying with the full config", module)
+            await self.patch_module(pid, module, build_body(PatchShape.FULL, current, diff))
+            self.shapes.learn(module, PatchShape.FULL)
+        return diff
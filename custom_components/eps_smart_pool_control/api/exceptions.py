@@ -0,0 +1,39 @@
+"""Errors raised by the EPS Smart Pool Control API client."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+
+
+class EpsApiError(Exception):
+    """Error to indicate an API call failed."""
+
+    def __init__(self, message: str, status: int | None = None) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+        self.status = status
+
+
+class EpsApiConnectionError(EpsApiError):
+    """Error to indicate the API could not be reached or did not answer in time."""
+
+
+class EpsApiNotFoundError(EpsApiError):
+    """Error to indicate the API does not know the requested resource."""
+
+
+class EpsApiRateLimitError(EpsApiError):
+    """Error to indicate the API keeps answering 429."""
+
+    def __init__(self, message: str, retry_after: float | None) -> None:
+        """Initialize the error."""
+        super().__init__(message, HTTPStatus.TOO_MANY_REQUESTS)
+        self.retry_after = retry_after
+
+
+class EpsApiValidationError(EpsApiError):
+    """Error to indicate a write was rejected locally, before it was sent."""
+
+
+class EpsApiCircuitOpenError(EpsApiError):
+    """Error to indicate calls are suspended after repeated failures."""
@@ -0,0 +1,191 @@
+"""Request metrics for the EPS Smart Pool Control API client."""
+
+from __future__ import annotations
+
+import bisect
+from collections import Counter, deque
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+# Upper bounds in seconds of the latency histogram buckets; the last, implicit bucket is +Inf.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Upper bounds in bytes of the payload size histogram buckets.
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144)
+
+# Upper bounds in seconds of the listener fan-out histogram buckets.
+FANOUT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+# Observations kept per histogram for percentiles over recent traffic.
+_RECENT_SAMPLES = 100
+
+# An observation handed to observers: (metric name, labels, value).
+Observation = tuple[str, dict[str, str], float]
+
+
+class Histogram:
+    """Cumulative bucket histogram in the Prometheus style, plus the most recent observations for percentiles."""
+
+    __slots__ = ("bounds", "counts", "recent", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        """Initialize the histogram."""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.recent: deque[float] = deque(maxlen=_RECENT_SAMPLES)
+
+    @property
+    def count(self) -> int:
+        """Return the number of observations."""
+        return sum(self.counts)
+
+    def observe(self, value: float) -> None:
+        """Add an observation."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.recent.append(value)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return a percentile (0..1) over the recent observations, or None without any."""
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def as_dict(self) -> dict[str, object]:
+        """Return the histogram with cumulative bucket counts keyed by upper bound."""
+        cumulative = 0
+        buckets: dict[str, int] = {}
+        for bound, count in zip((*map(str, self.bounds), "+Inf"), self.counts, strict=True):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {"count": cumulative, "sum": round(self.sum, 6), "p50": self.percentile(0.5), "p95": self.percentile(0.95), "buckets": buckets}
+
+
+class ApiMetrics:
+    """
+    Counters and histograms of the calls made by one or more API clients.
+
+    Calls are keyed by endpoint template (e.g. "GET /pool/{pid}") and by the client's source label, so per-pool IDs
+    do not explode the number of series. Observers registered with add_observer receive every observation, to feed an
+    external metrics system; render_prometheus returns the current state in the Prometheus text format.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.response_size: dict[tuple[str, str], Histogram] = {}
+        self.request_size: dict[tuple[str, str], Histogram] = {}
+        self.responses: Counter[tuple[str, str, str]] = Counter()
+        self.retries: Counter[tuple[str, str]] = Counter()
+        self.errors: Counter[tuple[str, str, str]] = Counter()
+        self.last_success: float | None = None
+        self._observers: list[Callable[[Observation], None]] = []
+
+    def add_observer(self, observer: Callable[[Observation], None]) -> Callable[[], None]:
+        """Call observer with every observation from now on; returns a function that removes it again."""
+        self._observers.append(observer)
+        return lambda: self._observers.remove(observer)
+
+    def _notify(self, name: str, labels: dict[str, str], value: float) -> None:
+        for observer in self._observers:
+            observer((name, labels, value))
+
+    def observe_response(self, source: str, endpoint: str, status: int, duration: float, request_bytes: int, response_bytes: int, now: float) -> None:
+        """Record a completed HTTP exchange."""
+        key = (source, endpoint)
+        self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(duration)
+        self.response_size.setdefault(key, Histogram(SIZE_BUCKETS)).observe(response_bytes)
+        if request_bytes:
+            self.request_size.setdefault(key, Histogram(SIZE_BUCKETS)).observe(request_bytes)
+        self.responses[source, endpoint, str(status)] += 1
+        if status < HTTPStatus.BAD_REQUEST:
+            self.last_success = now
+        if self._observers:
+            labels = {"source": source, "endpoint": endpoint, "status": str(status)}
+            self._notify("request_duration_seconds", labels, duration)
+            self._notify("response_size_bytes", labels, response_bytes)
+
+    def observe_error(self, source: str, endpoint: str, kind: str, duration: float) -> None:
+        """Record a call that ended without a response, e.g. on a timeout or connection error."""
+        self.latency.setdefault((source, endpoint), Histogram(LATENCY_BUCKETS)).observe(duration)
+        self.errors[source, endpoint, kind] += 1
+        if self._observers:
+            self._notify("request_errors", {"source": source, "endpoint": endpoint, "kind": kind}, 1)
+
+    def observe_retry(self, source: str, endpoint: str) -> None:
+        """Record that a call is being retried."""
+        self.retries[source, endpoint] += 1
+        if self._observers:
+            self._notify("request_retries", {"source": source, "endpoint": endpoint}, 1)
+
+    @property
+    def error_count(self) -> int:
+        """Return the number of failed calls: connection errors plus 4xx and 5xx answers."""
+        failed = sum(count for (_, _, status), count in self.responses.items() if int(status) >= HTTPStatus.BAD_REQUEST)
+        return failed + sum(self.errors.values())
+
+    @property
+    def retry_count(self) -> int:
+        """Return the number of retries."""
+        return sum(self.retries.values())
+
+    def latency_percentile(self, fraction: float, endpoint: str | None = None) -> float | None:
+        """Return a latency percentile over recent calls, for one endpoint or across all of them."""
+        samples = [value for (_, name), histogram in self.latency.items() if endpoint in (None, name) for value in histogram.recent]
+        if not samples:
+            return None
+        samples.sort()
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    def as_dict(self) -> dict[str, object]:
+        """Return a JSON-serializable snapshot."""
+
+        def by_key(histograms: dict[tuple[str, str], Histogram]) -> dict[str, object]:
+            return {f"{source} {endpoint}": histogram.as_dict() for (source, endpoint), histogram in histograms.items()}
+
+        return {
+            "latency_seconds": by_key(self.latency),
+            "response_size_bytes": by_key(self.response_size),
+            "request_size_bytes": by_key(self.request_size),
+            "responses": {f"{source} {endpoint} {status}": count for (source, endpoint, status), count in self.responses.items()},
+            "errors": {f"{source} {endpoint} {kind}": count for (source, endpoint, kind), count in self.errors.items()},
+            "retries": {f"{source} {endpoint}": count for (source, endpoint), count in self.retries.items()},
+            "last_success": self.last_success,
+        }
+
+    def render_prometheus(self, prefix: str = "eps_api") -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+
+        def labels(pairs: Iterable[tuple[str, str]]) -> str:
+            return ",".join(f'{name}="{value}"' for name, value in pairs)
+
+        def histogram(name: str, histograms: dict[tuple[str, str], Histogram]) -> None:
+            lines.append(f"# TYPE {prefix}_{name} histogram")
+            for (source, endpoint), hist in histograms.items():
+                base = (("source", source), ("endpoint", endpoint))
+                cumulative = 0
+                for bound, count in zip((*map(str, hist.bounds), "+Inf"), hist.counts, strict=True):
+                    cumulative += count
+                    lines.append(f"{prefix}_{name}_bucket{{{labels((*base, ('le', bound)))}}} {cumulative}")
+                lines.append(f"{prefix}_{name}_sum{{{labels(base)}}} {hist.sum}")
+                lines.append(f"{prefix}_{name}_count{{{labels(base)}}} {cumulative}")
+
+        histogram("request_duration_seconds", self.latency)
+        histogram("response_size_bytes", self.response_size)
+        histogram("request_size_bytes", self.request_size)
+        lines.append(f"# TYPE {prefix}_responses_total counter")
+        lines.extend(f"{prefix}_responses_total{{{labels((('source', source), ('endpoint', endpoint), ('status', status)))}}} {count}" for (source, endpoint, status), count in self.responses.items())
+        lines.append(f"# TYPE {prefix}_errors_total counter")
+        lines.extend(f"{prefix}_errors_total{{{labels((('source', source), ('endpoint', endpoint), ('kind', kind)))}}} {count}" for (source, endpoint, kind), count in self.errors.items())
+        lines.append(f"# TYPE {prefix}_retries_total counter")
+        lines.extend(f"{prefix}_retries_total{{{labels((('source', source), ('endpoint', endpoint)))}}} {count}" for (source, endpoint), count in self.retries.items())
+        if self.last_success is not None:
+            lines.append(f"# TYPE {prefix}_last_success_timestamp_seconds gauge")
+            lines.append(f"{prefix}_last_success_timestamp_seconds {self.last_success}")
+        return "\n".join(lines) + "\n"
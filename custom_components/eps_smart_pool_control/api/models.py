@@ -0,0 +1,455 @@
+"""Response models of the EPS Smart Pool Control V2 API."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import ClassVar, Self
+
+_EMPTY: Mapping[str, object] = MappingProxyType({})
+
+
+def resolve_path(value: object, keys: tuple[str, ...]) -> object:
+    """Walk a field path through models and mappings alike, returning None when any level is missing."""
+    for key in keys:
+        if value is None:
+            return None
+        value = value.get(key) if isinstance(value, Mapping) else getattr(value, key, None)
+    return value
+
+
+def merge_copy(base: Mapping[str, object], updates: Mapping[str, object]) -> dict[str, object]:
+    """
+    Return base with updates merged in, recursing into nested mappings.
+
+    Only the mappings on the updated paths are copied; everything else is shared with base, which is left untouched.
+    """
+    merged = dict(base)
+    for key, value in updates.items():
+        current = merged.get(key)
+        merged[key] = merge_copy(current, value) if isinstance(value, Mapping) and isinstance(current, Mapping) else value
+    return merged
+
+
+class _Parser:
+    """Reads typed fields from payload mappings and records the ones whose type does not match the schema."""
+
+    def __init__(self) -> None:
+        self.drift: list[str] = []
+
+    def _mismatch(self, path: str, expected: str, value: object) -> None:
+        self.drift.append(f"{path}: expected {expected}, got {type(value).__name__}")
+
+    def section(self, data: Mapping[str, object], key: str, path: str) -> Mapping[str, object]:
+        value = data.get(key)
+        if value is None:
+            return _EMPTY
+        if not isinstance(value, Mapping):
+            self._mismatch(f"{path}.{key}", "object", value)
+            return _EMPTY
+        return value
+
+    def number(self, data: Mapping[str, object], key: str, path: str) -> float | None:
+        value = data.get(key)
+        if value is None:
+            return None
+        if isinstance(value, bool) or not isinstance(value, int | float):
+            self._mismatch(f"{path}.{key}", "number", value)
+            return None
+        return value
+
+    def integer(self, data: Mapping[str, object], key: str, path: str) -> int | None:
+        value = data.get(key)
+        if value is None:
+            return None
+        if isinstance(value, bool) or not isinstance(value, int):
+            self._mismatch(f"{path}.{key}", "integer", value)
+            return None
+        return value
+
+    def boolean(self, data: Mapping[str, object], key: str, path: str) -> bool | None:
+        value = data.get(key)
+        if value is None:
+            return None
+        if not isinstance(value, bool):
+            self._mismatch(f"{path}.{key}", "boolean", value)
+            return None
+        return value
+
+    def string(self, data: Mapping[str, object], key: str, path: str) -> str | None:
+        value = data.get(key)
+        if value is None:
+            return None
+        if not isinstance(value, str):
+            self._mismatch(f"{path}.{key}", "string", value)
+            return None
+        return value
+
+
+@dataclass(frozen=True, slots=True)
+class PoolSummary:
+    """One item of GET /pool."""
+
+    pid: str
+    mac: str | None
+    name: str | None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, object]) -> PoolSummary:
+        """Build the summary from a list item."""
+        mac = data.get("mac")
+        name = data.get("name")
+        return cls(pid=str(data["pid"]), mac=mac if isinstance(mac, str) else None, name=name if isinstance(name, str) else None)
+
+
+@dataclass(frozen=True, slots=True)
+class ModuleStatus:
+    """The status block of a module; status is -1 when the hardware is not present."""
+
+    status: int | None
+
+    @classmethod
+    def parse(cls, data: Mapping[str, object], parser: _Parser, path: str) -> Self:
+        """Read the status block."""
+        return cls(status=parser.integer(data, "status", path))
+
+
+@dataclass(frozen=True, slots=True)
+class FilterStatus(ModuleStatus):
+    """Status of the filter module, with the pump's mode and speed codes."""
+
+    pump_status: int | None
+    pump_speed: int | None
+
+    @classmethod
+    def parse(cls, data: Mapping[str, object], parser: _Parser, path: str) -> Self:
+        """Read the status block."""
+        return cls(
+            status=parser.integer(data, "status", path),
+            pump_status=parser.integer(data, "pump_status", path),
+            pump_speed=parser.integer(data, "pump_speed", path),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CoverStatus(ModuleStatus):
+    """Status of the cover module, with its calibration code."""
+
+    covco: int | None
+
+    @classmethod
+    def parse(cls, data: Mapping[str, object], parser: _Parser, path: str) -> Self:
+        """Read the status block."""
+        return cls(status=parser.integer(data, "status", path), covco=parser.integer(data, "covco", path))
+
+
+@dataclass(frozen=True, slots=True)
+class ActualMetrics:
+    """Metrics of a dosing module: the measured value."""
+
+    actual: float | None
+
+    @classmethod
+    def parse(cls, data: Mapping[str, object], parser: _Parser, path: str) -> Self:
+        """Read the metrics block."""
+        return cls(actual=parser.number(data, "actual", path))
+
+
+@dataclass(frozen=True, slots=True)
+class TemperatureMetrics:
+    """Metrics of the temperature module."""
+
+    water_temp: float | None
+    ambient_temp: float | None
+    imx_temp: float | None
+
+    @classmethod
+    def parse(cls, data: Mapping[str, object], parser: _Parser, path: str) -> Self:
+        """Read the metrics block."""
+        return cls(
+            water_temp=parser.number(data, "water_temp", path),
+            ambient_temp=parser.number(data, "ambient_temp", path),
+            imx_temp=parser.number(data, "imx_temp", path),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class FilterMetrics:
+    """Metrics of the filter module."""
+
+    pump_current: float | None
+    pump_speed: int | None
+
+    @classmethod
+    def parse(cls, data: Mapping[str, object], parser: _Parser, path: str) -> Self:
+        """Read the metrics block."""
+        return cls(pump_current=parser.number(data, "pump_current", path), pump_speed=parser.integer(data, "pump_speed", path))
+
+
+@dataclass(frozen=True, slots=True)
+class TargetConfig:
+    """Config of a module regulating towards a single target value."""
+
+    target: float | None
+
+    @classmethod
+    def parse(cls, data: Mapping[str, object], parser: _Parser, path: str) -> Self:
+        """Read the config block."""
+        return cls(target=parser.number(data, "target", path))
+
+
+@dataclass(frozen=True, slots=True)
+class ClConfig:
+    """Config of the chlorine module; the RX target is nested under rx."""
+
+    rx: TargetConfig
+
+    @classmethod
+    def parse(cls, data: Mapping[str, object], parser: _Parser, path: str) -> Self:
+        """Read the config block."""
+        return cls(rx=TargetConfig.parse(parser.section(data, "rx", path), parser, f"{path}.rx"))
+
+
+@dataclass(frozen=True, slots=True)
+class FilterSchedule:
+    """One of the filter pump's schedules."""
+
+    enabled: bool | None
+
+    @classmethod
+    def parse(cls, data: Mapping[str, object], parser: _Parser, path: str) -> Self:
+        """Read a schedule block."""
+        return cls(enabled=parser.boolean(data, "enabled", path))
+
+
+@dataclass(frozen=True, slots=True)
+class FilterConfig:
+    """Config of the filter module."""
+
+    always_active: bool | None
+    schedule_1: FilterSchedule
+    schedule_2: FilterSchedule
+    schedule_3: FilterSchedule
+
+    @classmethod
+    def parse(cls, data: Mapping[str, object], parser: _Parser, path: str) -> Self:
+        """Read the config block."""
+        schedules = [FilterSchedule.parse(parser.section(data, key, path), parser, f"{path}.{key}") for key in ("schedule_1", "schedule_2", "schedule_3")]
+        return cls(always_active=parser.boolean(data, "always_active", path), schedule_1=schedules[0], schedule_2=schedules[1], schedule_3=schedules[2])
+
+
+@dataclass(frozen=True, slots=True)
+class PoolModule:
+    """
+    One module of a pool.
+
+    Typed fields cover what the integration reads; raw keeps the module's payload as received, including fields
+    without a typed counterpart, and is what PATCH bodies are built from.
+    """
+
+    status: ModuleStatus
+    raw: Mapping[str, object] = field(compare=False, repr=False)
+
+    status_type: ClassVar[type[ModuleStatus]] = ModuleStatus
+
+    @property
+    def present(self) -> bool:
+        """Return False when the pool reports the module's hardware as not present."""
+        return self.status.status != -1
+
+    @property
+    def raw_config(self) -> Mapping[str, object]:
+        """Return the module's config block as received."""
+        config = self.raw.get("config")
+        return config if isinstance(config, Mapping) else _EMPTY
+
+    @classmethod
+    def parse(cls, data: Mapping[str, object], parser: _Parser, path: str) -> Self:
+        """Read a module block."""
+        return cls(status=cls.status_type.parse(parser.section(data, "status", path), parser, f"{path}.status"), raw=data)
+
+
+@dataclass(frozen=True, slots=True)
+class TemperatureModule(PoolModule):
+    """The temperature module."""
+
+    metrics: TemperatureMetrics
+    config: TargetConfig
+
+    @classmethod
+    def parse(cls, data: Mapping[str, object], parser: _Parser, path: str) -> Self:
+        """Read the module block."""
+        return cls(
+            status=ModuleStatus.parse(parser.section(data, "status", path), parser, f"{path}.status"),
+            raw=data,
+            metrics=TemperatureMetrics.parse(parser.section(data, "metrics", path), parser, f"{path}.metrics"),
+            config=TargetConfig.parse(parser.section(data, "config", path), parser, f"{path}.config"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PhModule(PoolModule):
+    """The pH dosing module."""
+
+    metrics: ActualMetrics
+    config: TargetConfig
+
+    @classmethod
+    def parse(cls, data: Mapping[str, object], parser: _Parser, path: str) -> Self:
+        """Read the module block."""
+        return cls(
+            status=ModuleStatus.parse(parser.section(data, "status", path), parser, f"{path}.status"),
+            raw=data,
+            metrics=ActualMetrics.parse(parser.section(data, "metrics", path), parser, f"{path}.metrics"),
+            config=TargetConfig.parse(parser.section(data, "config", path), parser, f"{path}.config"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ClModule(PoolModule):
+    """The chlorine (RX) module."""
+
+    metrics: ActualMetrics
+    config: ClConfig
+
+    @classmethod
+    def parse(cls, data: Mapping[str, object], parser: _Parser, path: str) -> Self:
+        """Read the module block."""
+        return cls(
+            status=ModuleStatus.parse(parser.section(data, "status", path), parser, f"{path}.status"),
+            raw=data,
+            metrics=ActualMetrics.parse(parser.section(data, "metrics", path), parser, f"{path}.metrics"),
+            config=ClConfig.parse(parser.section(data, "config", path), parser, f"{path}.config"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class FilterModule(PoolModule):
+    """The filter pump module."""
+
+    status: FilterStatus
+    metrics: FilterMetrics
+    config: FilterConfig
+
+    @classmethod
+    def parse(cls, data: Mapping[str, object], parser: _Parser, path: str) -> Self:
+        """Read the module block."""
+        return cls(
+            status=FilterStatus.parse(parser.section(data, "status", path), parser, f"{path}.status"),
+            raw=data,
+            metrics=FilterMetrics.parse(parser.section(data, "metrics", path), parser, f"{path}.metrics"),
+            config=FilterConfig.parse(parser.section(data, "config", path), parser, f"{path}.config"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CoverModule(PoolModule):
+    """The pool cover module."""
+
+    status: CoverStatus
+
+    status_type: ClassVar[type[ModuleStatus]] = CoverStatus
+
+
+@dataclass(frozen=True, slots=True)
+class Spec:
+    """The pool's static specification."""
+
+    pool_volume: float | None
+    raw: Mapping[str, object] = field(compare=False, repr=False)
+
+    @classmethod
+    def parse(cls, data: Mapping[str, object], parser: _Parser, path: str) -> Self:
+        """Read the spec block."""
+        return cls(pool_volume=parser.number(data, "pool_volume", path), raw=data)
+
+
+@dataclass(frozen=True, slots=True)
+class Pool:
+    """
+    The full state of a pool from GET /pool/{pid}, parsed once per payload.
+
+    Models are immutable. A pool parsed with its previous state reuses every module whose payload did not change, so
+    unchanged modules keep their identity across refreshes; with_changes builds a new state the same way.
+    """
+
+    pid: str
+    mac: str | None
+    name: str | None
+    status: str | None
+    activity_at: int | None
+    avatar: str | None
+    spec: Spec | None
+    filter: FilterModule | None
+    ph: PhModule | None
+    cl: ClModule | None
+    temperature: TemperatureModule | None
+    cover: CoverModule | None
+    lighting: PoolModule | None
+    backwash: PoolModule | None
+    zero_e: PoolModule | None
+    raw: Mapping[str, object] = field(compare=False, repr=False)
+    schema_drift: tuple[str, ...] = field(default=(), compare=False, repr=False)
+
+    MODULES: ClassVar[Mapping[str, type[PoolModule | Spec]]] = MappingProxyType(
+        {
+            "spec": Spec,
+            "filter": FilterModule,
+            "ph": PhModule,
+            "cl": ClModule,
+            "temperature": TemperatureModule,
+            "cover": CoverModule,
+            "lighting": PoolModule,
+            "backwash": PoolModule,
+            "zero_e": PoolModule,
+        }
+    )
+
+    @property
+    def online(self) -> bool:
+        """Return True while the pool reports itself online."""
+        return self.status == "online"
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, object], previous: Pool | None = None) -> Pool:
+        """
+        Parse a GET /pool/{pid} payload.
+
+        Fields whose type does not match the schema are read as None and listed in schema_drift. Modules equal to
+        those of previous are taken from it instead of being parsed again.
+        """
+        parser = _Parser()
+        modules: dict[str, PoolModule | Spec | None] = {}
+        for key, model in cls.MODULES.items():
+            value = data.get(key)
+            old = getattr(previous, key) if previous is not None else None
+            if value is None:
+                modules[key] = None
+            elif old is not None and (old.raw is value or old.raw == value):
+                modules[key] = old
+            elif isinstance(value, Mapping):
+                modules[key] = model.parse(value, parser, key)
+            else:
+                parser.drift.append(f"{key}: expected object, got {type(value).__name__}")
+                modules[key] = None
+        return cls(
+            pid=parser.string(data, "pid", "pool") or "",
+            mac=parser.string(data, "mac", "pool"),
+            name=parser.string(data, "name", "pool"),
+            status=parser.string(data, "status", "pool"),
+            activity_at=parser.integer(data, "activity_at", "pool"),
+            avatar=parser.string(data, "avatar", "pool"),
+            raw=data,
+            schema_drift=tuple(parser.drift),
+            **modules,  # type: ignore[arg-type]
+        )
+
+    def module(self, name: str) -> PoolModule | None:
+        """Return a module by its payload key, or None when the pool does not report it."""
+        module = getattr(self, name, None) if name in self.MODULES else None
+        return module if isinstance(module, PoolModule) else None
+
+    def with_changes(self, changes: Mapping[str, object]) -> Pool:
+        """Return a new state with a partial payload merged in; only the modules it touches are parsed again."""
+        return Pool.from_dict(merge_copy(self.raw, changes), self)
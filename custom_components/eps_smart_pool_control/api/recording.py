@@ -0,0 +1,107 @@
+"""Recording the API traffic of a client to rotating JSONL files, for replaying and profiling it offline."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import queue
+import secrets
+import time
+from collections.abc import Mapping
+from logging.handlers import QueueListener, RotatingFileHandler
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 3
+
+# Identifiers are replaced by pseudonyms that stay the same within a recording, so the pools of a capture can still be
+# told apart; other personal fields are blanked.
+PSEUDONYMIZED_KEYS = frozenset({"pid", "mac", "mac_address"})
+REDACTED_KEYS = frozenset({"api_key", "avatar", "name", "webhook_id"})
+REDACTED = "**REDACTED**"
+
+
+class TrafficRecorder:
+    """
+    Write one JSON line per HTTP exchange to a size-rotated file.
+
+    The API key header is never recorded, pool IDs and MAC addresses are pseudonymized with a per-recorder salt and
+    personal fields are blanked. Lines are handed to a background thread, so recording does not block the event loop;
+    call close() (it joins that thread) from an executor when done.
+    """
+
+    def __init__(self, path: str | Path, *, max_bytes: int = DEFAULT_MAX_BYTES, backup_count: int = DEFAULT_BACKUP_COUNT) -> None:
+        """Initialize the recorder; the file is only opened on the first exchange."""
+        self.path = path
+        self._salt = secrets.token_bytes(16)
+        self._handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+        self._queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        self._listener = QueueListener(self._queue, self._handler)
+        self._listener.start()
+
+    def close(self) -> None:
+        """Write what is still queued and close the file."""
+        self._listener.stop()
+        self._handler.close()
+
+    def pseudonym(self, value: str) -> str:
+        """Return the stable stand-in for an identifier."""
+        return "x" + hashlib.blake2b(value.lower().encode(), key=self._salt, digest_size=6).hexdigest()
+
+    def redact(self, value: object) -> object:
+        """Return a JSON value with identifiers pseudonymized and personal fields blanked, recursing into containers."""
+        if isinstance(value, Mapping):
+            return {key: self._redact_field(key, item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.redact(item) for item in value]
+        return value
+
+    def _redact_field(self, key: str, value: object) -> object:
+        if key in REDACTED_KEYS and value is not None:
+            return REDACTED
+        if key in PSEUDONYMIZED_KEYS and isinstance(value, str):
+            return self.pseudonym(value)
+        return self.redact(value)
+
+    def record(
+        self,
+        *,
+        source: str,
+        endpoint: str,
+        parts: tuple[str, ...],
+        params: Mapping[str, str] | None,
+        request: bytes | None,
+        status: int | None,
+        response: bytes | None,
+        duration: float,
+        error: str | None = None,
+    ) -> None:
+        """Queue one exchange; the path's pool ID and any mac query parameter are pseudonymized like the bodies."""
+        path = "/" + "/".join(self.pseudonym(part) if index == 1 else part for index, part in enumerate(parts))
+        entry = {
+            "time": round(time.time() - duration, 3),
+            "source": source,
+            "endpoint": endpoint,
+            "path": path,
+            "params": self.redact(params) if params else None,
+            "request": self.redact(_decode(request)),
+            "status": status,
+            "error": error,
+            "duration": round(duration, 6),
+            "response": self.redact(_decode(response)),
+        }
+        self._queue.put_nowait(logging.makeLogRecord({"msg": json.dumps(entry, separators=(",", ":"))}))
+
+
+def _decode(body: bytes | None) -> object:
+    """Return a body as JSON when it is JSON, as text otherwise, and None when it is empty."""
+    if not body:
+        return None
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body.decode(errors="replace")
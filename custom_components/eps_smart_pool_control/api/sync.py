@@ -0,0 +1,73 @@
+"""Blocking wrapper around the EPS Smart Pool Control API client, for scripts and workers without an event loop."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Self
+
+from .client import API_BASE, DEFAULT_CONCURRENCY, DEFAULT_MAX_RETRIES, DEFAULT_TIMEOUT, EpsApiClient
+
+if TYPE_CHECKING:
+    from collections.abc import Coroutine, Iterable, Mapping
+    from types import TracebackType
+
+    from .exceptions import EpsApiError
+    from .models import Pool
+
+
+class EpsSyncClient:
+    """
+    Synchronous facade over EpsApiClient.
+
+    The client runs its own event loop, so its connection pool and circuit breaker persist across calls. It must
+    not be used from inside a running event loop; call close(), or use it as a context manager, when done.
+    """
+
+    def __init__(self, api_key: str, *, base_url: str = API_BASE, timeout: float = DEFAULT_TIMEOUT, max_retries: int = DEFAULT_MAX_RETRIES) -> None:
+        """Initialize the client."""
+        self._runner = asyncio.Runner()
+        self.client = EpsApiClient(api_key, base_url=base_url, timeout=timeout, max_retries=max_retries)
+
+    def __enter__(self) -> Self:
+        """Return the client."""
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None) -> None:
+        """Close the client."""
+        self.close()
+
+    def _run[T](self, coro: Coroutine[object, object, T]) -> T:
+        return self._runner.run(coro)
+
+    def close(self) -> None:
+        """Close the session and the event loop."""
+        self._run(self.client.close())
+        self._runner.close()
+
+    def list_pools(self, mac: str | None = None) -> list[dict]:
+        """Return the items of GET /pool, optionally filtered by MAC address."""
+        return self._run(self.client.list_pools(mac))
+
+    def get_pool(self, pid: str) -> dict:
+        """Fetch the full pool state from GET /pool/{pid}."""
+        return self._run(self.client.get_pool(pid))
+
+    def get_pool_state(self, pid: str) -> Pool:
+        """Fetch the full pool state as a model."""
+        return self._run(self.client.get_pool_state(pid))
+
+    def get_pools(self, pids: Iterable[str], *, concurrency: int = DEFAULT_CONCURRENCY, stagger: float = 0.0) -> dict[str, dict | EpsApiError]:
+        """Fetch several pools concurrently; every pid maps to its payload or to the error its fetch ended with."""
+        return self._run(self.client.get_pools(pids, concurrency=concurrency, stagger=stagger))
+
+    def get_pool_states(self, pids: Iterable[str], *, concurrency: int = DEFAULT_CONCURRENCY, stagger: float = 0.0) -> dict[str, Pool | EpsApiError]:
+        """Fetch several pools concurrently as models; every pid maps to its model or to the error its fetch ended with."""
+        return self._run(self.client.get_pool_states(pids, concurrency=concurrency, stagger=stagger))
+
+    def patch_module(self, pid: str, module: str, body: dict) -> None:
+        """PATCH a body to a pool module endpoint as is."""
+        self._run(self.client.patch_module(pid, module, body))
+
+    def write_module(self, pid: str, module: str, current: Mapping[str, object], changes: Mapping[str, object]) -> dict[str, object]:
+        """Write config changes to a module with the smallest body its endpoint accepts; see EpsApiClient.write_module."""
+        return self._run(self.client.write_module(pid, module, current, changes))
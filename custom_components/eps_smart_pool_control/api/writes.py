@@ -0,0 +1,126 @@
+"""Building and validating PATCH bodies for pool module config writes."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Mapping
+from enum import StrEnum
+
+from .exceptions import EpsApiValidationError
+from .models import merge_copy
+
+
+class PatchShape(StrEnum):
+    """The body shape a module's PATCH endpoint accepts."""
+
+    PARTIAL = "partial"
+    FULL = "full"
+
+
+# The filter endpoint deserializes its config as an untagged enum and 422s on anything but the full shape.
+KNOWN_SHAPES: Mapping[str, PatchShape] = {"filter": PatchShape.FULL}
+
+
+class PatchShapes:
+    """
+    The PATCH body shape per module, as far as it is known.
+
+    Modules start out partial unless listed in KNOWN_SHAPES. A module that rejects a partial body with 422 but accepts
+    the full config is remembered as full, so later writes skip the failing attempt.
+    """
+
+    def __init__(self, learned: Mapping[str, str] | None = None) -> None:
+        """Initialize the shapes, optionally with ones learned earlier."""
+        self._shapes: dict[str, PatchShape] = dict(KNOWN_SHAPES)
+        self.load(learned or {})
+
+    def load(self, learned: Mapping[str, str]) -> None:
+        """Add shapes learned earlier, as returned by as_dict; unknown values are ignored."""
+        for module, shape in learned.items():
+            if shape in PatchShape:
+                self._shapes[module] = PatchShape(shape)
+
+    def get(self, module: str) -> PatchShape:
+        """Return the shape to send for a module."""
+        return self._shapes.get(module, PatchShape.PARTIAL)
+
+    def learn(self, module: str, shape: PatchShape) -> bool:
+        """Record the shape a module accepted and return True when that is new information."""
+        if self._shapes.get(module) == shape:
+            return False
+        self._shapes[module] = shape
+        return True
+
+    def as_dict(self) -> dict[str, str]:
+        """Return the shapes that differ from the defaults, for persisting."""
+        return {module: str(shape) for module, shape in self._shapes.items() if KNOWN_SHAPES.get(module, PatchShape.PARTIAL) != shape}
+
+
+def config_change(path: str, value: object) -> dict[str, object]:
+    """Return the nested change for a dot-separated config field path, e.g. rx.target -> {"rx": {"target": value}}."""
+    keys = path.split(".")
+    change: dict[str, object] = {keys[-1]: value}
+    for key in reversed(keys[:-1]):
+        change = {key: change}
+    return change
+
+
+def diff_changes(current: Mapping[str, object], changes: Mapping[str, object]) -> dict[str, object]:
+    """Return the part of changes that differs from the current config; an empty dict means nothing to write."""
+    diff: dict[str, object] = {}
+    for key, value in changes.items():
+        existing = current.get(key)
+        if isinstance(value, Mapping) and isinstance(existing, Mapping):
+            nested = diff_changes(existing, value)
+            if nested:
+                diff[key] = nested
+        elif existing != value or _type_name(existing) != _type_name(value):
+            diff[key] = value
+    return diff
+
+
+def _type_name(value: object) -> str:
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int | float):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, Mapping):
+        return "object"
+    return type(value).__name__
+
+
+def validate_changes(module: str, current: Mapping[str, object], changes: Mapping[str, object], path: str = "config") -> None:
+    """
+    Check changes against the module's current config before sending them.
+
+    Every changed field must already exist in the config (when the config is known at all) and keep its type;
+    numbers must be finite. Raises EpsApiValidationError describing the first offending field.
+    """
+    for key, value in changes.items():
+        field_path = f"{module}.{path}.{key}"
+        if value is None:
+            msg = f"Cannot write {field_path}: no value given"
+            raise EpsApiValidationError(msg)
+        if isinstance(value, float) and not math.isfinite(value):
+            msg = f"Cannot write {field_path}: {value} is not a finite number"
+            raise EpsApiValidationError(msg)
+        if not current:
+            continue
+        if key not in current:
+            msg = f"Cannot write {field_path}: the pool does not report this field"
+            raise EpsApiValidationError(msg)
+        existing = current[key]
+        if existing is not None and _type_name(existing) != _type_name(value):
+            msg = f"Cannot write {field_path}: expected {_type_name(existing)}, got {_type_name(value)}"
+            raise EpsApiValidationError(msg)
+        if isinstance(value, Mapping) and isinstance(existing, Mapping):
+            validate_changes(module, existing, value, f"{path}.{key}")
+
+
+def build_body(shape: PatchShape, current: Mapping[str, object], changes: Mapping[str, object]) -> dict[str, object]:
+    """Return the PATCH body for a shape: the changes alone, or merged into the full current config."""
+    if shape is PatchShape.FULL:
+        return merge_copy(current, changes)
+    return dict(changes)
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
-from homeassistant.components.binary_sensor import BinarySensorDeviceClass, BinarySensorEntity
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass, BinarySensorEntity, BinarySensorEntityDescription
 
-from .eps_entity import EpsEntity
+from .eps_entity import EpsEntity, async_add_module_entities
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -20,7 +21,23 @@ if TYPE_CHECKING:
 async def async_setup_entry(_hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
     """Set up EPS Smart Pool Control binary sensor based on a config entry."""
     coordinator: EpsDataUpdateCoordinator = entry.runtime_data
-    async_add_entities([EpsPoolOnlineBinarySensor(coordinator)], update_before_add=True)
+    async_add_entities([EpsPoolOnlineBinarySensor(coordinator)])
+    async_add_module_entities(entry, coordinator, ANOMALY_SENSORS, EpsAnomalyBinarySensor, async_add_entities)
+
+
+@dataclass(frozen=True, kw_only=True)
+class EpsAnomalyBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Describes a binary sensor reporting anomalies in a metric watched by the coordinator's anomaly detection."""
+
+    data_key: str
+    metric: str
+
+
+ANOMALY_SENSORS: tuple[EpsAnomalyBinarySensorEntityDescription, ...] = (
+    EpsAnomalyBinarySensorEntityDescription(key="eps_pool_ph_anomaly", name="pH Anomaly", data_key="ph", metric="ph", icon="mdi:water-alert"),
+    EpsAnomalyBinarySensorEntityDescription(key="eps_pool_rx_anomaly", name="RX Anomaly", data_key="cl", metric="rx", icon="mdi:water-alert"),
+    EpsAnomalyBinarySensorEntityDescription(key="eps_pool_filterpump_anomaly", name="Filter Pump Anomaly", data_key="filter", metric="pump_current", icon="mdi:pump-off"),
+)
 
 
 class EpsPoolOnlineBinarySensor(EpsEntity, BinarySensorEntity):  # type: ignore[misc]
@@ -36,18 +53,20 @@ class EpsPoolOnlineBinarySensor(EpsEntity, BinarySensorEntity):  # type: ignore[
         self.entity_id = "binary_sensor.eps_pool_online"
         entry_id = coordinator.config_entry.entry_id if coordinator.config_entry else ""
         self._attr_unique_id = f"{entry_id}_eps_pool_online"
+        self._update_from_data()
 
-    @property
-    def is_on(self) -> bool:  # type: ignore[override]
-        """Return true when the pool reports as online."""
-        return self.coordinator.data.get("status") == "online"
+    async def async_added_to_hass(self) -> None:
+        """Also follow the account's refreshes; an unchanged pool is not dispatched, but the age of its activity still grows."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.account.async_add_listener(self._handle_coordinator_update))
 
-    @property
-    def extra_state_attributes(self) -> dict[str, object]:  # type: ignore[override]
-        """Return last-activity timestamp and human-readable age."""
+    def _update_from_data(self) -> None:
+        """Read the online state and last-activity timestamp with its human-readable age."""
+        data = self.coordinator.data
+        self._attr_is_on = data is not None and data.online
         attributes: dict[str, object] = {}
-        activity_at_ms = self.coordinator.data.get("activity_at")
-        if isinstance(activity_at_ms, int | float):
+        activity_at_ms = data.activity_at if data else None
+        if activity_at_ms is not None:
             last_update = datetime.fromtimestamp(activity_at_ms / 1000, tz=UTC)
             current_time = datetime.now(UTC)
             time_diff = current_time - last_update
@@ -55,4 +74,30 @@ class EpsPoolOnlineBinarySensor(EpsEntity, BinarySensorEntity):  # type: ignore[
             hours = int(time_diff.total_seconds() // 3600)
             minutes = int((time_diff.total_seconds() % 3600) // 60)
             attributes["time_since_update"] = f"{hours}h {minutes}m"
-        return attributes
+        self._attr_extra_state_attributes = attributes
+
+
+class EpsAnomalyBinarySensor(EpsEntity, BinarySensorEntity):  # type: ignore[misc]
+    """
+    Binary sensor that is on while a metric is out of its limits, spiking or drifting away from its recent baseline.
+
+    The kinds of anomaly going on and the detector's running statistics are exposed as attributes.
+    """
+
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+    entity_description: EpsAnomalyBinarySensorEntityDescription
+
+    def __init__(self, coordinator: EpsDataUpdateCoordinator, description: EpsAnomalyBinarySensorEntityDescription) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, description.data_key)
+        self.entity_description = description
+        self._detector = coordinator.anomalies.metrics[description.metric]
+        entry_id = coordinator.config_entry.entry_id if coordinator.config_entry else ""
+        self._attr_unique_id = f"{entry_id}_{description.key}"
+        self.entity_id = f"binary_sensor.{description.key}"
+        self._update_from_data()
+
+    def _update_from_data(self) -> None:
+        """Read the anomalies of the newest sample."""
+        self._attr_is_on = bool(self._detector.active)
+        self._attr_extra_state_attributes = self._detector.as_dict()
@@ -6,10 +6,22 @@ import logging
 from typing import Any
 
 import voluptuous as vol
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import ConfigEntry, ConfigFlow, ConfigFlowResult, OptionsFlow
+from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import DOMAIN
+from .const import (
+    CONF_LOCAL_HOST,
+    CONF_LOCAL_POLL_INTERVAL,
+    CONF_MAX_POLL_INTERVAL,
+    CONF_MIN_POLL_INTERVAL,
+    CONF_PUSH_UPDATES,
+    CONF_RECORD_TRAFFIC,
+    DEFAULT_LOCAL_POLL_INTERVAL,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,6 +31,12 @@ class EpsConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(_config_entry: ConfigEntry) -> EpsOptionsFlow:
+        """Create the options flow."""
+        return EpsOptionsFlow()
+
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
         """Handle the initial step."""
         errors: dict[str, str] = {}
@@ -42,6 +60,30 @@ class EpsConfigFlow(ConfigFlow, domain=DOMAIN):
         )
 
 
+class EpsOptionsFlow(OptionsFlow):
+    """Handle the options for EPS Smart Pool Control."""
+
+    async def async_step_init(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
+        """Manage the poll interval bounds, the optional local controller address, push updates and traffic recording."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_MIN_POLL_INTERVAL, default=options.get(CONF_MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL)): vol.All(vol.Coerce(int), vol.Range(min=10, max=3600)),
+                    vol.Required(CONF_MAX_POLL_INTERVAL, default=options.get(CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL)): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+                    vol.Optional(CONF_LOCAL_HOST, description={"suggested_value": options.get(CONF_LOCAL_HOST)}): str,
+                    vol.Required(CONF_LOCAL_POLL_INTERVAL, default=options.get(CONF_LOCAL_POLL_INTERVAL, DEFAULT_LOCAL_POLL_INTERVAL)): vol.All(vol.Coerce(int), vol.Range(min=2, max=3600)),
+                    vol.Required(CONF_PUSH_UPDATES, default=options.get(CONF_PUSH_UPDATES, False)): bool,
+                    vol.Required(CONF_RECORD_TRAFFIC, default=options.get(CONF_RECORD_TRAFFIC, False)): bool,
+                }
+            ),
+        )
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
@@ -1,3 +1,22 @@
 """Constants for the EPS Smart Pool Control integration."""
 
 DOMAIN = "eps_smart_pool_control"
+
+CONF_MIN_POLL_INTERVAL = "min_poll_interval"
+CONF_MAX_POLL_INTERVAL = "max_poll_interval"
+
+DEFAULT_MIN_POLL_INTERVAL = 30
+DEFAULT_MAX_POLL_INTERVAL = 3600
+
+CONF_LOCAL_HOST = "local_host"
+CONF_LOCAL_POLL_INTERVAL = "local_poll_interval"
+
+DEFAULT_LOCAL_POLL_INTERVAL = 10
+
+CONF_PUSH_UPDATES = "push_updates"
+CONF_RECORD_TRAFFIC = "record_traffic"
+CONF_WEBHOOK_ID = "webhook_id"
+
+ATTR_RESTORED_FROM = "restored_from"
+
+EVENT_ANOMALY = f"{DOMAIN}_anomaly"
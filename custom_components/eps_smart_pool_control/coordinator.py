@@ -1,116 +1,741 @@
-"""The EpsDataUpdateCoordinator class which manages fetching data from the EPS Smart Pool Control API."""
+"""The coordinators which manage fetching data from the EPS Smart Pool Control API."""
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import copy
+import hashlib
+import json
 import logging
+import time
+import zlib
+from collections import defaultdict
 from datetime import timedelta
-from typing import TYPE_CHECKING, Never
+from typing import TYPE_CHECKING
 
-import aiohttp
-from homeassistant.exceptions import HomeAssistantError
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .anomaly import PoolAnomalies
+from .api import FANOUT_BUCKETS, EpsApiClient, EpsApiError, EpsApiNotFoundError, EpsApiValidationError, Histogram, Pool, Priority, RequestBudget, TrafficRecorder
+from .api.writes import diff_changes, validate_changes
+from .const import (
+    CONF_LOCAL_HOST,
+    CONF_LOCAL_POLL_INTERVAL,
+    CONF_MAX_POLL_INTERVAL,
+    CONF_MIN_POLL_INTERVAL,
+    CONF_RECORD_TRAFFIC,
+    DEFAULT_LOCAL_POLL_INTERVAL,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DOMAIN,
+    EVENT_ANOMALY,
+)
+from .history import PoolHistory
+from .polling import AdaptivePollInterval
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from datetime import datetime
+
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
 
 _LOGGER = logging.getLogger(__name__)
-_API_BASE = "https://api.smartpoolconnect.eu"
+_BASE_POLL_INTERVAL = timedelta(minutes=5)
+
+# Upper bound on simultaneous GET /pool/{pid} calls per account, and the delay between starting consecutive ones.
+_MAX_CONCURRENT_FETCHES = 4
+_FETCH_STAGGER = timedelta(milliseconds=250)
+
+# Writes to the same module within this window are merged into one PATCH. Accepted writes are applied locally right
+# away, so the confirming refresh can wait long enough to collapse a whole burst of writes.
+_WRITE_COALESCE_WINDOW = timedelta(milliseconds=500)
+_REFRESH_COOLDOWN = timedelta(seconds=30)
+
+# The controller on the LAN answers quickly or not at all; the cloud covers for it when it does not.
+_LOCAL_TIMEOUT = 3.0
+
+# While pushes arrive, polling only runs as a slow consistency check. Without a push for twice that long the pool
+# goes back to its normal poll interval bounds.
+_PUSH_CONSISTENCY_INTERVAL = timedelta(minutes=30)
+
+_STORAGE_VERSION = 1
+_STORAGE_SAVE_DELAY = 10
+
+# The last good pool state is persisted at most this often (and on shutdown), so the next startup can show it right
+# away while the first refresh runs. Older snapshots are not restored.
+_SNAPSHOT_INTERVAL = timedelta(minutes=15)
+_SNAPSHOT_MAX_AGE = timedelta(days=1)
+
+
+class EpsPoolNotFound(UpdateFailed):
+    """Error to indicate the API no longer knows a pool ID."""
+
+
+def _as_update_failed(err: EpsApiError) -> UpdateFailed:
+    """Translate a client error into the coordinator's failure type."""
+    if isinstance(err, EpsApiNotFoundError):
+        return EpsPoolNotFound(str(err))
+    return UpdateFailed(str(err))
+
+
+def _deep_merge(target: dict, updates: dict) -> dict:
+    """Merge updates into target in-place, recursing into nested dicts."""
+    for key, value in updates.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _deep_merge(target[key], value)
+        else:
+            target[key] = copy.deepcopy(value)
+    return target
+
+
+def _snapshot_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, object]]:
+    return Store(hass, _STORAGE_VERSION, f"{DOMAIN}.snapshot.{entry_id}")
+
+
+def _encode_snapshot(data: Pool, saved_at: datetime) -> dict[str, object]:
+    """Return a pool state as a compressed payload with the time it was last confirmed by the API."""
+    payload = zlib.compress(json.dumps(data.raw, separators=(",", ":")).encode())
+    return {"saved_at": saved_at.timestamp(), "pool": base64.b64encode(payload).decode()}
+
+
+def _decode_snapshot(stored: dict[str, object]) -> tuple[Pool, datetime] | None:
+    """Return the pool state and time of a stored snapshot, or None when it cannot be read."""
+    try:
+        payload = json.loads(zlib.decompress(base64.b64decode(str(stored["pool"]))))
+        saved_at = dt_util.utc_from_timestamp(float(stored["saved_at"]))  # type: ignore[arg-type]
+    except (KeyError, TypeError, ValueError, zlib.error) as err:
+        _LOGGER.debug("Ignoring unreadable pool snapshot: %s", err)
+        return None
+    return (Pool.from_dict(payload), saved_at) if isinstance(payload, dict) else None
+
+
+async def async_remove_snapshot(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the persisted pool state of a removed config entry."""
+    await _snapshot_store(hass, entry_id).async_remove()
+
+
+def _normalize_mac(mac: str) -> str:
+    """Return a MAC address in a canonical form so list results can be matched against config entries."""
+    return mac.replace("-", ":").strip().lower()
+
+
+@callback
+def async_get_account_coordinator(hass: HomeAssistant, api_key: str) -> EpsAccountCoordinator:
+    """Return the shared account coordinator for an API key, creating it on first use."""
+    accounts: dict[str, EpsAccountCoordinator] = hass.data.setdefault(DOMAIN, {})
+    if api_key not in accounts:
+        accounts[api_key] = EpsAccountCoordinator(hass, api_key)
+    return accounts[api_key]
+
+
+@callback
+def async_release_account_coordinator(hass: HomeAssistant, account: EpsAccountCoordinator) -> None:
+    """Drop the shared account coordinator once its last pool is unloaded."""
+    if account.has_pools:
+        return
+    accounts: dict[str, EpsAccountCoordinator] = hass.data.get(DOMAIN, {})
+    accounts.pop(account.api_key, None)
 
 
-class EpsDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching data from the EPS Smart Pool Control API."""
+class EpsAccountCoordinator(DataUpdateCoordinator[dict[str, Pool]]):
+    """Poll every pool registered under one API key in a single batched cycle."""
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+    def __init__(self, hass: HomeAssistant, api_key: str) -> None:
         """Initialize the coordinator."""
-        self.api_key: str = entry.data.get("api_key", "")
-        self.mac_address: str = entry.data.get("mac_address", "")
-        self.pid: str | None = None
+        self.api_key = api_key
         self.hass = hass
+        self.pool_errors: dict[str, Exception] = {}
+        # Every cloud call made with this key, polls and writes of all its pools alike, draws from one request budget.
+        self.client = EpsApiClient(api_key, session=async_get_clientsession(hass), budget=RequestBudget())
+        self.poll_deferred = False
+        self.deferred_polls = 0
+        self._pools: dict[str, str | None] = {}
+        self._local_pools: set[str] = set()
+        self._poll_bounds: dict[str, tuple[timedelta, timedelta]] = {}
+        self._poll_interval = AdaptivePollInterval(_BASE_POLL_INTERVAL, timedelta(seconds=DEFAULT_MIN_POLL_INTERVAL), timedelta(seconds=DEFAULT_MAX_POLL_INTERVAL))
+        self._listed_pools: list[dict] | None = None
+        key_hash = hashlib.sha256(api_key.encode()).hexdigest()[:12]
+        self._store: Store[list[dict]] = Store(hass, _STORAGE_VERSION, f"{DOMAIN}.pools.{key_hash}")
+        self._shapes_store: Store[dict[str, str]] = Store(hass, _STORAGE_VERSION, f"{DOMAIN}.patch_shapes.{key_hash}")
+        self._shapes_loaded = False
+        self._recording_path = hass.config.path(f"{DOMAIN}.traffic.{key_hash}.jsonl")
+        self._recording_pools: set[str] = set()
 
         super().__init__(
             hass,
             _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(minutes=5),
+            config_entry=None,
+            name=f"{DOMAIN}_account",
+            update_interval=self._poll_interval.base,
         )
 
-    async def _raise_update_failed(self, response: aiohttp.ClientResponse) -> Never:
-        try:
-            body = await response.text()
-        except aiohttp.ClientError:
-            body = "<unreadable>"
-        msg = f"API {response.method} {response.url} failed: {response.status} {response.reason} — {body}"
-        _LOGGER.error(msg)
-        raise UpdateFailed(msg)
-
-    async def _async_update_data(self) -> dict:
-        """Fetch data from the API."""
-        if not self.pid:
-            self.pid = await self._resolve_pid()
-        return await self._fetch_pool_data()
+    @property
+    def has_pools(self) -> bool:
+        """Return True while at least one pool is registered with this account."""
+        return bool(self._pools)
+
+    @callback
+    def async_register_pool(self, mac_address: str, pid: str | None) -> None:
+        """Include a pool in the batched refresh cycle."""
+        self._pools[_normalize_mac(mac_address)] = pid
+
+    @callback
+    def async_unregister_pool(self, mac_address: str) -> None:
+        """Exclude a pool from the batched refresh cycle."""
+        pid = self._pools.pop(_normalize_mac(mac_address), None)
+        self._local_pools.discard(_normalize_mac(mac_address))
+        self.client.forget_pool(pid or "")
+        self._poll_bounds.pop(_normalize_mac(mac_address), None)
+        self._async_update_poll_bounds()
+        self.async_set_recording(mac_address, enabled=False)
+
+    @callback
+    def async_set_recording(self, mac_address: str, *, enabled: bool) -> None:
+        """Record the account's API traffic while at least one of its pools asks for it."""
+        if enabled:
+            self._recording_pools.add(_normalize_mac(mac_address))
+        else:
+            self._recording_pools.discard(_normalize_mac(mac_address))
+        if self._recording_pools and self.client.recorder is None:
+            _LOGGER.info("Recording EPS API traffic to %s", self._recording_path)
+            self.client.recorder = TrafficRecorder(self._recording_path)
+        elif not self._recording_pools and self.client.recorder is not None:
+            recorder, self.client.recorder = self.client.recorder, None
+            self.hass.async_add_executor_job(recorder.close)
+
+    @callback
+    def async_set_pool_local(self, mac_address: str, *, local: bool) -> None:
+        """Leave a pool out of the batched cloud fetch while it is being read over the LAN, or take it back."""
+        if local:
+            self._local_pools.add(_normalize_mac(mac_address))
+        else:
+            self._local_pools.discard(_normalize_mac(mac_address))
+
+    def pool_id(self, mac_address: str) -> str | None:
+        """Return the ID a registered pool is fetched by, as of the last pool list."""
+        return self._pools.get(_normalize_mac(mac_address))
+
+    def is_pool_local(self, mac_address: str) -> bool:
+        """Return True while a pool is read over the LAN instead of the batched cloud fetch."""
+        return _normalize_mac(mac_address) in self._local_pools
+
+    @callback
+    def async_set_poll_bounds(self, mac_address: str, minimum: timedelta, maximum: timedelta) -> None:
+        """Set a pool's poll interval bounds; the account polls within the tightest bounds of its pools."""
+        self._poll_bounds[_normalize_mac(mac_address)] = (minimum, max(minimum, maximum))
+        self._async_update_poll_bounds()
+
+    @callback
+    def _async_update_poll_bounds(self) -> None:
+        if not self._poll_bounds:
+            return
+        self._poll_interval.minimum = min(bounds[0] for bounds in self._poll_bounds.values())
+        self._poll_interval.maximum = max(min(bounds[1] for bounds in self._poll_bounds.values()), self._poll_interval.minimum)
+        self._poll_interval.base = min(max(_BASE_POLL_INTERVAL, self._poll_interval.minimum), self._poll_interval.maximum)
 
-    async def _resolve_pid(self) -> str:
-        """Resolve the pool UUID from the MAC address via the pool list endpoint."""
-        session = async_get_clientsession(self.hass)
+    async def _async_update_data(self) -> dict[str, Pool]:
+        """Refresh all registered pools and adapt the poll interval to what they report."""
+        self.poll_deferred = False
+        if self.data is not None and self.client.budget is not None:
+            # One call for the pool list plus one per pool; keep the previous data until the budget covers the cycle.
+            # A cycle larger than a full bucket starts once the bucket is full, and the client spaces out the calls
+            # beyond it as tokens come back.
+            pools = sum(1 for mac, pid in self._pools.items() if pid and mac not in self._local_pools)
+            if (delay := self.client.budget.delay(Priority.POLL, min(1 + pools, self.client.budget.burst(Priority.POLL)))) > 0:
+                _LOGGER.debug("Request budget low, deferring the poll of %d pools by %.0fs", pools, delay)
+                self.poll_deferred = True
+                self.deferred_polls += 1
+                self.update_interval = max(self.update_interval or _BASE_POLL_INTERVAL, timedelta(seconds=delay))
+                return self.data
         try:
-            async with session.get(
-                f"{_API_BASE}/pool",
-                headers={"X-API-Key": self.api_key},
-                params={"mac": self.mac_address},
-            ) as response:
-                if not response.ok:
-                    await self._raise_update_failed(response)
-                data = await response.json()
+            data = await self._async_fetch_pools()
         except UpdateFailed:
+            self.update_interval = self._poll_interval.note_failure()
             raise
-        except Exception as err:
-            msg = f"Error resolving pool ID: {err}"
-            raise UpdateFailed(msg) from err
+        self.update_interval = self._poll_interval.update(data.items())
+        return data
 
-        items = data.get("items", [])
+    async def _async_fetch_pools(self) -> dict[str, Pool]:
+        """List the account's pools once, then fetch the registered ones with bounded, staggered concurrency."""
+        try:
+            items = await self.client.list_pools()
+        except EpsApiError as err:
+            raise _as_update_failed(err) from err
+        self._async_cache_pool_list(items)
+        listed = {_normalize_mac(item["mac"]): item["pid"] for item in items if item.get("mac") and item.get("pid")}
+        for mac, pid in self._pools.items():
+            if mac in listed and listed[mac] != pid:
+                # The pool's coordinator picks the new ID up from pool_id when this cycle's data reaches it.
+                _LOGGER.info("Pool %s is now listed with ID %s instead of %s", mac, listed[mac], pid)
+                self.client.forget_pool(pid or "")
+                self._pools[mac] = listed[mac]
+
+        pids = [pid for mac, pid in self._pools.items() if pid and mac not in self._local_pools]
+        results = await self.client.get_pool_states(pids, concurrency=_MAX_CONCURRENT_FETCHES, stagger=_FETCH_STAGGER.total_seconds())
+
+        data: dict[str, Pool] = {}
+        self.pool_errors = {}
+        for pid, result in results.items():
+            if isinstance(result, EpsApiError):
+                self.pool_errors[pid] = _as_update_failed(result)
+            else:
+                data[pid] = result
+        if pids and not data:
+            msg = f"Error fetching all {len(pids)} pools"
+            raise UpdateFailed(msg)
+        return data
+
+    @callback
+    def _async_cache_pool_list(self, items: list[dict]) -> None:
+        """Persist the pool list so later startups can resolve pool IDs without a lookup."""
+        if items == self._listed_pools:
+            return
+        self._listed_pools = items
+        self._store.async_delay_save(lambda: self._listed_pools or [], _STORAGE_SAVE_DELAY)
+
+    async def async_resolve_pid(self, mac_address: str, *, refresh: bool = False) -> str:
+        """
+        Resolve the pool UUID from the MAC address.
+
+        The persisted pool list is consulted first; the ?mac= lookup only runs when the cache has no match or when
+        the caller knows the cached ID is stale.
+        """
+        mac = _normalize_mac(mac_address)
+        if not refresh:
+            if self._listed_pools is None:
+                self._listed_pools = await self._store.async_load() or []
+            for item in self._listed_pools:
+                if item.get("pid") and _normalize_mac(item.get("mac", "")) == mac:
+                    return item["pid"]
+
+        try:
+            items = await self.client.list_pools(mac_address)
+        except EpsApiError as err:
+            raise _as_update_failed(err) from err
         if not items:
-            msg = f"No pool found for MAC address {self.mac_address}"
+            msg = f"No pool found for MAC address {mac_address}"
             raise UpdateFailed(msg)
+        cached = [item for item in self._listed_pools or [] if _normalize_mac(item.get("mac", "")) != mac]
+        self._async_cache_pool_list([*cached, {**items[0], "mac": items[0].get("mac", mac_address)}])
         return items[0]["pid"]
 
-    async def _fetch_pool_data(self) -> dict:
-        """Fetch the full pool state from GET /pool/{pid}."""
-        session = async_get_clientsession(self.hass)
+    async def async_fetch_pool(self, pid: str) -> Pool:
+        """Fetch the full pool state; an unchanged pool returns the previous model itself."""
         try:
-            async with session.get(
-                f"{_API_BASE}/pool/{self.pid}",
-                headers={"X-API-Key": self.api_key},
-            ) as response:
-                if not response.ok:
-                    await self._raise_update_failed(response)
-                return await response.json()
-        except UpdateFailed:
-            raise
-        except Exception as err:
-            msg = f"Error fetching pool data: {err}"
-            raise UpdateFailed(msg) from err
-
-    async def set_value(self, module: str, data: dict) -> None:
-        """PATCH a partial update to a pool module endpoint."""
-        session = async_get_clientsession(self.hass)
-        error_msg: str | None = None
+            return await self.client.get_pool_state(pid)
+        except EpsApiError as err:
+            raise _as_update_failed(err) from err
+
+    async def async_write_module(self, client: EpsApiClient, pid: str, module: str, current: Mapping[str, object], changes: dict) -> dict:
+        """
+        Write config changes to a module through a client sharing this account's PATCH shapes.
+
+        Shapes learned in earlier runs are loaded before the first write, and newly learned ones are persisted.
+        """
+        if not self._shapes_loaded:
+            self._shapes_loaded = True
+            self.client.shapes.load(await self._shapes_store.async_load() or {})
+        learned = self.client.shapes.as_dict()
         try:
-            async with session.patch(
-                f"{_API_BASE}/pool/{self.pid}/{module}",
-                headers={"X-API-Key": self.api_key},
-                json=data,
-            ) as response:
-                if not response.ok:
-                    body = await response.text()
-                    error_msg = f"PATCH {module} failed: {response.status} {response.reason} — {body}"
-        except Exception as err:
+            return await client.write_module(pid, module, current, changes)
+        except EpsApiValidationError as err:
+            raise ServiceValidationError(str(err)) from err
+        except EpsApiError as err:
             msg = f"Error writing to {module}: {err}"
             raise HomeAssistantError(msg) from err
-        if error_msg:
-            _LOGGER.error(error_msg)
-            raise HomeAssistantError(error_msg)
-        await self.async_request_refresh()
+        finally:
+            if self.client.shapes.as_dict() != learned:
+                self._shapes_store.async_delay_save(self.client.shapes.as_dict, _STORAGE_SAVE_DELAY)
+
+
+class _PendingWrite:
+    """Config changes queued for one module, flushed together as a single PATCH."""
+
+    def __init__(self, future: asyncio.Future[None]) -> None:
+        self.changes: dict = {}
+        self.future = future
+
+
+class EpsDataUpdateCoordinator(DataUpdateCoordinator[Pool]):
+    """
+    Class to manage the state of one pool.
+
+    By default the pool is fed by its shared account coordinator. With a local host configured the pool polls the
+    controller on the LAN itself, and falls back to the account's cloud data whenever the controller does not answer.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, account: EpsAccountCoordinator) -> None:
+        """Initialize the coordinator."""
+        self.api_key: str = entry.data.get("api_key", "")
+        self.mac_address: str = entry.data.get("mac_address", "")
+        self.pid: str | None = entry.data.get("pid")
+        self.options = dict(entry.options)
+        self.account = account
+        self._entry = entry
+        self.hass = hass
+        self._pending_writes: dict[str, _PendingWrite] = {}
+        self._write_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._dispatched_data: Pool | None = None
+        self._reported_drift: set[str] = set()
+        self._dispatched_success = False
+        account.async_register_pool(self.mac_address, self.pid)
+        self._poll_bounds = (
+            timedelta(seconds=entry.options.get(CONF_MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL)),
+            timedelta(seconds=entry.options.get(CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL)),
+        )
+        self._push_received_at: float | None = None
+        self.history = PoolHistory()
+        self.anomalies = PoolAnomalies()
+        self.fanout = Histogram(FANOUT_BUCKETS)
+        self.last_success_at: datetime | None = None
+        self.restored_at: datetime | None = None
+        self._snapshot_store = _snapshot_store(hass, entry.entry_id)
+        self._snapshot_due = 0.0
+        self._snapshot_pending = False
+        account.async_set_poll_bounds(self.mac_address, *self._poll_bounds)
+        account.async_set_recording(self.mac_address, enabled=bool(entry.options.get(CONF_RECORD_TRAFFIC)))
+
+        self.local_client: EpsApiClient | None = None
+        update_interval = None
+        if local_host := entry.options.get(CONF_LOCAL_HOST):
+            self.local_client = EpsApiClient(
+                self.api_key,
+                session=async_get_clientsession(hass),
+                base_url=f"http://{local_host}",
+                timeout=_LOCAL_TIMEOUT,
+                max_retries=0,
+                shapes=account.client.shapes,
+                metrics=account.client.metrics,
+                source="local",
+                recorder=account.client.recorder if entry.options.get(CONF_RECORD_TRAFFIC) else None,
+            )
+            update_interval = timedelta(seconds=entry.options.get(CONF_LOCAL_POLL_INTERVAL, DEFAULT_LOCAL_POLL_INTERVAL))
+
+        # Without a local host there is no interval of its own: periodic data arrives through the account's batched cycle.
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_interval=update_interval,
+            always_update=False,
+            request_refresh_debouncer=Debouncer(hass, _LOGGER, cooldown=_REFRESH_COOLDOWN.total_seconds(), immediate=False),
+        )
+
+    async def async_restore_snapshot(self) -> bool:
+        """
+        Take the pool state persisted by an earlier run as current data, marked as restored.
+
+        Returns False when there is no recent snapshot of this pool; the caller then has to wait for a first refresh.
+        Otherwise follow up with async_refresh_restored.
+        """
+        stored = await self._snapshot_store.async_load()
+        snapshot = _decode_snapshot(stored) if stored else None
+        if snapshot is None:
+            return False
+        data, saved_at = snapshot
+        if not self.pid or data.pid != self.pid or dt_util.utcnow() - saved_at > _SNAPSHOT_MAX_AGE:
+            return False
+        _LOGGER.debug("Starting pool %s from its state of %s while the first refresh runs", self.pid, saved_at)
+        self.data = data
+        self._dispatched_data = data
+        self._dispatched_success = True
+        self.last_success_at = saved_at
+        self.restored_at = saved_at
+        return True
+
+    async def async_refresh_restored(self) -> None:
+        """Replace restored data by a first refresh, which only notifies the entities whose module differs from it."""
+        await self.async_refresh()
+        if self.last_update_success and self.restored_at is not None:
+            # An update equal to the snapshot does not reach async_update_listeners, but still ends the restored state.
+            self.async_update_listeners()
+
+    @callback
+    def _async_schedule_snapshot(self) -> None:
+        """Persist the current state once the snapshot interval has passed since the last save, or on shutdown."""
+        now = time.monotonic()
+        if not self._snapshot_pending:
+            # The save time is fixed when the save is scheduled; later states only replace the data it writes, so a
+            # steady stream of them cannot keep pushing the save back.
+            self._snapshot_pending = True
+            self._snapshot_due = max(self._snapshot_due + _SNAPSHOT_INTERVAL.total_seconds(), now + _STORAGE_SAVE_DELAY)
+        self._snapshot_store.async_delay_save(self._snapshot_data, max(self._snapshot_due - now, 0))
+
+    def _snapshot_data(self) -> dict[str, object]:
+        self._snapshot_pending = False
+        return _encode_snapshot(self.data, self.last_success_at or dt_util.utcnow())
+
+    async def _async_update_data(self) -> Pool:
+        """Fetch this pool only, over the LAN when configured; otherwise used for the first refresh and after writes."""
+        if not self.pid:
+            await self._async_resolve_pid()
+        if self.local_client is None:
+            return await self._async_fetch_cloud()
+
+        try:
+            data = await self.local_client.get_pool_state(self.pid or "")
+        except EpsApiError as err:
+            if self.account.is_pool_local(self.mac_address):
+                _LOGGER.warning("Pool controller at %s is not answering, falling back to the cloud: %s", self.options.get(CONF_LOCAL_HOST), err)
+                self.account.async_set_pool_local(self.mac_address, local=False)
+                # The account left the pool out of its cycles while it was local; its next cycle is due right away.
+                self.hass.async_create_task(self.account.async_request_refresh())
+            # The cloud is only polled in the account's cycle, never at the local interval; until that cycle brings the
+            # pool in, its last state stays.
+            cloud_data = self.account.data.get(self.pid or "") if self.account.data else None
+            if cloud_data is not None:
+                return cloud_data
+            return self.data if self.data is not None else await self._async_fetch_cloud()
+        if not self.account.is_pool_local(self.mac_address):
+            _LOGGER.info("Reading pool %s from the controller at %s", self.pid, self.options.get(CONF_LOCAL_HOST))
+            self.account.async_set_pool_local(self.mac_address, local=True)
+        if data is self.data:
+            # Unchanged payload: no listeners are notified, but the pool was read successfully all the same.
+            self.last_success_at = dt_util.utcnow()
+        return data
+
+    async def _async_fetch_cloud(self) -> Pool:
+        """Fetch this pool from the cloud API, re-resolving the pool ID when it turns out to be stale."""
+        try:
+            data = await self.account.async_fetch_pool(self.pid)
+        except EpsPoolNotFound:
+            _LOGGER.info("Pool %s not found, resolving the pool ID again for %s", self.pid, self.mac_address)
+            await self._async_resolve_pid(refresh=True)
+            return await self.account.async_fetch_pool(self.pid)
+
+        if data.mac is not None and _normalize_mac(data.mac) != _normalize_mac(self.mac_address):
+            _LOGGER.info("Pool %s reports MAC %s instead of %s, resolving the pool ID again", self.pid, data.mac, self.mac_address)
+            await self._async_resolve_pid(refresh=True)
+            return await self.account.async_fetch_pool(self.pid)
+        return data
+
+    async def _async_resolve_pid(self, *, refresh: bool = False) -> None:
+        """Resolve the pool ID and persist it in the config entry so the next startup can skip the lookup."""
+        self._async_set_pid(await self.account.async_resolve_pid(self.mac_address, refresh=refresh))
+
+    @callback
+    def _async_set_pid(self, pid: str) -> None:
+        """Fetch the pool by a new ID from now on and persist it in the config entry."""
+        self.pid = pid
+        self.account.async_register_pool(self.mac_address, pid)
+        if self._entry.data.get("pid") != pid:
+            self.hass.config_entries.async_update_entry(self._entry, data={**self._entry.data, "pid": pid})
+
+    @callback
+    def async_handle_account_update(self) -> None:
+        """Fan the account's batched refresh result out to this pool's entities."""
+        if self._push_received_at is not None and time.monotonic() - self._push_received_at > 2 * _PUSH_CONSISTENCY_INTERVAL.total_seconds():
+            _LOGGER.info("No push updates for pool %s recently, returning to regular polling", self.pid)
+            self._push_received_at = None
+            self.account.async_set_poll_bounds(self.mac_address, *self._poll_bounds)
+        if self.account.is_pool_local(self.mac_address):
+            return
+        if not self.account.last_update_success:
+            self.async_set_update_error(self.account.last_exception or UpdateFailed("Account refresh failed"))
+            return
+        if (pid := self.account.pool_id(self.mac_address)) and pid != self.pid:
+            # The account's pool list moved this MAC to another ID; the data of this cycle is already under it.
+            self._async_set_pid(pid)
+        data = self.account.data.get(self.pid) if self.account.data and self.pid else None
+        if data is None:
+            error = self.account.pool_errors.get(self.pid or "")
+            self.async_set_update_error(error or UpdateFailed(f"Pool {self.pid} missing from account refresh"))
+            if isinstance(error, EpsPoolNotFound):
+                # Our own refresh re-resolves the pool ID on a 404.
+                self.hass.async_create_task(self.async_request_refresh())
+            return
+        if data is self.data and self.last_update_success:
+            # Unchanged payload: skip the fan-out to entities and the state writes that would follow.
+            if not self.account.poll_deferred:
+                self.last_success_at = dt_util.utcnow()
+            return
+        self.async_set_updated_data(data)
+
+    @callback
+    def async_apply_push(self, delta: dict) -> None:
+        """
+        Merge a pushed update into the pool state and notify the entities of the changed modules.
+
+        The delta has the shape of GET /pool/{pid}, limited to what changed; only the modules it touches are parsed
+        again.
+        """
+        if self._push_received_at is None:
+            _LOGGER.info("Receiving push updates for pool %s, polling only as a consistency check", self.pid)
+            self.account.async_set_poll_bounds(self.mac_address, _PUSH_CONSISTENCY_INTERVAL, _PUSH_CONSISTENCY_INTERVAL)
+        self._push_received_at = time.monotonic()
+        if self.data is None:
+            return
+        self.async_set_updated_data(self.data.with_changes(delta))
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """
+        Notify only the listeners whose module changed since the last dispatch.
+
+        Entities subscribe with their module key (filter, ph, cl, ...) as listener context; listeners without a
+        context see every update. Everyone is notified when availability changes and when live data replaces a
+        restored state.
+        """
+        started = time.perf_counter()
+        previous = self._dispatched_data
+        self._dispatched_data = self.data
+        restored = self.restored_at is not None
+        if self.last_update_success:
+            self.last_success_at = dt_util.utcnow()
+            self.restored_at = None
+        if self.data is not None and self.data is not previous:
+            self.history.record(self.data)
+            self._async_detect_anomalies(self.data)
+            self._async_report_schema_drift(self.data)
+            if self.last_update_success:
+                self._async_schedule_snapshot()
+        if restored or previous is None or self.data is None or not (self.last_update_success and self._dispatched_success):
+            self._dispatched_success = self.last_update_success
+            super().async_update_listeners()
+        else:
+            changed = {key for key in Pool.MODULES if getattr(self.data, key) is not getattr(previous, key) and getattr(self.data, key) != getattr(previous, key)}
+            for update_callback, context in list(self._listeners.values()):
+                if context is None or context in changed:
+                    update_callback()
+        self.fanout.observe(time.perf_counter() - started)
+
+    @callback
+    def _async_detect_anomalies(self, data: Pool) -> None:
+        """Fire an event for every anomaly a new pool state starts; the anomaly binary sensors show the ones still going on."""
+        for metric, kind in self.anomalies.record(data):
+            detector = self.anomalies.metrics[metric]
+            _LOGGER.info("Pool %s: %s anomaly in %s at %s", self.pid, kind, metric, detector.value)
+            self.hass.bus.async_fire(
+                EVENT_ANOMALY,
+                {"config_entry_id": self._entry.entry_id, "pid": self.pid, "metric": metric, "kind": str(kind), **detector.as_dict()},
+            )
+
+    @callback
+    def _async_report_schema_drift(self, data: Pool) -> None:
+        """Warn once about every field the API reports with an unexpected type; those fields read as unknown."""
+        for issue in data.schema_drift:
+            if issue not in self._reported_drift:
+                self._reported_drift.add(issue)
+                _LOGGER.warning("Pool %s reports a field with an unexpected type, ignoring it: %s", self.pid, issue)
+
+    async def set_value(self, module: str, changes: dict) -> None:
+        """
+        Queue a change to a module's config and wait until the PATCH carrying it has been sent.
+
+        The change is nested like the config itself, e.g. {"rx": {"target": 700}} for cl. Changes to the same module
+        arriving within a short window are merged into one PATCH; the client turns them into the smallest body the
+        module's endpoint accepts.
+        """
+        if not self.pid:
+            msg = f"Cannot write to {module}: pool ID not resolved yet"
+            raise HomeAssistantError(msg)
+        pending = self._pending_writes.get(module)
+        if pending is None:
+            pending = _PendingWrite(self.hass.loop.create_future())
+            self._pending_writes[module] = pending
+            self.hass.async_create_task(self._async_flush_writes(module))
+        _deep_merge(pending.changes, changes)
+        # Every caller whose change went into the PATCH waits on the same future; one of them being cancelled must not
+        # cancel it for the others.
+        await asyncio.shield(pending.future)
+
+    async def _async_flush_writes(self, module: str) -> None:
+        """
+        Send the merged changes for a module after the coalescing window, apply them locally and request a debounced refresh.
+
+        Writes to one module go out one at a time, so a body built from the module's config never misses a write that
+        is still in flight.
+        """
+        await asyncio.sleep(_WRITE_COALESCE_WINDOW.total_seconds())
+        pending = self._pending_writes.pop(module)
+        async with self._write_locks[module]:
+            try:
+                written = await self._async_write_module(module, pending.changes)
+            except BaseException as err:
+                # Whatever ended the PATCH, its waiters get the outcome instead of waiting forever.
+                if not pending.future.done():
+                    if isinstance(err, asyncio.CancelledError):
+                        pending.future.cancel()
+                    else:
+                        pending.future.set_exception(err)
+                if not isinstance(err, Exception):
+                    raise
+                return
+            if written:
+                self._async_apply_local_write({module: written})
+        if not pending.future.done():
+            pending.future.set_result(None)
+        if written:
+            # One read of this pool confirms the write; the account's cycle keeps its pace.
+            await self.async_request_refresh()
+
+    async def async_write_modules(self, changes: Mapping[str, dict], semaphore: asyncio.Semaphore) -> None:
+        """
+        Write changes to several modules in one go and request a single refresh afterwards.
+
+        All changes are validated before anything is sent. The PATCHes then run concurrently, bounded by the given
+        semaphore, each holding its module's write lock like a queued set_value flush does. Modules that were written
+        are applied even when others fail, and the failures are raised together.
+        """
+        if not self.pid:
+            msg = "Cannot write pool settings: pool ID not resolved yet"
+            raise HomeAssistantError(msg)
+        for module, module_changes in changes.items():
+            current = self._current_config(module)
+            try:
+                validate_changes(module, current, diff_changes(current, module_changes))
+            except EpsApiValidationError as err:
+                raise ServiceValidationError(str(err)) from err
+
+        async def write(module: str, module_changes: dict) -> dict:
+            async with self._write_locks[module], semaphore:
+                written = await self._async_write_module(module, module_changes)
+                if written:
+                    self._async_apply_local_write({module: written})
+                return written
+
+        results = await asyncio.gather(*(write(module, module_changes) for module, module_changes in changes.items()), return_exceptions=True)
+        written = False
+        errors: list[str] = []
+        for result in results:
+            if isinstance(result, HomeAssistantError):
+                errors.append(str(result))
+            elif isinstance(result, BaseException):
+                raise result
+            elif result:
+                written = True
+        if written:
+            await self.async_request_refresh()
+        if errors:
+            msg = f"Error writing settings to pool {self.pid}: {'; '.join(errors)}"
+            raise HomeAssistantError(msg)
+
+    def _current_config(self, module: str) -> Mapping[str, object]:
+        current_module = self.data.module(module) if self.data else None
+        return current_module.raw_config if current_module is not None else {}
+
+    async def _async_write_module(self, module: str, changes: dict) -> dict:
+        """Write over the LAN while the controller answers there, otherwise through the cloud; return what was written."""
+        current = self._current_config(module)
+        if self.local_client is not None and self.account.is_pool_local(self.mac_address):
+            try:
+                return await self.account.async_write_module(self.local_client, self.pid or "", module, current, changes)
+            except ServiceValidationError:
+                raise
+            except HomeAssistantError as err:
+                _LOGGER.debug("Local write to %s failed, sending it through the cloud: %s", module, err)
+        return await self.account.async_write_module(self.account.client, self.pid or "", module, current, changes)
+
+    @callback
+    def _async_apply_local_write(self, changes: Mapping[str, dict]) -> None:
+        """Merge written config changes per module into the pool state and push them to entities without waiting for a GET."""
+        if self.data is not None:
+            self.async_set_updated_data(self.data.with_changes({module: {"config": module_changes} for module, module_changes in changes.items()}))
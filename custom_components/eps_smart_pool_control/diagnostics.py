@@ -0,0 +1,44 @@
+"""Diagnostics support for the EPS Smart Pool Control integration."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.components.diagnostics import async_redact_data
+
+from .const import CONF_WEBHOOK_ID
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import EpsDataUpdateCoordinator
+
+TO_REDACT = {"api_key", "mac_address", "mac", "pid", CONF_WEBHOOK_ID}
+
+# Window of the metric history included in diagnostics, in seconds.
+_HISTORY_WINDOW = 900
+
+
+async def async_get_config_entry_diagnostics(_hass: HomeAssistant, entry: ConfigEntry) -> dict[str, object]:
+    """Return diagnostics for a config entry."""
+    coordinator: EpsDataUpdateCoordinator = entry.runtime_data
+    return {
+        "entry": async_redact_data({"data": dict(entry.data), "options": dict(entry.options)}, TO_REDACT),
+        "data": async_redact_data(dict(coordinator.data.raw) if coordinator.data else {}, TO_REDACT),
+        "schema_drift": list(coordinator.data.schema_drift) if coordinator.data else [],
+        "instrumentation": {
+            "api": coordinator.account.client.metrics.as_dict(),
+            "budget": coordinator.account.client.budget.as_dict() if coordinator.account.client.budget else None,
+            "deferred_polls": coordinator.account.deferred_polls,
+            "fanout_seconds": coordinator.fanout.as_dict(),
+            "last_success_at": coordinator.last_success_at.isoformat() if coordinator.last_success_at else None,
+            "restored_from": coordinator.restored_at.isoformat() if coordinator.restored_at else None,
+        },
+        "history": {
+            "window": _HISTORY_WINDOW,
+            "samples": {name: len(buffer) for name, buffer in coordinator.history.metrics.items()},
+            "metrics": coordinator.history.downsample(_HISTORY_WINDOW),
+        },
+        "anomalies": {name: detector.as_dict() for name, detector in coordinator.anomalies.metrics.items()},
+    }
@@ -2,21 +2,97 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from functools import cache
+from typing import TYPE_CHECKING, Protocol
+
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity import Entity, EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .api import Pool, resolve_path
+from .const import ATTR_RESTORED_FROM, DOMAIN
 from .coordinator import EpsDataUpdateCoordinator
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping
+
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+
+@cache
+def compile_field_path(key_path: str) -> tuple[str, ...]:
+    """Split a dot-separated field path once; identical paths share the same tuple."""
+    return tuple(key_path.split("."))
+
+
+def get_field_value(data: Pool | None, keys: tuple[str, ...]) -> object:
+    """Walk a compiled field path through the pool model, returning None when any level is missing."""
+    return resolve_path(data, keys)
+
+
+def is_module_present(data: Pool | None, data_key: str) -> bool:
+    """Return False when the pool lacks the module or reports its status.status as -1 (hardware not present)."""
+    if data is None:
+        return False
+    if data_key == "spec":
+        return data.spec is not None
+    module = data.module(data_key)
+    return module is not None and module.present
+
+
+class ModuleEntityDescription(Protocol):
+    """An entity description naming the pool module its entity belongs to."""
+
+    @property
+    def data_key(self) -> str:
+        """Return the module key (filter, ph, cl, ...)."""
+        ...
+
+
+@dataclass(frozen=True, kw_only=True)
+class EpsEntityDescription(EntityDescription):
+    """Describes an entity bound to one field of a pool module."""
+
+    data_key: str
+    api_field: str
+
+
+@callback
+def async_add_module_entities[DescriptionT: ModuleEntityDescription](
+    entry: ConfigEntry,
+    coordinator: EpsDataUpdateCoordinator,
+    descriptions: Iterable[DescriptionT],
+    entity_factory: Callable[[EpsDataUpdateCoordinator, DescriptionT], Entity],
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Add entities for the modules the pool reports now, and add the others once their module appears."""
+    pending = list(descriptions)
+
+    @callback
+    def _async_add_present() -> None:
+        present = [description for description in pending if is_module_present(coordinator.data, description.data_key)]
+        if not present:
+            return
+        for description in present:
+            pending.remove(description)
+        async_add_entities([entity_factory(coordinator, description) for description in present])
+
+    _async_add_present()
+    if pending:
+        entry.async_on_unload(coordinator.async_add_listener(_async_add_present))
+
 
 class EpsEntity(CoordinatorEntity[EpsDataUpdateCoordinator]):
     """Base entity for EPS Smart Pool Control integration."""
 
     _attr_has_entity_name = True
 
-    def __init__(self, coordinator: EpsDataUpdateCoordinator) -> None:
-        """Initialize the entity."""
-        super().__init__(coordinator)
+    def __init__(self, coordinator: EpsDataUpdateCoordinator, data_key: str | None = None) -> None:
+        """Initialize the entity; with a data_key it is only updated when that module changes."""
+        super().__init__(coordinator, data_key)
         entry = coordinator.config_entry
         if entry is not None:
             mac = entry.data.get("mac_address", "")
@@ -27,22 +103,19 @@ class EpsEntity(CoordinatorEntity[EpsDataUpdateCoordinator]):
                 model=f"Smart Pool Control - {mac}",
             )
 
-    def _get_nested_value(self, data: dict, key_path: str) -> object:
-        """Access nested dictionary fields using a dot-separated string."""
-        if not data:
-            return None
-
-        keys = key_path.split(".")
-        value: object = data
-        for key in keys:
-            if not isinstance(value, dict) or key not in value:
-                return None
-            value = value[key]
-        return value
-
-    def _is_module_enabled(self, data_key: str) -> bool:
-        """Return False when the module's status.status is -1 (hardware not present on this device)."""
-        module_data = self.coordinator.data.get(data_key) if self.coordinator.data else None
-        if not isinstance(module_data, dict):
-            return True
-        return self._get_nested_value(module_data, "status.status") != -1
+    @property
+    def extra_state_attributes(self) -> Mapping[str, object] | None:
+        """Return the entity's attributes, plus the time of a restored state until live data replaces it."""
+        attributes = super().extra_state_attributes
+        if (restored_at := self.coordinator.restored_at) is None:
+            return attributes
+        return {**(attributes or {}), ATTR_RESTORED_FROM: restored_at.isoformat()}
+
+    def _update_from_data(self) -> None:
+        """Compute the entity's state attributes from the current coordinator snapshot."""
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Recompute state once per refresh, then write it."""
+        self._update_from_data()
+        super()._handle_coordinator_update()
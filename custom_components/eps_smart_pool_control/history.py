@@ -0,0 +1,132 @@
+"""In-memory metric history for the EPS Smart Pool Control integration."""
+
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from typing import TYPE_CHECKING
+
+from .api import resolve_path
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from .api import Pool
+
+# Metric name -> path of the value in the pool model.
+TRACKED_METRICS: dict[str, tuple[str, ...]] = {
+    "water_temp": ("temperature", "metrics", "water_temp"),
+    "ph": ("ph", "metrics", "actual"),
+    "rx": ("cl", "metrics", "actual"),
+    "pump_current": ("filter", "metrics", "pump_current"),
+}
+
+DEFAULT_CAPACITY = 2880
+
+
+class MetricBuffer:
+    """Fixed-capacity ring buffer of (timestamp, value) samples, stored as packed doubles and floats."""
+
+    __slots__ = ("_next", "_size", "_times", "_values", "capacity")
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        """Initialize the buffer."""
+        self.capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("f", bytes(4 * capacity))
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self._size
+
+    @property
+    def last_timestamp(self) -> float | None:
+        """Return the timestamp of the newest sample."""
+        return self._times[(self._next - 1) % self.capacity] if self._size else None
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a sample, overwriting the oldest one when the buffer is full."""
+        self._times[self._next] = timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def samples(self, since: float | None = None) -> Iterator[tuple[float, float]]:
+        """Yield samples oldest first, optionally only those at or after a timestamp."""
+        start = (self._next - self._size) % self.capacity
+        for offset in range(self._size):
+            index = (start + offset) % self.capacity
+            if since is None or self._times[index] >= since:
+                yield self._times[index], self._values[index]
+
+    def summary(self, since: float | None = None) -> dict[str, float] | None:
+        """Return the min, max, mean and count of the samples at or after a timestamp, or None when there are none."""
+        count = 0
+        total = 0.0
+        low = math.inf
+        high = -math.inf
+        for _timestamp, value in self.samples(since):
+            count += 1
+            total += value
+            low = min(low, value)
+            high = max(high, value)
+        if not count:
+            return None
+        return {"min": round(low, 3), "max": round(high, 3), "mean": round(total / count, 3), "count": count}
+
+    def downsample(self, window: float, since: float | None = None) -> list[dict[str, float]]:
+        """Aggregate samples into fixed windows of `window` seconds, each with its min, max, mean and count."""
+        buckets: list[dict[str, float]] = []
+        bucket_start = -math.inf
+        total = 0.0
+        for timestamp, value in self.samples(since):
+            if timestamp >= bucket_start + window:
+                if buckets:
+                    buckets[-1]["mean"] = total / buckets[-1]["count"]
+                bucket_start = timestamp - timestamp % window
+                buckets.append({"start": bucket_start, "min": value, "max": value, "mean": value, "count": 0})
+                total = 0.0
+            bucket = buckets[-1]
+            bucket["min"] = min(bucket["min"], value)
+            bucket["max"] = max(bucket["max"], value)
+            bucket["count"] += 1
+            total += value
+        if buckets:
+            buckets[-1]["mean"] = total / buckets[-1]["count"]
+        for bucket in buckets:
+            # Values are stored as 32-bit floats; don't report digits they don't hold.
+            for key in ("min", "max", "mean"):
+                bucket[key] = round(bucket[key], 3)
+        return buckets
+
+
+class PoolHistory:
+    """Metric buffers for one pool, fed with every new pool payload."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        """Initialize the history."""
+        self.metrics = {name: MetricBuffer(capacity) for name in TRACKED_METRICS}
+
+    def record(self, data: Pool) -> None:
+        """
+        Append the tracked metrics of a pool state.
+
+        Samples are stamped with the device's activity_at when present, so a state the device has not refreshed
+        since the previous one adds nothing.
+        """
+        timestamp = data.activity_at / 1000 if data.activity_at is not None else time.time()
+        for name, path in TRACKED_METRICS.items():
+            buffer = self.metrics[name]
+            last = buffer.last_timestamp
+            if last is not None and timestamp <= last:
+                continue
+            value = resolve_path(data, path)
+            if isinstance(value, int | float) and not isinstance(value, bool):
+                buffer.append(timestamp, value)
+
+    def downsample(self, window: float, since: float | None = None, metrics: list[str] | None = None) -> dict[str, list[dict[str, float]]]:
+        """Return the downsampled series of the requested metrics, or of all of them."""
+        return {name: buffer.downsample(window, since) for name, buffer in self.metrics.items() if metrics is None or name in metrics}
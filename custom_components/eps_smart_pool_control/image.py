@@ -2,11 +2,23 @@
 
 from __future__ import annotations
 
-from datetime import UTC, datetime
+import asyncio
+import hashlib
+import logging
+import time
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from http import HTTPStatus
+from pathlib import Path
 from typing import TYPE_CHECKING
 
+import aiohttp
 from homeassistant.components.image import ImageEntity
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import STORAGE_DIR, Store
 
+from .const import DOMAIN
 from .eps_entity import EpsEntity
 
 if TYPE_CHECKING:
@@ -16,15 +28,44 @@ if TYPE_CHECKING:
 
     from .coordinator import EpsDataUpdateCoordinator
 
+_LOGGER = logging.getLogger(__name__)
+
+_STORAGE_VERSION = 1
+_STORAGE_SAVE_DELAY = 10
+_FETCH_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
+# An unchanged avatar URL is revalidated (usually a cheap 304) at most this often.
+_REVALIDATE_AFTER = timedelta(hours=24)
+
+
+def _avatar_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, object]]:
+    return Store(hass, _STORAGE_VERSION, f"{DOMAIN}.avatar.{entry_id}")
+
+
+def _avatar_path(hass: HomeAssistant, entry_id: str) -> Path:
+    return Path(hass.config.path(STORAGE_DIR, f"{DOMAIN}.avatar.{entry_id}.img"))
+
+
+async def async_remove_avatar_cache(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the cached avatar of a removed config entry."""
+    await _avatar_store(hass, entry_id).async_remove()
+    await hass.async_add_executor_job(partial(_avatar_path(hass, entry_id).unlink, missing_ok=True))
+
 
 async def async_setup_entry(_hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
     """Set up EPS Smart Pool Control image based on a config entry."""
     coordinator: EpsDataUpdateCoordinator = entry.runtime_data
-    async_add_entities([EpsPoolImageEntity(coordinator)], update_before_add=True)
+    async_add_entities([EpsPoolImageEntity(coordinator)])
 
 
 class EpsPoolImageEntity(EpsEntity, ImageEntity):  # type: ignore[misc]
-    """Image entity showing the pool avatar from the V2 API."""
+    """
+    Image entity showing the pool avatar from the V2 API.
+
+    The avatar is served from a cache kept in memory and under .storage, together with its URL, ETag and content
+    hash. It is only downloaded again when the URL changes or the revalidation period has passed, and
+    image_last_updated only moves when the bytes actually differ.
+    """
 
     _attr_name = "Pool Avatar"
     _attr_content_type = "image/jpeg"
@@ -36,9 +77,91 @@ class EpsPoolImageEntity(EpsEntity, ImageEntity):  # type: ignore[misc]
         self.entity_id = "image.eps_pool_avatar"
         entry_id = coordinator.config_entry.entry_id if coordinator.config_entry else ""
         self._attr_unique_id = f"{entry_id}_eps_pool_avatar"
-        self._attr_image_last_updated = datetime.now(UTC)
+        self._attr_image_last_updated = None
+        self._image: bytes | None = None
+        self._meta: dict[str, object] = {}
+        self._fetch_lock = asyncio.Lock()
+        self._store = _avatar_store(coordinator.hass, entry_id)
+        self._image_path = _avatar_path(coordinator.hass, entry_id)
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the cached avatar from disk, then check whether it is still current."""
+        await super().async_added_to_hass()
+        self._meta = await self._store.async_load() or {}
+        if self._meta:
+            self._image = await self.hass.async_add_executor_job(self._read_image)
+        if self._image is not None:
+            updated_at = self._meta.get("updated_at")
+            self._attr_image_last_updated = datetime.fromisoformat(updated_at) if isinstance(updated_at, str) else datetime.now(UTC)
+            self._attr_content_type = str(self._meta.get("content_type", self._attr_content_type))
+            self.async_write_ha_state()
+        self._async_refresh_image()
+
+    def _update_from_data(self) -> None:
+        """Fetch the avatar in the background when the refresh shows it may have changed."""
+        self._async_refresh_image()
+
+    async def async_image(self) -> bytes | None:
+        """Return the cached avatar bytes."""
+        return self._image
+
+    @callback
+    def _async_refresh_image(self) -> None:
+        url = self.coordinator.data.avatar if self.coordinator.data else None
+        if url and self._needs_fetch(url):
+            self.hass.async_create_task(self._async_fetch_image(url))
+
+    def _needs_fetch(self, url: str) -> bool:
+        """Return True when the avatar at url is not cached yet or is due for revalidation."""
+        fetched_at = self._meta.get("fetched_at")
+        expired = not isinstance(fetched_at, int | float) or time.time() - fetched_at > _REVALIDATE_AFTER.total_seconds()
+        return url != self._meta.get("url") or self._image is None or expired
+
+    async def _async_fetch_image(self, url: str) -> None:
+        """Download the avatar, conditionally when the URL is unchanged, and store it if its content changed."""
+        async with self._fetch_lock:
+            # A refresh that came in while another fetch held the lock finds the avatar up to date by now.
+            if not self._needs_fetch(url):
+                return
+            headers = {}
+            etag = self._meta.get("etag")
+            if url == self._meta.get("url") and self._image is not None and isinstance(etag, str):
+                headers[aiohttp.hdrs.IF_NONE_MATCH] = etag
+            session = async_get_clientsession(self.hass)
+            try:
+                async with session.get(url, headers=headers, timeout=_FETCH_TIMEOUT) as response:
+                    if response.status == HTTPStatus.NOT_MODIFIED:
+                        content = None
+                    else:
+                        response.raise_for_status()
+                        content = await response.read()
+                        etag = response.headers.get(aiohttp.hdrs.ETAG)
+                        content_type = response.content_type
+            except (aiohttp.ClientError, TimeoutError) as err:
+                _LOGGER.debug("Error fetching pool avatar from %s: %s", url, err)
+                return
+
+            meta = {**self._meta, "url": url, "fetched_at": time.time()}
+            if content is not None:
+                digest = hashlib.sha256(content).hexdigest()
+                meta["etag"] = etag
+                if digest != self._meta.get("hash"):
+                    now = datetime.now(UTC)
+                    meta.update(hash=digest, content_type=content_type, updated_at=now.isoformat())
+                    await self.hass.async_add_executor_job(self._write_image, content)
+                    self._image = content
+                    self._attr_content_type = content_type
+                    self._attr_image_last_updated = now
+                    self.async_write_ha_state()
+            self._meta = meta
+            self._store.async_delay_save(lambda: self._meta, _STORAGE_SAVE_DELAY)
+
+    def _write_image(self, content: bytes) -> None:
+        self._image_path.parent.mkdir(parents=True, exist_ok=True)
+        self._image_path.write_bytes(content)
 
-    @property
-    def image_url(self) -> str | None:  # type: ignore[override]
-        """Return the avatar URL from the pool API response."""
-        return self.coordinator.data.get("avatar")
+    def _read_image(self) -> bytes | None:
+        try:
+            return self._image_path.read_bytes()
+        except OSError:
+            return None
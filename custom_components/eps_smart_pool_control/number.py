@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
-from homeassistant.components.number import NumberEntity
+from homeassistant.components.number import NumberEntity, NumberEntityDescription
 
-from .eps_entity import EpsEntity
+from .api import config_change
+from .eps_entity import EpsEntity, EpsEntityDescription, async_add_module_entities, compile_field_path, get_field_value
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -16,53 +18,71 @@ if TYPE_CHECKING:
     from .coordinator import EpsDataUpdateCoordinator
 
 
+@dataclass(frozen=True, kw_only=True)
+class EpsNumberEntityDescription(NumberEntityDescription, EpsEntityDescription):
+    """Describes an EPS Smart Pool Control number entity."""
+
+
+NUMBERS: tuple[EpsNumberEntityDescription, ...] = (
+    EpsNumberEntityDescription(
+        key="eps_pool_rx_target_value",
+        name="RX Target",
+        data_key="cl",
+        api_field="config.rx.target",
+        icon="mdi:water-percent",
+        native_min_value=500,
+        native_max_value=1000,
+        native_step=1,
+    ),
+    EpsNumberEntityDescription(
+        key="eps_pool_pk_target_value",
+        name="PH Target",
+        data_key="ph",
+        api_field="config.target",
+        icon="mdi:water-percent",
+        native_min_value=0,
+        native_max_value=14,
+        native_step=0.1,
+    ),
+    EpsNumberEntityDescription(
+        key="eps_pool_temperature_water_target",
+        name="Water Temperature Target",
+        data_key="temperature",
+        api_field="config.target",
+        icon="mdi:thermometer-water",
+        native_min_value=0,
+        native_max_value=40,
+        native_step=0.1,
+    ),
+)
+
+
 async def async_setup_entry(_hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
     """Set up EPS Smart Pool Control number based on a config entry."""
     coordinator: EpsDataUpdateCoordinator = entry.runtime_data
-
-    numbers = [
-        EpsNumber(coordinator, "eps_pool_rx_target_value", "RX Target", "cl", "config.rx.target", "mdi:water-percent", 500, 1000),
-        EpsNumber(coordinator, "eps_pool_pk_target_value", "PH Target", "ph", "config.target", "mdi:water-percent", 0, 14, 0.1),
-        EpsNumber(coordinator, "eps_pool_temperature_water_target", "Water Temperature Target", "temperature", "config.target", "mdi:thermometer-water", 0, 40, 0.1),
-    ]
-
-    async_add_entities(numbers, update_before_add=True)
+    async_add_module_entities(entry, coordinator, NUMBERS, EpsNumber, async_add_entities)
 
 
 class EpsNumber(EpsEntity, NumberEntity):  # type: ignore[misc]
     """Representation of an EPS Smart Pool Control number entity."""
 
-    def __init__(
-        self,
-        coordinator: EpsDataUpdateCoordinator,
-        sensor_type: str,
-        name: str,
-        data_key: str,
-        api_field: str,
-        icon: str,
-        min_value: float,
-        max_value: float,
-        step: float = 1,
-    ) -> None:
+    entity_description: EpsNumberEntityDescription
+
+    def __init__(self, coordinator: EpsDataUpdateCoordinator, description: EpsNumberEntityDescription) -> None:
         """Initialize the number entity."""
-        super().__init__(coordinator)
-        self._data_key = data_key
-        self._api_field = api_field
-        self._attr_name = name
-        self._attr_icon = icon
-        self._attr_native_min_value = min_value
-        self._attr_native_max_value = max_value
-        self._attr_native_step = step
+        super().__init__(coordinator, description.data_key)
+        self.entity_description = description
+        self._value_path = compile_field_path(f"{description.data_key}.{description.api_field}")
         entry_id = coordinator.config_entry.entry_id if coordinator.config_entry else ""
-        self._attr_unique_id = f"{entry_id}_{sensor_type}"
-        self.entity_id = f"number.{sensor_type}"
+        self._attr_unique_id = f"{entry_id}_{description.key}"
+        self.entity_id = f"number.{description.key}"
+        self._update_from_data()
 
-    @property
-    def native_value(self) -> float | None:  # type: ignore[override]
-        """Return the current value."""
-        value = self._get_nested_value(self.coordinator.data.get(self._data_key, {}), self._api_field)
-        return round(value, 1) if isinstance(value, int | float) else None
+    def _update_from_data(self) -> None:
+        """Read the current value from the coordinator snapshot."""
+        value = get_field_value(self.coordinator.data, self._value_path)
+        self._attr_native_value = round(value, 1) if isinstance(value, int | float) else None
 
     async def async_set_native_value(self, value: float) -> None:
-        """PATCH the new value to the module config endpoint."""
-        await self.coordinator.set_value(self._data_key, {"target": value})
+        """Write the new value to its field in the module config."""
+        await self.coordinator.set_value(self.entity_description.data_key, config_change(self.entity_description.api_field.removeprefix("config."), value))
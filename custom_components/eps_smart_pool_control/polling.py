@@ -0,0 +1,74 @@
+"""Adaptive poll interval for the EPS Smart Pool Control account coordinator."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import timedelta
+
+    from .api import Pool
+
+# Cover status values while the cover is moving, and the pump status while backwashing.
+_COVER_MOVING = (3, 4)
+_PUMP_BACKWASH = 6
+
+
+def _is_busy(pool: Pool) -> bool:
+    """Return True while the pool reports a short-lived transition worth following closely."""
+    cover_moving = pool.cover is not None and pool.cover.status.status in _COVER_MOVING
+    backwashing = pool.filter is not None and pool.filter.status.pump_status == _PUMP_BACKWASH
+    return cover_moving or backwashing
+
+
+class AdaptivePollInterval:
+    """
+    Pick the next poll interval from pool activity.
+
+    Polls run at the minimum interval while a cover or backwash is in progress. While every pool is
+    offline or none has reported new activity, the interval doubles per poll up to the maximum; any new activity
+    drops it back to the base interval.
+    """
+
+    def __init__(self, base: timedelta, minimum: timedelta, maximum: timedelta) -> None:
+        """Initialize the interval engine."""
+        self.minimum = minimum
+        self.maximum = maximum
+        self.base = min(max(base, minimum), maximum)
+        self._backoff = 0
+        self._activity: dict[str, object] = {}
+
+    @property
+    def current(self) -> timedelta:
+        """Return the interval for the current backoff level, without looking at new data."""
+        return min(self.base * (2**self._backoff), self.maximum)
+
+    def note_failure(self) -> timedelta:
+        """Back off one step after a failed poll and return the new interval."""
+        self._backoff_step()
+        return self.current
+
+    def update(self, pools: Iterable[tuple[str, Pool]]) -> timedelta:
+        """Feed the latest (pid, pool) pairs and return the interval until the next poll."""
+        busy = False
+        online = False
+        changed = False
+        for pid, pool in pools:
+            busy = busy or _is_busy(pool)
+            online = online or pool.online
+            if self._activity.get(pid) != pool.activity_at:
+                self._activity[pid] = pool.activity_at
+                changed = True
+
+        if busy:
+            return self.minimum
+        if online and changed:
+            self._backoff = 0
+        else:
+            self._backoff_step()
+        return self.current
+
+    def _backoff_step(self) -> None:
+        if self.base * (2**self._backoff) < self.maximum:
+            self._backoff += 1
@@ -0,0 +1,58 @@
+"""Push updates for the EPS Smart Pool Control integration, received through a Home Assistant webhook."""
+
+from __future__ import annotations
+
+import logging
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+from aiohttp import web
+from homeassistant.components import webhook
+from homeassistant.core import callback
+from homeassistant.helpers.network import NoURLAvailableError
+
+from .const import CONF_WEBHOOK_ID, DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import EpsDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_setup_push(hass: HomeAssistant, entry: ConfigEntry, coordinator: EpsDataUpdateCoordinator) -> None:
+    """
+    Register the webhook the EPS cloud can post pool updates to.
+
+    A body is a JSON object shaped like GET /pool/{pid}, holding only the fields that changed. A pid in the body must
+    match the entry's pool.
+    """
+    webhook_id = entry.data.get(CONF_WEBHOOK_ID)
+    if not webhook_id:
+        webhook_id = webhook.async_generate_id()
+        hass.config_entries.async_update_entry(entry, data={**entry.data, CONF_WEBHOOK_ID: webhook_id})
+
+    async def _async_handle_webhook(_hass: HomeAssistant, _webhook_id: str, request: web.Request) -> web.Response:
+        try:
+            delta = await request.json()
+        except ValueError:
+            return web.Response(status=HTTPStatus.BAD_REQUEST)
+        if not isinstance(delta, dict):
+            return web.Response(status=HTTPStatus.BAD_REQUEST)
+        pid = delta.pop("pid", None)
+        if pid is not None and pid != coordinator.pid:
+            _LOGGER.debug("Ignoring push update for pool %s on the webhook of pool %s", pid, coordinator.pid)
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+        coordinator.async_apply_push(delta)
+        return web.Response(status=HTTPStatus.OK)
+
+    webhook.async_register(hass, DOMAIN, entry.title, webhook_id, _async_handle_webhook, local_only=False, allowed_methods=("POST",))
+    entry.async_on_unload(lambda: webhook.async_unregister(hass, webhook_id))
+
+    try:
+        _LOGGER.info("Push updates for pool %s are accepted at %s", coordinator.pid, webhook.async_generate_url(hass, webhook_id))
+    except NoURLAvailableError:
+        _LOGGER.info("Push updates for pool %s are accepted on webhook %s; no external URL is configured", coordinator.pid, webhook_id)
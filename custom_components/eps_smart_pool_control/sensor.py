@@ -2,250 +2,513 @@
 
 from __future__ import annotations
 
+import time
+from dataclasses import dataclass
+from datetime import timedelta
 from typing import TYPE_CHECKING
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorEntityDescription, SensorStateClass
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
 
-from .eps_entity import EpsEntity
+from .eps_entity import EpsEntity, EpsEntityDescription, async_add_module_entities, compile_field_path, get_field_value
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime
+
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
     from .coordinator import EpsDataUpdateCoordinator
 
+# Statistics sensors write one state per window instead of one per poll.
+STATISTICS_WINDOW = timedelta(minutes=15)
+
+
+def _round_value(value: object) -> object:
+    """Round floats to one decimal and pass other values through."""
+    return round(value, 1) if isinstance(value, float) else value
+
+
+def _milliseconds(seconds: float | None) -> float | None:
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+@dataclass(frozen=True, kw_only=True)
+class EpsSensorEntityDescription(SensorEntityDescription, EpsEntityDescription):
+    """Describes an EPS Smart Pool Control sensor; ENUM sensors map raw API codes through raw_options."""
+
+    raw_options: dict[int, str] | None = None
+    value_fn: Callable[[object], object] = _round_value
+
+
+SENSORS: tuple[EpsSensorEntityDescription, ...] = (
+    EpsSensorEntityDescription(
+        key="eps_pool_water_temperature",
+        name="Water Temperature",
+        native_unit_of_measurement="°C",
+        data_key="temperature",
+        api_field="metrics.water_temp",
+        icon="mdi:thermometer",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    EpsSensorEntityDescription(
+        key="eps_pool_ambient_temperature",
+        name="Ambient Temperature",
+        native_unit_of_measurement="°C",
+        data_key="temperature",
+        api_field="metrics.ambient_temp",
+        icon="mdi:thermometer",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    EpsSensorEntityDescription(
+        key="eps_imx_temperature",
+        name="IMX Temperature",
+        native_unit_of_measurement="°C",
+        data_key="temperature",
+        api_field="metrics.imx_temp",
+        icon="mdi:thermometer",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    EpsSensorEntityDescription(
+        key="eps_pool_rx_level",
+        name="RX Level",
+        native_unit_of_measurement="mV",
+        data_key="cl",
+        api_field="metrics.actual",
+        icon="mdi:water-percent",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    EpsSensorEntityDescription(
+        key="eps_pool_ph_level",
+        name="pH Level",
+        data_key="ph",
+        api_field="metrics.actual",
+        icon="mdi:water-percent",
+        device_class=SensorDeviceClass.PH,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    EpsSensorEntityDescription(
+        key="eps_pool_filterpump_current",
+        name="Filter Pump",
+        native_unit_of_measurement="A",
+        data_key="filter",
+        api_field="metrics.pump_current",
+        icon="mdi:water-pump",
+        device_class=SensorDeviceClass.CURRENT,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    EpsSensorEntityDescription(
+        key="eps_pool_volume_m3",
+        name="Pool Volume",
+        native_unit_of_measurement="m³",
+        data_key="spec",
+        api_field="pool_volume",
+        icon="mdi:image-size-select-small",
+        device_class=SensorDeviceClass.VOLUME_STORAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    EpsSensorEntityDescription(
+        key="eps_pool_pump_speed",
+        name="Pump Speed",
+        data_key="filter",
+        api_field="status.pump_speed",
+        icon="mdi:speedometer",
+        device_class=SensorDeviceClass.ENUM,
+        raw_options={-1: "unsupported", 0: "off", 1: "low", 2: "medium", 3: "high", 4: "max"},
+    ),
+    EpsSensorEntityDescription(
+        key="eps_pool_pump_mode",
+        name="Pump Mode",
+        data_key="filter",
+        api_field="status.pump_status",
+        icon="mdi:water-pump",
+        device_class=SensorDeviceClass.ENUM,
+        raw_options={
+            -1: "unsupported",
+            0: "off",
+            1: "schedule 1",
+            2: "schedule 2",
+            3: "schedule 3",
+            4: "heating",
+            5: "solar",
+            6: "backwash",
+            7: "cooling",
+            8: "manual",
+            9: "frost",
+            10: "active",
+            11: "cover",
+            12: "valve",
+            13: "cover closed",
+            14: "invalid",
+        },
+    ),
+    EpsSensorEntityDescription(
+        key="eps_pool_backwash",
+        name="Backwash",
+        data_key="backwash",
+        api_field="status.status",
+        icon="mdi:skip-backward",
+        device_class=SensorDeviceClass.ENUM,
+        raw_options={
+            -1: "due",
+            0: "off",
+            1: "on",
+        },
+    ),
+    EpsSensorEntityDescription(
+        key="eps_pool_rx_target_value",
+        name="RX Target",
+        native_unit_of_measurement="mV",
+        data_key="cl",
+        api_field="config.rx.target",
+        icon="mdi:water-percent",
+    ),
+    EpsSensorEntityDescription(
+        key="eps_pool_pk_target_value",
+        name="PH Target",
+        data_key="ph",
+        api_field="config.target",
+        icon="mdi:water-percent",
+        device_class=SensorDeviceClass.PH,
+    ),
+    EpsSensorEntityDescription(
+        key="eps_pool_temperature_water_target",
+        name="Water Temperature Target",
+        native_unit_of_measurement="°C",
+        data_key="temperature",
+        api_field="config.target",
+        icon="mdi:thermometer-water",
+        device_class=SensorDeviceClass.TEMPERATURE,
+    ),
+    EpsSensorEntityDescription(
+        key="eps_pool_temperature",
+        name="Temperature",
+        data_key="temperature",
+        api_field="status.status",
+        icon="mdi:thermometer",
+        device_class=SensorDeviceClass.ENUM,
+        raw_options={-1: "unsupported", 0: "heating off", 1: "no flow", 2: "heating on", 10: "E-zero on"},
+    ),
+    EpsSensorEntityDescription(
+        key="eps_pool_lighting",
+        name="Lighting",
+        data_key="lighting",
+        api_field="status.status",
+        icon="mdi:lightbulb",
+        device_class=SensorDeviceClass.ENUM,
+        raw_options={-1: "unsupported", 0: "off", 1: "unknown", 2: "on"},
+    ),
+    EpsSensorEntityDescription(
+        key="eps_pool_ph_status",
+        name="pH Status",
+        data_key="ph",
+        api_field="status.status",
+        icon="mdi:water-percent",
+        device_class=SensorDeviceClass.ENUM,
+        raw_options={-1: "unsupported", -28: "dry run", 0: "ph ok", 103: "ph out of range", 104: "104", 201: "no flow"},
+    ),
+    EpsSensorEntityDescription(
+        key="eps_pool_cl_status",
+        name="Cl Status",
+        data_key="cl",
+        api_field="status.status",
+        icon="mdi:water-percent",
+        device_class=SensorDeviceClass.ENUM,
+        raw_options={-1: "unsupported", -28: "dry run", 0: "cl ok", 103: "cl out of range", 104: "104", 201: "no flow"},
+    ),
+    EpsSensorEntityDescription(
+        key="eps_pool_zero_e_status",
+        name="Zero E Status",
+        data_key="zero_e",
+        api_field="status.status",
+        icon="mdi:flash",
+        device_class=SensorDeviceClass.ENUM,
+        raw_options={-1: "unsupported", 1: "active"},
+    ),
+    EpsSensorEntityDescription(
+        key="eps_pool_cover_status",
+        name="Cover Status",
+        data_key="cover",
+        api_field="status.status",
+        icon="mdi:window-shutter",
+        device_class=SensorDeviceClass.ENUM,
+        raw_options={-1: "unsupported", 1: "open", 2: "closed", 3: "opening", 4: "closing", 5: "semi open"},
+    ),
+    EpsSensorEntityDescription(
+        key="eps_pool_cover_calibration",
+        name="Cover Calibration",
+        data_key="cover",
+        api_field="status.covco",
+        icon="mdi:calibration",
+        device_class=SensorDeviceClass.ENUM,
+        raw_options={-1: "unsupported", 0: "ok", 1: "calibration needed"},
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class EpsStatisticsSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor reporting the mean of a tracked metric over each statistics window."""
+
+    data_key: str
+    metric: str
+
+
+STATISTICS_SENSORS: tuple[EpsStatisticsSensorEntityDescription, ...] = (
+    EpsStatisticsSensorEntityDescription(
+        key="eps_pool_water_temperature_mean",
+        name="Water Temperature (15 min mean)",
+        native_unit_of_measurement="°C",
+        data_key="temperature",
+        metric="water_temp",
+        icon="mdi:thermometer",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        entity_registry_enabled_default=False,
+    ),
+    EpsStatisticsSensorEntityDescription(
+        key="eps_pool_ph_level_mean",
+        name="pH Level (15 min mean)",
+        data_key="ph",
+        metric="ph",
+        icon="mdi:water-percent",
+        device_class=SensorDeviceClass.PH,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        entity_registry_enabled_default=False,
+    ),
+    EpsStatisticsSensorEntityDescription(
+        key="eps_pool_rx_level_mean",
+        name="RX Level (15 min mean)",
+        native_unit_of_measurement="mV",
+        data_key="cl",
+        metric="rx",
+        icon="mdi:water-percent",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        entity_registry_enabled_default=False,
+    ),
+    EpsStatisticsSensorEntityDescription(
+        key="eps_pool_filterpump_current_mean",
+        name="Filter Pump (15 min mean)",
+        native_unit_of_measurement="A",
+        data_key="filter",
+        metric="pump_current",
+        icon="mdi:water-pump",
+        device_class=SensorDeviceClass.CURRENT,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        entity_registry_enabled_default=False,
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class EpsDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor reporting on the integration itself rather than on the pool."""
+
+    value_fn: Callable[[EpsDataUpdateCoordinator], object]
+    attributes_fn: Callable[[EpsDataUpdateCoordinator], dict[str, object]] | None = None
+
+
+DIAGNOSTIC_SENSORS: tuple[EpsDiagnosticSensorEntityDescription, ...] = (
+    EpsDiagnosticSensorEntityDescription(
+        key="eps_api_latency",
+        name="API Latency",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: _milliseconds(coordinator.account.client.metrics.latency_percentile(0.95)),
+        attributes_fn=lambda coordinator: {
+            "p50": _milliseconds(coordinator.account.client.metrics.latency_percentile(0.5)),
+            "pool_p95": _milliseconds(coordinator.account.client.metrics.latency_percentile(0.95, "GET /pool/{pid}")),
+        },
+    ),
+    EpsDiagnosticSensorEntityDescription(
+        key="eps_api_errors",
+        name="API Errors",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.account.client.metrics.error_count,
+        attributes_fn=lambda coordinator: {"responses": {" ".join(key): count for key, count in coordinator.account.client.metrics.responses.items()}},
+    ),
+    EpsDiagnosticSensorEntityDescription(
+        key="eps_api_retries",
+        name="API Retries",
+        icon="mdi:refresh",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.account.client.metrics.retry_count,
+    ),
+    EpsDiagnosticSensorEntityDescription(
+        key="eps_api_budget",
+        name="API Request Budget",
+        native_unit_of_measurement="requests",
+        icon="mdi:gauge",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: int(coordinator.account.client.budget.tokens) if coordinator.account.client.budget else None,
+        attributes_fn=lambda coordinator: {
+            **(coordinator.account.client.budget.as_dict() if coordinator.account.client.budget else {}),
+            "deferred_polls": coordinator.account.deferred_polls,
+        },
+    ),
+    EpsDiagnosticSensorEntityDescription(
+        key="eps_update_fanout_time",
+        name="Update Fan-out Time",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: _milliseconds(coordinator.fanout.percentile(0.95)),
+    ),
+    EpsDiagnosticSensorEntityDescription(
+        key="eps_last_successful_update",
+        name="Last Successful Update",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.last_success_at,
+    ),
+)
+
 
 async def async_setup_entry(_hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
     """Set up EPS Smart Pool Control sensor based on a config entry."""
     coordinator: EpsDataUpdateCoordinator = entry.runtime_data
-
-    sensors = [
-        EpsSensor(
-            coordinator,
-            "eps_pool_water_temperature",
-            "Water Temperature",
-            "°C",
-            "temperature",
-            "metrics.water_temp",
-            "mdi:thermometer",
-            SensorDeviceClass.TEMPERATURE,
-            state_class=SensorStateClass.MEASUREMENT,
-        ),
-        EpsSensor(
-            coordinator,
-            "eps_pool_ambient_temperature",
-            "Ambient Temperature",
-            "°C",
-            "temperature",
-            "metrics.ambient_temp",
-            "mdi:thermometer",
-            SensorDeviceClass.TEMPERATURE,
-            state_class=SensorStateClass.MEASUREMENT,
-        ),
-        EpsSensor(
-            coordinator, "eps_imx_temperature", "IMX Temperature", "°C", "temperature", "metrics.imx_temp", "mdi:thermometer", SensorDeviceClass.TEMPERATURE, state_class=SensorStateClass.MEASUREMENT
-        ),
-        EpsSensor(coordinator, "eps_pool_rx_level", "RX Level", "mV", "cl", "metrics.actual", "mdi:water-percent", state_class=SensorStateClass.MEASUREMENT),
-        EpsSensor(coordinator, "eps_pool_ph_level", "pH Level", None, "ph", "metrics.actual", "mdi:water-percent", SensorDeviceClass.PH, state_class=SensorStateClass.MEASUREMENT),
-        EpsSensor(
-            coordinator, "eps_pool_filterpump_current", "Filter Pump", "A", "filter", "metrics.pump_current", "mdi:water-pump", SensorDeviceClass.CURRENT, state_class=SensorStateClass.MEASUREMENT
-        ),
-        EpsSensor(
-            coordinator, "eps_pool_volume_m3", "Pool Volume", "m³", "spec", "pool_volume", "mdi:image-size-select-small", SensorDeviceClass.VOLUME_STORAGE, state_class=SensorStateClass.MEASUREMENT
-        ),
-        EpsSensor(
-            coordinator,
-            "eps_pool_pump_speed",
-            "Pump Speed",
-            None,
-            "filter",
-            "status.pump_speed",
-            "mdi:speedometer",
-            device_class=SensorDeviceClass.ENUM,
-            options={-1: "unsupported", 0: "off", 1: "low", 2: "medium", 3: "high", 4: "max"},
-        ),
-        EpsSensor(
-            coordinator,
-            "eps_pool_pump_mode",
-            "Pump Mode",
-            None,
-            "filter",
-            "status.pump_status",
-            "mdi:water-pump",
-            device_class=SensorDeviceClass.ENUM,
-            options={
-                -1: "unsupported",
-                0: "off",
-                1: "schedule 1",
-                2: "schedule 2",
-                3: "schedule 3",
-                4: "heating",
-                5: "solar",
-                6: "backwash",
-                7: "cooling",
-                8: "manual",
-                9: "frost",
-                10: "active",
-                11: "cover",
-                12: "valve",
-                13: "cover closed",
-                14: "invalid",
-            },
-        ),
-        EpsSensor(
-            coordinator,
-            "eps_pool_backwash",
-            "Backwash",
-            None,
-            "backwash",
-            "status.status",
-            "mdi:skip-backward",
-            device_class=SensorDeviceClass.ENUM,
-            options={
-                -1: "due",
-                0: "off",
-                1: "on",
-            },
-        ),
-        EpsSensor(coordinator, "eps_pool_rx_target_value", "RX Target", "mV", "cl", "config.rx.target", "mdi:water-percent"),
-        EpsSensor(coordinator, "eps_pool_pk_target_value", "PH Target", None, "ph", "config.target", "mdi:water-percent", SensorDeviceClass.PH),
-        EpsSensor(coordinator, "eps_pool_temperature_water_target", "Water Temperature Target", "°C", "temperature", "config.target", "mdi:thermometer-water", SensorDeviceClass.TEMPERATURE),
-        EpsSensor(
-            coordinator,
-            "eps_pool_temperature",
-            "Temperature",
-            None,
-            "temperature",
-            "status.status",
-            "mdi:thermometer",
-            device_class=SensorDeviceClass.ENUM,
-            options={-1: "unsupported", 0: "heating off", 1: "no flow", 2: "heating on", 10: "E-zero on"},
-        ),
-        EpsSensor(
-            coordinator,
-            "eps_pool_lighting",
-            "Lighting",
-            None,
-            "lighting",
-            "status.status",
-            "mdi:lightbulb",
-            device_class=SensorDeviceClass.ENUM,
-            options={-1: "unsupported", 0: "off", 1: "unknown", 2: "on"},
-        ),
-        EpsSensor(
-            coordinator,
-            "eps_pool_ph_status",
-            "pH Status",
-            None,
-            "ph",
-            "status.status",
-            "mdi:water-percent",
-            device_class=SensorDeviceClass.ENUM,
-            options={-1: "unsupported", -28: "dry run", 0: "ph ok", 103: "ph out of range", 104: "104", 201: "no flow"},
-        ),
-        EpsSensor(
-            coordinator,
-            "eps_pool_cl_status",
-            "Cl Status",
-            None,
-            "cl",
-            "status.status",
-            "mdi:water-percent",
-            device_class=SensorDeviceClass.ENUM,
-            options={-1: "unsupported", -28: "dry run", 0: "cl ok", 103: "cl out of range", 104: "104", 201: "no flow"},
-        ),
-        EpsSensor(
-            coordinator,
-            "eps_pool_zero_e_status",
-            "Zero E Status",
-            None,
-            "zero_e",
-            "status.status",
-            "mdi:flash",
-            device_class=SensorDeviceClass.ENUM,
-            options={-1: "unsupported", 1: "active"},
-        ),
-        EpsSensor(
-            coordinator,
-            "eps_pool_cover_status",
-            "Cover Status",
-            None,
-            "cover",
-            "status.status",
-            "mdi:window-shutter",
-            device_class=SensorDeviceClass.ENUM,
-            options={-1: "unsupported", 1: "open", 2: "closed", 3: "opening", 4: "closing", 5: "semi open"},
-        ),
-        EpsSensor(
-            coordinator,
-            "eps_pool_cover_calibration",
-            "Cover Calibration",
-            None,
-            "cover",
-            "status.covco",
-            "mdi:calibration",
-            device_class=SensorDeviceClass.ENUM,
-            options={-1: "unsupported", 0: "ok", 1: "calibration needed"},
-        ),
-    ]
-
-    async_add_entities(sensors, update_before_add=True)
+    async_add_module_entities(entry, coordinator, SENSORS, EpsSensor, async_add_entities)
+    async_add_module_entities(entry, coordinator, STATISTICS_SENSORS, EpsStatisticsSensor, async_add_entities)
+    async_add_entities(EpsDiagnosticSensor(coordinator, description) for description in DIAGNOSTIC_SENSORS)
 
 
 class EpsSensor(EpsEntity, SensorEntity):  # type: ignore[misc]
     """Representation of an EPS Smart Pool Control sensor."""
 
-    def __init__(
-        self,
-        coordinator: EpsDataUpdateCoordinator,
-        sensor_type: str,
-        name: str,
-        unit_of_measurement: str | None,
-        data_key: str,
-        api_field: str,
-        icon: str,
-        device_class: SensorDeviceClass | None = None,
-        options: dict[int, str] | None = None,
-        state_class: SensorStateClass | None = None,
-    ) -> None:
+    entity_description: EpsSensorEntityDescription
+
+    def __init__(self, coordinator: EpsDataUpdateCoordinator, description: EpsSensorEntityDescription) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._data_key = data_key
-        self._api_field = api_field
-        self._options = options
-        self._attr_name = name
-        self._attr_native_unit_of_measurement = unit_of_measurement
-        self._attr_icon = icon
-        self._attr_device_class = device_class
-        self._attr_state_class = state_class
-        self._attr_options = list(options.values()) if options else None
+        super().__init__(coordinator, description.data_key)
+        self.entity_description = description
+        self._value_path = compile_field_path(f"{description.data_key}.{description.api_field}")
+        self._options = description.raw_options
+        self._attr_options = list(description.raw_options.values()) if description.raw_options else None
         entry_id = coordinator.config_entry.entry_id if coordinator.config_entry else ""
-        self._attr_unique_id = f"{entry_id}_{sensor_type}"
-        self.entity_id = f"sensor.{sensor_type}"
+        self._attr_unique_id = f"{entry_id}_{description.key}"
+        self.entity_id = f"sensor.{description.key}"
+        self._update_from_data()
 
-    @property
-    def native_value(self) -> object:  # type: ignore[override]
-        """Return the sensor value, mapped through options for ENUM sensors."""
-        value = self._get_nested_value(self.coordinator.data.get(self._data_key, {}), self._api_field)
-        if self._options and isinstance(value, int):
-            return self._options.get(value, "unknown")
-        if isinstance(value, float):
-            return round(value, 1)
-        return value
-
-    @property
-    def extra_state_attributes(self) -> dict[str, object]:  # type: ignore[override]
-        """Return raw value and option list for ENUM sensors."""
+    def _update_from_data(self) -> None:
+        """Compute the value, mapped through options for ENUM sensors, and the raw value and option list attributes in one pass."""
+        value = get_field_value(self.coordinator.data, self._value_path)
         attributes: dict[str, object] = {}
         if self._options:
-            value = self._get_nested_value(self.coordinator.data.get(self._data_key, {}), self._api_field)
             if value is not None:
                 attributes["raw_value"] = value
-            attributes["options"] = list(self._options.values())
-        return attributes
+            attributes["options"] = self._attr_options
+        self._attr_extra_state_attributes = attributes
+
+        if self._options and isinstance(value, int):
+            self._attr_native_value = self._options.get(value, "unknown")
+        else:
+            self._attr_native_value = self.entity_description.value_fn(value)  # type: ignore[assignment]
+
+
+class EpsStatisticsSensor(EpsEntity, SensorEntity):  # type: ignore[misc]
+    """
+    Sensor reporting the mean of a metric from the coordinator's history over the last statistics window.
+
+    The state is only written once per window, so the recorder keeps long-term statistics for the metric without a
+    state row for every poll. Min, max and sample count of the window are exposed as attributes.
+    """
+
+    entity_description: EpsStatisticsSensorEntityDescription
+
+    def __init__(self, coordinator: EpsDataUpdateCoordinator, description: EpsStatisticsSensorEntityDescription) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, description.data_key)
+        self.entity_description = description
+        self._buffer = coordinator.history.metrics[description.metric]
+        self._was_available = self.available
+        entry_id = coordinator.config_entry.entry_id if coordinator.config_entry else ""
+        self._attr_unique_id = f"{entry_id}_{description.key}"
+        self.entity_id = f"sensor.{description.key}"
+        self._update_from_history()
+
+    async def async_added_to_hass(self) -> None:
+        """Start writing the state at the end of every window."""
+        await super().async_added_to_hass()
+        self.async_on_remove(async_track_time_interval(self.hass, self._async_write_window, STATISTICS_WINDOW))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Only write the state when availability changes; new samples wait for the end of the window."""
+        if self.available != self._was_available:
+            self._was_available = self.available
+            self.async_write_ha_state()
+
+    @callback
+    def _async_write_window(self, _now: datetime) -> None:
+        self._update_from_history()
+        self.async_write_ha_state()
+
+    def _update_from_history(self) -> None:
+        summary = self._buffer.summary(time.time() - STATISTICS_WINDOW.total_seconds())
+        if summary is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
+        self._attr_native_value = summary["mean"]
+        self._attr_extra_state_attributes = {"min": summary["min"], "max": summary["max"], "count": summary["count"]}
+
+
+class EpsDiagnosticSensor(EpsEntity, SensorEntity):  # type: ignore[misc]
+    """
+    Sensor exposing the integration's own request and update metrics.
+
+    Besides the pool's updates it follows every refresh of the account, so it also moves when polls return unchanged
+    data.
+    """
+
+    entity_description: EpsDiagnosticSensorEntityDescription
+
+    def __init__(self, coordinator: EpsDataUpdateCoordinator, description: EpsDiagnosticSensorEntityDescription) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        entry_id = coordinator.config_entry.entry_id if coordinator.config_entry else ""
+        self._attr_unique_id = f"{entry_id}_{description.key}"
+        self.entity_id = f"sensor.{description.key}"
+        self._update_from_data()
+
+    async def async_added_to_hass(self) -> None:
+        """Also follow the account's refreshes."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.account.async_add_listener(self._handle_coordinator_update))
 
     @property
-    def entity_registry_enabled_default(self) -> bool:  # type: ignore[override]
-        """Disable entities belonging to modules the device reports as unsupported (status -1)."""
-        return self._is_module_enabled(self._data_key)
+    def available(self) -> bool:
+        """Stay available while the API fails; that is what these sensors report on."""
+        return True
+
+    def _update_from_data(self) -> None:
+        """Read the metric from the coordinator's instrumentation."""
+        self._attr_native_value = self.entity_description.value_fn(self.coordinator)  # type: ignore[assignment]
+        if self.entity_description.attributes_fn is not None:
+            self._attr_extra_state_attributes = self.entity_description.attributes_fn(self.coordinator)
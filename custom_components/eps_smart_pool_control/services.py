@@ -0,0 +1,118 @@
+"""Services for the EPS Smart Pool Control integration."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .api import config_change, merge_copy
+from .const import DOMAIN
+from .history import TRACKED_METRICS
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import EpsDataUpdateCoordinator
+
+SERVICE_GET_METRIC_HISTORY = "get_metric_history"
+SERVICE_APPLY_SETTINGS = "apply_settings"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_METRICS = "metrics"
+ATTR_WINDOW = "window"
+ATTR_HOURS = "hours"
+ATTR_SETTINGS = "settings"
+
+# Modules whose config apply_settings can write, and the PATCHes it keeps in flight across all pools of one call.
+SETTINGS_MODULES = ("filter", "ph", "cl", "temperature")
+_MAX_PARALLEL_WRITES = 4
+
+GET_METRIC_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_METRICS): vol.All(cv.ensure_list, [vol.In(TRACKED_METRICS)]),
+        vol.Optional(ATTR_WINDOW, default=300): vol.All(vol.Coerce(int), vol.Range(min=10, max=86400)),
+        vol.Optional(ATTR_HOURS, default=24): vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False, max=720)),
+    }
+)
+
+
+def _setting_path(value: object) -> str:
+    """Validate a setting key: a module from SETTINGS_MODULES followed by a field path within its config."""
+    path = cv.string(value)
+    module, _, field = path.partition(".")
+    if module not in SETTINGS_MODULES or not field.removeprefix("config."):
+        msg = f"Setting {path} must be one of {', '.join(SETTINGS_MODULES)} followed by a config field, e.g. cl.rx.target"
+        raise vol.Invalid(msg)
+    return path
+
+
+APPLY_SETTINGS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_SETTINGS): vol.All({_setting_path: vol.Any(bool, int, float, str)}, vol.Length(min=1)),
+    }
+)
+
+
+def _group_settings(settings: dict[str, object]) -> dict[str, dict]:
+    """Turn {"cl.rx.target": 700, "filter.schedule_1.enabled": True} into nested config changes per module."""
+    changes: dict[str, dict] = {}
+    for path, value in settings.items():
+        module, _, field = path.partition(".")
+        changes[module] = merge_copy(changes.get(module, {}), config_change(field.removeprefix("config."), value))
+    return changes
+
+
+def _get_coordinator(hass: HomeAssistant, entry_id: str) -> EpsDataUpdateCoordinator:
+    """Return the coordinator of a loaded config entry of this integration."""
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN or entry.state is not ConfigEntryState.LOADED:
+        msg = f"No loaded EPS Smart Pool Control entry with ID {entry_id}"
+        raise ServiceValidationError(msg)
+    return entry.runtime_data
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+
+    @callback
+    def _async_get_metric_history(call: ServiceCall) -> ServiceResponse:
+        """Return the kept metric history of a pool, downsampled into windows of min, max and mean."""
+        coordinator = _get_coordinator(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        since = time.time() - call.data[ATTR_HOURS] * 3600
+        series = coordinator.history.downsample(call.data[ATTR_WINDOW], since, call.data.get(ATTR_METRICS))
+        return {"window": call.data[ATTR_WINDOW], "metrics": series}  # type: ignore[return-value]
+
+    async def _async_apply_settings(call: ServiceCall) -> None:
+        """Write settings to one or more pools, one concurrent PATCH per changed module and one refresh per pool."""
+        coordinators = [_get_coordinator(hass, entry_id) for entry_id in call.data[ATTR_CONFIG_ENTRY_ID]]
+        changes = _group_settings(call.data[ATTR_SETTINGS])
+        semaphore = asyncio.Semaphore(_MAX_PARALLEL_WRITES)
+        results = await asyncio.gather(*(coordinator.async_write_modules(changes, semaphore) for coordinator in coordinators), return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        for error in errors:
+            if not isinstance(error, HomeAssistantError):
+                raise error
+        if len(errors) == 1:
+            raise errors[0]
+        if errors:
+            msg = "; ".join(str(error) for error in errors)
+            raise HomeAssistantError(msg)
+
+    hass.services.async_register(DOMAIN, SERVICE_APPLY_SETTINGS, _async_apply_settings, schema=APPLY_SETTINGS_SCHEMA)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_METRIC_HISTORY,
+        _async_get_metric_history,
+        schema=GET_METRIC_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1 @@
+"""Tests for the EPS Smart Pool Control integration."""
@@ -0,0 +1,178 @@
+"""Tests for the API client."""
+
+import asyncio
+import time
+
+import pytest
+
+from benchmarks.fake_server import FakeApiConfig, FakeEpsApi
+from custom_components.eps_smart_pool_control.api import (
+    CircuitBreaker,
+    EpsApiCircuitOpenError,
+    EpsApiClient,
+    EpsApiConnectionError,
+    EpsApiError,
+    EpsApiRateLimitError,
+    RequestBudget,
+)
+from custom_components.eps_smart_pool_control.api import client as client_module
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Retry right away instead of after a backoff of seconds."""
+    monkeypatch.setattr(client_module, "_BACKOFF_BASE", 0.0)
+
+
+async def _until_requested(server: FakeEpsApi) -> None:
+    """Wait until the fake API has received a request."""
+    for _ in range(500):
+        if server.requests:
+            return
+        await asyncio.sleep(0.01)
+    pytest.fail("the fake API received no request")
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_get_is_retried_on_server_errors() -> None:
+    """A GET answered with 5xx is retried up to max_retries times, each retry counted in the metrics."""
+    async with FakeEpsApi(FakeApiConfig(error_rate=1)) as server, EpsApiClient("key", base_url=server.base_url, max_retries=2) as client:
+        with pytest.raises(EpsApiError) as err:
+            await client.list_pools()
+        assert err.value.status == 503
+        assert server.requests["GET /pool"] == 3
+        assert client.metrics.retry_count == 2
+
+        server.config = FakeApiConfig()
+        assert len(await client.list_pools()) == 1
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_get_is_retried_on_timeouts() -> None:
+    """A GET that times out is retried, then fails with a connection error."""
+    async with FakeEpsApi(FakeApiConfig(latency=0.5)) as server, EpsApiClient("key", base_url=server.base_url, timeout=0.05, max_retries=1) as client:
+        with pytest.raises(EpsApiConnectionError):
+            await client.list_pools()
+        assert server.requests["GET /pool"] == 2
+
+
+@pytest.mark.usefixtures("socket_enabled")
+@pytest.mark.parametrize("config", [FakeApiConfig(error_rate=1), FakeApiConfig(latency=0.5)], ids=["server error", "timeout"])
+async def test_patch_is_not_retried(config: FakeApiConfig) -> None:
+    """A PATCH is sent once, whatever the outcome, so a write the API may have applied is never repeated."""
+    async with FakeEpsApi(config) as server, EpsApiClient("key", base_url=server.base_url, timeout=0.05, max_retries=3) as client:
+        pid = next(iter(server.pools))
+        with pytest.raises(EpsApiError):
+            await client.patch_module(pid, "ph", {"target": 7.2})
+        assert server.requests["PATCH /pool/{pid}/{module}"] == 1
+        assert client.metrics.retry_count == 0
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_rate_limited_call_waits_out_a_short_retry_after() -> None:
+    """A 429 with a Retry-After of up to a minute is waited out before the call is tried again."""
+    async with FakeEpsApi(FakeApiConfig(rate_limit_rate=1, retry_after=0.3)) as server, EpsApiClient("key", base_url=server.base_url, max_retries=1) as client:
+        started = time.monotonic()
+        with pytest.raises(EpsApiRateLimitError) as err:
+            await client.list_pools()
+        assert time.monotonic() - started >= 0.3
+        assert err.value.retry_after == 0.3
+        assert server.requests["GET /pool"] == 2
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_rate_limited_call_fails_on_a_long_retry_after() -> None:
+    """A Retry-After of more than a minute is left to the caller, even for a call that could be retried."""
+    async with FakeEpsApi(FakeApiConfig(rate_limit_rate=1, retry_after=61)) as server, EpsApiClient("key", base_url=server.base_url, max_retries=3) as client:
+        with pytest.raises(EpsApiRateLimitError) as err:
+            await client.list_pools()
+        assert err.value.retry_after == 61
+        assert server.requests["GET /pool"] == 1
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_open_circuit_leaves_the_budget_alone() -> None:
+    """A call the open circuit rejects takes no token from the request budget."""
+    async with FakeEpsApi() as server, EpsApiClient("key", base_url=server.base_url, budget=RequestBudget(refill_rate=0)) as client:
+        client.circuit = CircuitBreaker(failure_threshold=1)
+        client.circuit.record_failure()
+        tokens = client.budget.tokens
+        with pytest.raises(EpsApiCircuitOpenError):
+            await client.list_pools()
+        assert client.budget.tokens == tokens
+        assert not server.requests
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_cancelled_trial_call_lets_the_next_call_through() -> None:
+    """A half-open trial call that is cancelled does not leave the circuit waiting for its outcome forever."""
+    async with FakeEpsApi(FakeApiConfig(latency=1)) as server, EpsApiClient("key", base_url=server.base_url, max_retries=0) as client:
+        client.circuit = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        client.circuit.record_failure()
+        assert client.circuit.is_open
+
+        trial = asyncio.create_task(client.list_pools())
+        await _until_requested(server)
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+        server.config = FakeApiConfig()
+        assert len(await client.list_pools()) == 1
+        assert not client.circuit.is_open
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_open_circuit_rejects_calls_while_a_trial_runs() -> None:
+    """Only one trial call goes out while the circuit is half-open."""
+    async with FakeEpsApi(FakeApiConfig(latency=1)) as server, EpsApiClient("key", base_url=server.base_url, max_retries=0) as client:
+        client.circuit = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        client.circuit.record_failure()
+
+        trial = asyncio.create_task(client.list_pools())
+        await _until_requested(server)
+        with pytest.raises(EpsApiCircuitOpenError):
+            await client.list_pools()
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_unchanged_pool_is_answered_with_a_304_and_the_previous_objects() -> None:
+    """A pool read again with its ETag gets a 304 and returns the payload and model of the previous read."""
+    async with FakeEpsApi(FakeApiConfig(change_rate=0)) as server, EpsApiClient("key", base_url=server.base_url) as client:
+        pid = next(iter(server.pools))
+        data = await client.get_pool(pid)
+        model = await client.get_pool_state(pid)
+        assert await client.get_pool(pid) is data
+        assert await client.get_pool_state(pid) is model
+        assert server.not_modified["GET /pool/{pid}"] == 3
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_unchanged_body_without_etag_returns_the_previous_objects() -> None:
+    """Without ETags a body hashing the same as the previous one still returns the previous payload and model."""
+    async with FakeEpsApi(FakeApiConfig(change_rate=0, etags=False)) as server, EpsApiClient("key", base_url=server.base_url) as client:
+        pid = next(iter(server.pools))
+        model = await client.get_pool_state(pid)
+        data = await client.get_pool(pid)
+        assert await client.get_pool_state(pid) is model
+        assert await client.get_pool(pid) is data
+        assert server.requests["GET /pool/{pid}"] == 4
+        assert not server.not_modified
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_changed_pool_shares_its_unchanged_modules() -> None:
+    """A changed pool is a new model, whose modules that did not change are the objects of the previous one."""
+    async with FakeEpsApi(FakeApiConfig(change_rate=0)) as server, EpsApiClient("key", base_url=server.base_url) as client:
+        pid = next(iter(server.pools))
+        model = await client.get_pool_state(pid)
+        server.pools[pid]["temperature"]["metrics"]["water_temp"] = 30.0
+        changed = await client.get_pool_state(pid)
+        assert changed is not model
+        assert changed.temperature is not None
+        assert changed.temperature.metrics.water_temp == 30.0
+        assert changed.ph is model.ph
+        assert changed.filter is model.filter
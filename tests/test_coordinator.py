@@ -0,0 +1,309 @@
+"""Tests for the account and pool coordinators."""
+
+import asyncio
+import functools
+from collections import Counter
+from datetime import timedelta
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
+
+from benchmarks.fake_local import FakeController
+from benchmarks.fake_server import FakeApiConfig, FakeEpsApi
+from custom_components.eps_smart_pool_control import coordinator
+from custom_components.eps_smart_pool_control.api import EpsApiClient, Pool, Priority, RequestBudget
+from custom_components.eps_smart_pool_control.const import ATTR_RESTORED_FROM, CONF_LOCAL_HOST, CONF_LOCAL_POLL_INTERVAL, DOMAIN
+from custom_components.eps_smart_pool_control.coordinator import EpsAccountCoordinator
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_account_larger_than_the_budget_keeps_polling(hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch) -> None:
+    """An account with more pools than a full request budget covers still refreshes every pool in every cycle."""
+    monkeypatch.setattr(coordinator, "_FETCH_STAGGER", timedelta(0))
+    async with FakeEpsApi(FakeApiConfig(pools=100)) as server:
+        account = EpsAccountCoordinator(hass, "key")
+        # A fast refill keeps the test short; the bucket still holds far fewer tokens than a cycle needs.
+        budget = RequestBudget(refill_rate=200)
+        account.client = EpsApiClient("key", session=async_get_clientsession(hass), base_url=server.base_url, max_retries=0, budget=budget)
+        for pool in server.pools.values():
+            account.async_register_pool(pool["mac"], pool["pid"])
+
+        cycles = 4
+        for _ in range(cycles):
+            # The poll interval refills the bucket between cycles, which still leaves it short of a whole cycle.
+            await asyncio.sleep(budget.delay(Priority.POLL, budget.burst(Priority.POLL)))
+            await account.async_refresh()
+            assert account.last_update_success
+            assert not account.poll_deferred
+            assert len(account.data) == 100
+
+        assert server.requests["GET /pool"] == cycles
+        assert server.requests["GET /pool/{pid}"] == 100 * cycles
+        assert account.deferred_polls == 0
+
+
+@pytest.mark.usefixtures("socket_enabled")
+@pytest.mark.parametrize(("stored_pid", "lookups"), [(True, 0), (False, 1)])
+async def test_setup_and_polling_make_the_minimum_of_requests(hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch, *, stored_pid: bool, lookups: int) -> None:
+    """Setup takes one pool fetch, plus a lookup without a stored pool ID, and every account cycle two calls."""
+    async with FakeEpsApi() as server:
+        monkeypatch.setattr(coordinator, "EpsApiClient", functools.partial(EpsApiClient, base_url=server.base_url))
+        pool = next(iter(server.pools.values()))
+        data = {"api_key": "key", "mac_address": pool["mac"]}
+        if stored_pid:
+            data["pid"] = pool["pid"]
+        entry = MockConfigEntry(domain=DOMAIN, data=data, unique_id=pool["mac"])
+        entry.add_to_hass(hass)
+
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        # Refreshes requested during setup would run once the debouncer's cooldown is over.
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=31))
+        await hass.async_block_till_done()
+        assert entry.state is ConfigEntryState.LOADED
+        assert hass.states.async_entity_ids()
+        assert server.requests == Counter({"GET /pool": lookups, "GET /pool/{pid}": 1})
+
+        cycles = 3
+        for _ in range(cycles):
+            await entry.runtime_data.account.async_refresh()
+            await hass.async_block_till_done()
+        assert server.requests == Counter({"GET /pool": lookups + cycles, "GET /pool/{pid}": 1 + cycles})
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_unchanged_pool_skips_the_fan_out(hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch, freezer: FrozenDateTimeFactory) -> None:
+    """An account cycle returning the same pool notifies no entity, yet counts as a successful update of the pool."""
+    async with FakeEpsApi(FakeApiConfig(change_rate=0)) as server:
+        monkeypatch.setattr(coordinator, "EpsApiClient", functools.partial(EpsApiClient, base_url=server.base_url))
+        pool = next(iter(server.pools.values()))
+        entry = MockConfigEntry(domain=DOMAIN, data={"api_key": "key", "mac_address": pool["mac"], "pid": pool["pid"]}, unique_id=pool["mac"])
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        pool_coordinator = entry.runtime_data
+        updates = Mock(wraps=pool_coordinator.async_set_updated_data)
+        monkeypatch.setattr(pool_coordinator, "async_set_updated_data", updates)
+        data = pool_coordinator.data
+
+        freezer.tick(timedelta(minutes=5))
+        await pool_coordinator.account.async_refresh()
+        await hass.async_block_till_done()
+        assert server.not_modified["GET /pool/{pid}"] == 1
+        updates.assert_not_called()
+        assert pool_coordinator.data is data
+        assert pool_coordinator.last_success_at == dt_util.utcnow()
+
+        pool["temperature"]["metrics"]["water_temp"] = 30.0
+        await pool_coordinator.account.async_refresh()
+        await hass.async_block_till_done()
+        updates.assert_called_once()
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_pool_follows_a_new_id_from_the_pool_list(hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch) -> None:
+    """When the pool list moves the MAC to another pool ID, the pool is fetched and stored under that ID from then on."""
+    async with FakeEpsApi() as server:
+        monkeypatch.setattr(coordinator, "EpsApiClient", functools.partial(EpsApiClient, base_url=server.base_url))
+        pool = next(iter(server.pools.values()))
+        entry = MockConfigEntry(domain=DOMAIN, data={"api_key": "key", "mac_address": pool["mac"], "pid": pool["pid"]}, unique_id=pool["mac"])
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        pool_coordinator = entry.runtime_data
+
+        server.pools = {"pool-moved": {**pool, "pid": "pool-moved"}}
+        await pool_coordinator.account.async_refresh()
+        await hass.async_block_till_done()
+        assert pool_coordinator.pid == "pool-moved"
+        assert entry.data["pid"] == "pool-moved"
+        assert pool_coordinator.last_update_success
+        assert pool_coordinator.data.pid == "pool-moved"
+        assert server.requests == Counter({"GET /pool": 1, "GET /pool/{pid}": 2})
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_write_is_confirmed_by_one_read_of_its_pool(hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A write costs its PATCH and one debounced read of the written pool, without speeding up the account's polling."""
+    async with FakeEpsApi(FakeApiConfig(change_rate=0)) as server:
+        monkeypatch.setattr(coordinator, "EpsApiClient", functools.partial(EpsApiClient, base_url=server.base_url))
+        pool = next(iter(server.pools.values()))
+        entry = MockConfigEntry(domain=DOMAIN, data={"api_key": "key", "mac_address": pool["mac"], "pid": pool["pid"]}, unique_id=pool["mac"])
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        pool_coordinator = entry.runtime_data
+        account_interval = pool_coordinator.account.update_interval
+
+        await pool_coordinator.set_value("cl", {"rx": {"target": 710}})
+        await pool_coordinator.set_value("ph", {"target": 7.2})
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=31))
+        await hass.async_block_till_done()
+        assert server.requests == Counter({"GET /pool/{pid}": 2, "PATCH /pool/{pid}/{module}": 2})
+        assert pool_coordinator.account.update_interval == account_interval
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_accepted_write_is_applied_before_any_read(hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Once the PATCH is accepted the change is in the pool's data and its entities' state, without reading the pool."""
+    async with FakeEpsApi(FakeApiConfig(change_rate=0)) as server:
+        monkeypatch.setattr(coordinator, "EpsApiClient", functools.partial(EpsApiClient, base_url=server.base_url))
+        pool = next(iter(server.pools.values()))
+        entry = MockConfigEntry(domain=DOMAIN, data={"api_key": "key", "mac_address": pool["mac"], "pid": pool["pid"]}, unique_id=pool["mac"])
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        pool_coordinator = entry.runtime_data
+
+        await pool_coordinator.set_value("cl", {"rx": {"target": 710}})
+        assert pool_coordinator.data.cl.raw_config == {"rx": {"target": 710}}
+        assert float(hass.states.get("number.eps_pool_rx_target_value").state) == 710
+        assert server.requests == Counter({"GET /pool/{pid}": 1, "PATCH /pool/{pid}/{module}": 1})
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_writes_to_a_module_go_out_one_at_a_time(hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A write to a full-body module waits for the one in flight, so its body carries the earlier change along."""
+    monkeypatch.setattr(coordinator, "_WRITE_COALESCE_WINDOW", timedelta(0))
+    async with FakeEpsApi(FakeApiConfig(latency=0.3, change_rate=0)) as server:
+        monkeypatch.setattr(coordinator, "EpsApiClient", functools.partial(EpsApiClient, base_url=server.base_url))
+        pool = next(iter(server.pools.values()))
+        entry = MockConfigEntry(domain=DOMAIN, data={"api_key": "key", "mac_address": pool["mac"], "pid": pool["pid"]}, unique_id=pool["mac"])
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        pool_coordinator = entry.runtime_data
+
+        first = hass.async_create_task(pool_coordinator.set_value("filter", {"schedule_1": {"enabled": True}}))
+        await asyncio.sleep(0.1)
+        await pool_coordinator.set_value("filter", {"schedule_2": {"enabled": True}})
+        await first
+        config = pool["filter"]["config"]
+        assert config["schedule_1"]["enabled"] is True
+        assert config["schedule_2"]["enabled"] is True
+        assert pool_coordinator.data.filter.raw_config == config
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_local_controller_outage_falls_back_to_the_account(hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch, freezer: FrozenDateTimeFactory) -> None:
+    """While the controller is down the pool is polled in the account's cycle only, and taken back once it answers."""
+    async with FakeEpsApi() as server, FakeController(server) as controller:
+        monkeypatch.setattr(coordinator, "EpsApiClient", functools.partial(EpsApiClient, base_url=server.base_url))
+        pool = next(iter(server.pools.values()))
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={"api_key": "key", "mac_address": pool["mac"], "pid": pool["pid"]},
+            options={CONF_LOCAL_HOST: controller.host, CONF_LOCAL_POLL_INTERVAL: 10},
+            unique_id=pool["mac"],
+        )
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        pool_coordinator = entry.runtime_data
+        account = pool_coordinator.account
+        assert account.is_pool_local(pool["mac"])
+        assert server.requests.total() == 0
+
+        async def tick() -> None:
+            freezer.tick(timedelta(seconds=11))
+            async_fire_time_changed(hass)
+            await hass.async_block_till_done(wait_background_tasks=True)
+
+        await controller.stop()
+        for _ in range(3):
+            await tick()
+            assert pool_coordinator.last_update_success
+        assert not account.is_pool_local(pool["mac"])
+        assert pool["pid"] in account.data
+        # Every cloud read of the pool came with an account cycle, none at the local interval.
+        assert server.requests["GET /pool/{pid}"] == server.requests["GET /pool"] >= 1
+        assert pool_coordinator.data is account.data[pool["pid"]]
+
+        await controller.start()
+        local_reads = controller.requests["GET /pool/{pid}"]
+        await tick()
+        assert account.is_pool_local(pool["mac"])
+        assert controller.requests["GET /pool/{pid}"] == local_reads + 1
+        assert pool_coordinator.last_update_success
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_restored_state_is_marked_until_live_data_replaces_it(hass: HomeAssistant, hass_storage: dict[str, Any], monkeypatch: pytest.MonkeyPatch) -> None:
+    """Entities started from a snapshot carry its time until the first refresh replaces it, even with the same data."""
+    async with FakeEpsApi(FakeApiConfig(latency=0.2, change_rate=0)) as server:
+        monkeypatch.setattr(coordinator, "EpsApiClient", functools.partial(EpsApiClient, base_url=server.base_url))
+        pool = next(iter(server.pools.values()))
+        entry = MockConfigEntry(domain=DOMAIN, data={"api_key": "key", "mac_address": pool["mac"], "pid": pool["pid"]}, unique_id=pool["mac"])
+        entry.add_to_hass(hass)
+        saved_at = dt_util.utcnow() - timedelta(hours=1)
+        hass_storage[f"{DOMAIN}.snapshot.{entry.entry_id}"] = {
+            "version": 1,
+            "key": f"{DOMAIN}.snapshot.{entry.entry_id}",
+            "data": coordinator._encode_snapshot(Pool.from_dict(pool), saved_at),
+        }
+
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        entity_ids = hass.states.async_entity_ids()
+        assert entity_ids
+        assert entry.runtime_data.restored_at == saved_at
+        assert all(hass.states.get(entity_id).attributes[ATTR_RESTORED_FROM] == saved_at.isoformat() for entity_id in entity_ids)
+
+        await hass.async_block_till_done(wait_background_tasks=True)
+        assert server.requests["GET /pool/{pid}"] == 1
+        assert entry.runtime_data.restored_at is None
+        assert not any(ATTR_RESTORED_FROM in hass.states.get(entity_id).attributes for entity_id in entity_ids)
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_snapshot_is_saved_while_the_data_keeps_changing(hass: HomeAssistant, hass_storage: dict[str, Any], monkeypatch: pytest.MonkeyPatch, freezer: FrozenDateTimeFactory) -> None:
+    """A pool whose state changes with every refresh still gets its snapshot saved, not only on shutdown."""
+    async with FakeEpsApi() as server:
+        monkeypatch.setattr(coordinator, "EpsApiClient", functools.partial(EpsApiClient, base_url=server.base_url))
+        pool = next(iter(server.pools.values()))
+        entry = MockConfigEntry(domain=DOMAIN, data={"api_key": "key", "mac_address": pool["mac"], "pid": pool["pid"]}, unique_id=pool["mac"])
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        key = f"{DOMAIN}.snapshot.{entry.entry_id}"
+        for _ in range(6):
+            freezer.tick(timedelta(seconds=5))
+            await entry.runtime_data.account.async_refresh()
+            async_fire_time_changed(hass)
+            await hass.async_block_till_done()
+        assert key in hass_storage
+        saved = hass_storage[key]["data"]
+
+        # Later states wait for the snapshot interval.
+        for _ in range(6):
+            freezer.tick(timedelta(seconds=5))
+            await entry.runtime_data.account.async_refresh()
+            async_fire_time_changed(hass)
+            await hass.async_block_till_done()
+        assert hass_storage[key]["data"] == saved
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
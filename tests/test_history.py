@@ -0,0 +1,60 @@
+"""Tests for the in-memory metric history."""
+
+import copy
+
+import pytest
+
+from benchmarks.fake_server import make_pool
+from custom_components.eps_smart_pool_control.api import Pool
+from custom_components.eps_smart_pool_control.history import MetricBuffer, PoolHistory
+
+
+def test_full_buffer_overwrites_its_oldest_samples() -> None:
+    """A full ring buffer keeps the newest samples, oldest first."""
+    buffer = MetricBuffer(capacity=3)
+    assert buffer.last_timestamp is None
+    for timestamp in range(5):
+        buffer.append(timestamp, timestamp * 1.5)
+    assert len(buffer) == 3
+    assert buffer.last_timestamp == 4
+    assert list(buffer.samples()) == [(2, 3.0), (3, 4.5), (4, 6.0)]
+    assert list(buffer.samples(since=3)) == [(3, 4.5), (4, 6.0)]
+
+
+def test_summary_covers_the_samples_since_a_time() -> None:
+    """The summary holds the min, max, mean and count of the samples in its window, and is None for an empty one."""
+    buffer = MetricBuffer()
+    for timestamp, value in ((0, 7.0), (60, 7.4), (120, 7.2), (180, 7.6)):
+        buffer.append(timestamp, value)
+    assert buffer.summary(since=60) == {"min": 7.2, "max": 7.6, "mean": 7.4, "count": 3}
+    assert buffer.summary() == {"min": 7.0, "max": 7.6, "mean": 7.3, "count": 4}
+    assert buffer.summary(since=181) is None
+
+
+def test_downsample_aggregates_aligned_windows() -> None:
+    """Samples are grouped into windows aligned to their size, skipping windows without samples."""
+    buffer = MetricBuffer()
+    for timestamp, value in ((0, 1.0), (30, 3.0), (60, 5.0), (200, 2.0), (230, 4.0)):
+        buffer.append(timestamp, value)
+    assert buffer.downsample(60) == [
+        {"start": 0, "min": 1.0, "max": 3.0, "mean": 2.0, "count": 2},
+        {"start": 60, "min": 5.0, "max": 5.0, "mean": 5.0, "count": 1},
+        {"start": 180, "min": 2.0, "max": 4.0, "mean": 3.0, "count": 2},
+    ]
+    assert buffer.downsample(60, since=60) == buffer.downsample(60)[1:]
+
+
+def test_pool_state_without_new_activity_adds_no_samples() -> None:
+    """Samples are stamped with the pool's activity time, so a state the device has not refreshed is recorded once."""
+    history = PoolHistory()
+    raw = make_pool(0)
+    history.record(Pool.from_dict(raw))
+    raw = copy.deepcopy(raw)
+    raw["ph"]["metrics"]["actual"] = 7.1
+    history.record(Pool.from_dict(raw))
+    assert [len(buffer) for buffer in history.metrics.values()] == [1, 1, 1, 1]
+
+    raw["activity_at"] += 60_000
+    history.record(Pool.from_dict(raw))
+    assert list(history.metrics["ph"].samples()) == [(1748684434.0, pytest.approx(7.3)), (1748684494.0, pytest.approx(7.1))]
+    assert history.downsample(3600, metrics=["ph"]) == {"ph": [{"start": 1748682000.0, "min": 7.1, "max": 7.3, "mean": 7.2, "count": 2}]}
@@ -0,0 +1,101 @@
+"""Tests for the pool avatar image."""
+
+import functools
+from collections.abc import AsyncIterator
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
+
+from benchmarks.fake_server import FakeEpsApi
+from custom_components.eps_smart_pool_control import coordinator, image
+from custom_components.eps_smart_pool_control.api import EpsApiClient
+from custom_components.eps_smart_pool_control.const import DOMAIN
+
+_IMAGE = "image.eps_pool_avatar"
+
+
+@pytest.fixture(name="server")
+async def server_fixture(hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch, tmp_path: Path, socket_enabled: None) -> AsyncIterator[FakeEpsApi]:
+    """Serve one pool with an avatar and point the integration at it, caching the avatar under a temporary directory."""
+    hass.config.config_dir = str(tmp_path)
+    async with FakeEpsApi() as server:
+        monkeypatch.setattr(coordinator, "EpsApiClient", functools.partial(EpsApiClient, base_url=server.base_url))
+        server.avatars["pool.png"] = b"avatar"
+        next(iter(server.pools.values()))["avatar"] = f"{server.base_url}/avatar/pool.png"
+        yield server
+
+
+async def _async_setup(hass: HomeAssistant, server: FakeEpsApi) -> MockConfigEntry:
+    pool = next(iter(server.pools.values()))
+    entry = MockConfigEntry(domain=DOMAIN, data={"api_key": "key", "mac_address": pool["mac"], "pid": pool["pid"]}, unique_id=pool["mac"])
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def _async_refresh(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    await entry.runtime_data.account.async_refresh()
+    await hass.async_block_till_done()
+
+
+async def test_unchanged_avatar_is_revalidated_with_its_etag(hass: HomeAssistant, server: FakeEpsApi, freezer: FrozenDateTimeFactory) -> None:
+    """The cached avatar is only checked again after a day, with a conditional request the API answers with a 304."""
+    entry = await _async_setup(hass, server)
+    state = hass.states.get(_IMAGE).state
+    assert server.requests["GET /avatar/{name}"] == 1
+
+    await _async_refresh(hass, entry)
+    assert server.requests["GET /avatar/{name}"] == 1
+
+    freezer.tick(timedelta(hours=25))
+    await _async_refresh(hass, entry)
+    assert server.requests["GET /avatar/{name}"] == 2
+    assert server.not_modified["GET /avatar/{name}"] == 1
+    assert hass.states.get(_IMAGE).state == state
+
+    await hass.config_entries.async_remove(entry.entry_id)
+
+
+async def test_avatar_update_time_only_moves_when_the_image_differs(hass: HomeAssistant, server: FakeEpsApi, freezer: FrozenDateTimeFactory) -> None:
+    """A new avatar URL serving the same bytes keeps the image's update time; different bytes move it."""
+    entry = await _async_setup(hass, server)
+    pool = next(iter(server.pools.values()))
+    state = hass.states.get(_IMAGE).state
+
+    server.avatars["copy.png"] = server.avatars["pool.png"]
+    pool["avatar"] = f"{server.base_url}/avatar/copy.png"
+    freezer.tick(timedelta(minutes=5))
+    await _async_refresh(hass, entry)
+    assert server.requests["GET /avatar/{name}"] == 2
+    assert hass.states.get(_IMAGE).state == state
+
+    server.avatars["new.png"] = b"new avatar"
+    pool["avatar"] = f"{server.base_url}/avatar/new.png"
+    freezer.tick(timedelta(minutes=5))
+    await _async_refresh(hass, entry)
+    assert server.requests["GET /avatar/{name}"] == 3
+    assert hass.states.get(_IMAGE).state != state
+
+    await hass.config_entries.async_remove(entry.entry_id)
+
+
+async def test_avatar_cache_is_deleted_with_the_entry(hass: HomeAssistant, server: FakeEpsApi, hass_storage: dict[str, Any], freezer: FrozenDateTimeFactory) -> None:
+    """Removing the config entry deletes the cached avatar and its metadata."""
+    entry = await _async_setup(hass, server)
+    freezer.tick(timedelta(seconds=11))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    path = image._avatar_path(hass, entry.entry_id)
+    assert await hass.async_add_executor_job(path.read_bytes) == b"avatar"
+    assert f"{DOMAIN}.avatar.{entry.entry_id}" in hass_storage
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    assert not await hass.async_add_executor_job(path.exists)
+    assert f"{DOMAIN}.avatar.{entry.entry_id}" not in hass_storage
@@ -0,0 +1,156 @@
+"""Tests for the integration's actions."""
+
+import asyncio
+import functools
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from benchmarks.fake_server import FakeApiConfig, FakeEpsApi, make_pool
+from custom_components.eps_smart_pool_control import coordinator, services
+from custom_components.eps_smart_pool_control.api import EpsApiClient
+from custom_components.eps_smart_pool_control.const import DOMAIN
+from custom_components.eps_smart_pool_control.services import SERVICE_APPLY_SETTINGS, SERVICE_GET_METRIC_HISTORY
+
+# Activity time of a generated pool before its first read, in seconds.
+_ACTIVITY_AT = make_pool(0)["activity_at"] / 1000
+
+
+@pytest.fixture(name="server")
+async def server_fixture(monkeypatch: pytest.MonkeyPatch, socket_enabled: None) -> AsyncIterator[FakeEpsApi]:
+    """Serve three pools under one key and point the integration at them."""
+    async with FakeEpsApi(FakeApiConfig(pools=3, latency=0.05)) as server:
+        monkeypatch.setattr(coordinator, "EpsApiClient", functools.partial(EpsApiClient, base_url=server.base_url))
+        yield server
+
+
+async def _async_setup(hass: HomeAssistant, pool: dict) -> MockConfigEntry:
+    entry = MockConfigEntry(domain=DOMAIN, data={"api_key": "key", "mac_address": pool["mac"], "pid": pool["pid"]}, unique_id=pool["mac"])
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def test_metric_history_returns_the_requested_window(hass: HomeAssistant, server: FakeEpsApi, freezer: FrozenDateTimeFactory) -> None:
+    """The action downsamples the requested metrics over the requested hours, and only answers for loaded entries."""
+    # Every read of the fake pool moves its activity time a minute on; four reads end at +240 s.
+    freezer.move_to(datetime.fromtimestamp(_ACTIVITY_AT + 300, UTC))
+    entry = await _async_setup(hass, next(iter(server.pools.values())))
+    for _ in range(3):
+        await entry.runtime_data.account.async_refresh()
+        await hass.async_block_till_done()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_METRIC_HISTORY,
+        {"config_entry_id": entry.entry_id, "metrics": ["ph", "water_temp"], "window": 3600},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["window"] == 3600
+    assert set(response["metrics"]) == {"ph", "water_temp"}
+    assert [bucket["count"] for bucket in response["metrics"]["ph"]] == [4]
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_METRIC_HISTORY,
+        {"config_entry_id": entry.entry_id, "window": 60, "hours": 0.02},
+        blocking=True,
+        return_response=True,
+    )
+    assert set(response["metrics"]) == {"water_temp", "ph", "rx", "pump_current"}
+    assert all(len(buckets) == 1 and buckets[0]["count"] == 1 for buckets in response["metrics"].values())
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(DOMAIN, SERVICE_GET_METRIC_HISTORY, {"config_entry_id": entry.entry_id}, blocking=True, return_response=True)
+
+
+async def test_settings_are_written_in_one_patch_per_module(hass: HomeAssistant, server: FakeEpsApi) -> None:
+    """Settings of the same module go out together, and every written module is applied right away."""
+    pid, pool = next(iter(server.pools.items()))
+    entry = await _async_setup(hass, pool)
+    settings = {"ph.target": 7.2, "cl.rx.target": 710, "filter.schedule_1.enabled": True, "filter.config.schedule_2.enabled": True}
+    await hass.services.async_call(DOMAIN, SERVICE_APPLY_SETTINGS, {"config_entry_id": entry.entry_id, "settings": settings}, blocking=True)
+
+    bodies = {module: body for _pid, module, body in server.patches}
+    assert len(server.patches) == 3
+    assert bodies["ph"] == {"target": 7.2}
+    assert bodies["cl"] == {"rx": {"target": 710}}
+    assert bodies["filter"] == {**pool["filter"]["config"], "schedule_1": {"enabled": True}, "schedule_2": {"enabled": True}}
+    assert entry.runtime_data.data.filter.raw_config == pool["filter"]["config"]
+    assert all(patch_pid == pid for patch_pid, _module, _body in server.patches)
+
+
+async def test_invalid_setting_fails_before_anything_is_sent(hass: HomeAssistant, server: FakeEpsApi) -> None:
+    """One setting the pool cannot take fails the whole action before any PATCH goes out."""
+    entry = await _async_setup(hass, next(iter(server.pools.values())))
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_APPLY_SETTINGS,
+            {"config_entry_id": entry.entry_id, "settings": {"ph.target": 7.2, "cl.rx.target": "high"}},
+            blocking=True,
+        )
+    assert not server.requests["PATCH /pool/{pid}/{module}"]
+
+
+async def test_writes_across_pools_are_bounded(hass: HomeAssistant, server: FakeEpsApi, monkeypatch: pytest.MonkeyPatch) -> None:
+    """All PATCHes of one action, over every pool it names, share a bound on how many are in flight."""
+    in_flight = 0
+    peak = 0
+    patch_module = EpsApiClient.patch_module
+
+    async def counting_patch_module(self: EpsApiClient, pid: str, module: str, body: dict) -> None:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            await patch_module(self, pid, module, body)
+        finally:
+            in_flight -= 1
+
+    monkeypatch.setattr(EpsApiClient, "patch_module", counting_patch_module)
+    entries = [await _async_setup(hass, pool) for pool in server.pools.values()]
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_APPLY_SETTINGS,
+        {"config_entry_id": [entry.entry_id for entry in entries], "settings": {"ph.target": 7.2, "cl.rx.target": 710, "temperature.target": 29}},
+        blocking=True,
+    )
+    assert len(server.patches) == 9
+    assert peak == services._MAX_PARALLEL_WRITES
+
+
+async def test_failed_module_does_not_hold_back_the_others(hass: HomeAssistant, server: FakeEpsApi) -> None:
+    """A module whose PATCH fails is reported, while the modules that were written are applied."""
+    pid, pool = next(iter(server.pools.items()))
+    entry = await _async_setup(hass, pool)
+    del server.pools[pid]["temperature"]
+    with pytest.raises(HomeAssistantError, match="temperature"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_APPLY_SETTINGS,
+            {"config_entry_id": entry.entry_id, "settings": {"ph.target": 7.2, "temperature.target": 29}},
+            blocking=True,
+        )
+    assert server.patches == [(pid, "ph", {"target": 7.2})]
+    assert entry.runtime_data.data.ph.raw_config == {"target": 7.2}
+
+
+async def test_settings_wait_for_a_queued_write_to_the_same_module(hass: HomeAssistant, server: FakeEpsApi) -> None:
+    """A write queued by an entity and the action's write to the same full-body module do not overwrite each other."""
+    pool = next(iter(server.pools.values()))
+    entry = await _async_setup(hass, pool)
+    queued = hass.async_create_task(entry.runtime_data.set_value("filter", {"schedule_1": {"enabled": True}}))
+    await asyncio.sleep(0.55)
+    await hass.services.async_call(DOMAIN, SERVICE_APPLY_SETTINGS, {"config_entry_id": entry.entry_id, "settings": {"filter.schedule_2.enabled": True}}, blocking=True)
+    await queued
+    assert pool["filter"]["config"]["schedule_1"]["enabled"] is True
+    assert pool["filter"]["config"]["schedule_2"]["enabled"] is True
@@ -0,0 +1,94 @@
+"""Tests for building, validating and sending module config writes."""
+
+import copy
+import hashlib
+import math
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from benchmarks.fake_server import FULL_BODY_MODULES, FakeApiConfig, FakeEpsApi
+from custom_components.eps_smart_pool_control.api import EpsApiClient, EpsApiValidationError
+from custom_components.eps_smart_pool_control.api.writes import diff_changes, validate_changes
+from custom_components.eps_smart_pool_control.const import DOMAIN
+from custom_components.eps_smart_pool_control.coordinator import EpsAccountCoordinator
+
+_FILTER = {"always_active": False, "schedule_1": {"enabled": False, "speed": 2}}
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {"always_on": True},
+        {"schedule_1": {"start": "08:00"}},
+        {"always_active": 1},
+        {"schedule_1": {"speed": "high"}},
+        {"schedule_1": {"speed": math.nan}},
+        {"schedule_1": {"speed": math.inf}},
+        {"always_active": None},
+    ],
+    ids=["unknown field", "unknown nested field", "number for boolean", "string for number", "nan", "infinity", "no value"],
+)
+def test_invalid_changes_are_rejected(changes: dict) -> None:
+    """Fields the config does not have, values of another type and non-finite numbers are refused before sending."""
+    with pytest.raises(EpsApiValidationError):
+        validate_changes("filter", _FILTER, changes)
+
+
+def test_changes_equal_to_the_config_are_dropped() -> None:
+    """Only what differs from the config is written; a boolean is not equal to the number it compares equal to."""
+    assert diff_changes(_FILTER, {"always_active": False, "schedule_1": {"enabled": False}}) == {}
+    assert diff_changes(_FILTER, {"always_active": 0, "schedule_1": {"enabled": True, "speed": 2}}) == {"always_active": 0, "schedule_1": {"enabled": True}}
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_write_without_changes_sends_nothing() -> None:
+    """Changes equal to the module's config send no PATCH."""
+    async with FakeEpsApi() as server, EpsApiClient("key", base_url=server.base_url) as client:
+        pid, pool = next(iter(server.pools.items()))
+        assert await client.write_module(pid, "cl", pool["cl"]["config"], {"rx": {"target": pool["cl"]["config"]["rx"]["target"]}}) == {}
+        assert not server.requests
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_rejected_partial_body_is_resent_in_full_and_remembered() -> None:
+    """A module that answers a partial body with 422 gets the full config instead, and only that from then on."""
+    async with FakeEpsApi(FakeApiConfig(full_body_modules=FULL_BODY_MODULES | {"temperature"})) as server, EpsApiClient("key", base_url=server.base_url) as client:
+        pid, pool = next(iter(server.pools.items()))
+        pool["temperature"]["config"]["heating"] = True
+        current = copy.deepcopy(pool["temperature"]["config"])
+        assert await client.write_module(pid, "temperature", current, {"target": 29.0}) == {"target": 29.0}
+        assert server.requests["PATCH /pool/{pid}/{module}"] == 2
+        assert server.patches == [(pid, "temperature", {"target": 29.0, "heating": True})]
+        assert client.shapes.as_dict() == {"temperature": "full"}
+
+        await client.write_module(pid, "temperature", pool["temperature"]["config"], {"target": 27.0})
+        assert server.requests["PATCH /pool/{pid}/{module}"] == 3
+        assert pool["temperature"]["config"]["target"] == 27.0
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_learned_shapes_are_persisted_per_account(hass: HomeAssistant, hass_storage: dict[str, Any], freezer: FrozenDateTimeFactory) -> None:
+    """A shape learned through the account is saved with its key and loaded by the next account before it writes."""
+    async with FakeEpsApi(FakeApiConfig(full_body_modules=FULL_BODY_MODULES | {"temperature"})) as server:
+        pid, pool = next(iter(server.pools.items()))
+        pool["temperature"]["config"]["heating"] = True
+        account = EpsAccountCoordinator(hass, "key")
+        account.client = EpsApiClient("key", session=async_get_clientsession(hass), base_url=server.base_url)
+        await account.async_write_module(account.client, pid, "temperature", copy.deepcopy(pool["temperature"]["config"]), {"target": 29.0})
+        freezer.tick(timedelta(seconds=11))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+        key = f"{DOMAIN}.patch_shapes.{hashlib.sha256(b'key').hexdigest()[:12]}"
+        assert hass_storage[key]["data"] == {"temperature": "full"}
+
+        restarted = EpsAccountCoordinator(hass, "key")
+        restarted.client = EpsApiClient("key", session=async_get_clientsession(hass), base_url=server.base_url)
+        patches = server.requests["PATCH /pool/{pid}/{module}"]
+        await restarted.async_write_module(restarted.client, pid, "temperature", copy.deepcopy(pool["temperature"]["config"]), {"target": 27.0})
+        assert server.requests["PATCH /pool/{pid}/{module}"] == patches + 1